@@ -0,0 +1,64 @@
+""" Benchmark: latency of the response compression vs. the bytes saved
+
+Builds the body of /api/todo/get_all for a few list sizes and compresses it once per
+round with every coding the CompressionMiddleware can use (gzip levels, brotli qualities
+if brotli is installed). Prints the compression time, the compressed size and the
+transfer time saved on a slow mobile link (--mbits) per response.
+
+Usage (from the api directory):
+    python -m benchmarks.bench_compression [--sizes 10,100,1000,5000] [--rounds 20] [--mbits 1.5]
+"""
+import time
+import uuid
+import argparse
+from typing import List, Tuple
+
+from shared.compression import _Compressor, supported_encodings
+from shared.responses import FastJSONResponse
+from routes.todo.t_schemas import TodoSchema
+
+# (coding, gzip level, brotli quality)
+SETTINGS: List[Tuple[str, int, int]] = [("gzip", 1, 0), ("gzip", 6, 0), ("gzip", 9, 0), ("br", 0, 4), ("br", 0, 11)]
+
+
+def _body(count: int) -> bytes:
+    """ Returns the JSON body of the todo list with count todos """
+    todos: List[TodoSchema] = [
+        TodoSchema(id=uuid.uuid4(), title=f"Title {i}", description="Ein Beispiel – mit Umlauten: äöü" * 2,
+            completed=i % 3 == 0)
+        for i in range(count)
+    ]
+    return FastJSONResponse(content={"username": "Bench", "todos": todos, "next_cursor": None}).body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=str, default="10,100,1000,5000")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--mbits", type=float, default=1.5)
+    args = parser.parse_args()
+
+    bytes_per_ms: float = args.mbits * 1_000_000 / 8 / 1000
+
+    for count in map(int, args.sizes.split(",")):
+        body: bytes = _body(count)
+        print(f"{count} todos: {len(body)} bytes, {len(body) / bytes_per_ms:.1f} ms on the wire")
+
+        for encoding, level, quality in SETTINGS:
+            if encoding not in supported_encodings():
+                continue
+
+            start: float = time.perf_counter()
+            for _ in range(args.rounds):
+                compressor = _Compressor(encoding, level, quality)
+                compressed: bytes = compressor.compress(body, flush=False) + compressor.finish()
+            latency: float = (time.perf_counter() - start) / args.rounds * 1000
+
+            saved: float = (len(body) - len(compressed)) / bytes_per_ms
+            name: str = f"{encoding} {level or quality}"
+            print(f"  {name:<6} {len(compressed):>9} bytes ({len(compressed) / len(body):>5.1%})   "
+                f"compress: {latency:>7.2f} ms   net saved: {saved - latency:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
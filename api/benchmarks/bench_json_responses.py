@@ -0,0 +1,74 @@
+""" Benchmark: stdlib JSONResponse vs. FastJSONResponse for the todo list
+
+Encodes the payload of /api/todo/get_all for 10k todos (by default) the old way
+(model_validate + model_dump per todo, encoded by the stdlib json module) and the
+new way (one TypeAdapter validation, encoded by pydantic-core) and prints the
+time per response.
+
+Usage (from the api directory):
+    python -m benchmarks.bench_json_responses [--todos 10000] [--rounds 20]
+"""
+import time
+import uuid
+import argparse
+from fastapi.responses import JSONResponse
+from typing import Callable, List
+
+from database.models import Todo
+from routes.todo.t_schemas import TodoSchema, TODO_LIST_ADAPTER
+from shared.responses import FastJSONResponse
+
+
+def _todos(count: int) -> List[Todo]:
+    """ Creates the (detached) todos of the benchmark """
+    user_id: uuid.UUID = uuid.uuid4()
+    return [
+        Todo(id=uuid.uuid4(), title=f"Title {i}", description="Ein Beispiel – mit Umlauten: äöü" * 2,
+            completed=i % 3 == 0, user_id=user_id)
+        for i in range(count)
+    ]
+
+
+def _before(todos: List[Todo]) -> bytes:
+    return JSONResponse(content={
+        "username": "Bench",
+        "todos": [todo.model_dump(mode="json") for todo in map(TodoSchema.model_validate, todos)],
+        "next_cursor": None
+    }).body
+
+
+def _after(todos: List[Todo]) -> bytes:
+    return FastJSONResponse(content={
+        "username": "Bench",
+        "todos": TODO_LIST_ADAPTER.validate_python(todos, from_attributes=True),
+        "next_cursor": None
+    }).body
+
+
+def run(name: str, encode: Callable[[List[Todo]], bytes], todos: List[Todo], rounds: int) -> float:
+    """ Runs one benchmark and prints the average time per response """
+    body: bytes = encode(todos) # <- Warm up
+    start: float = time.perf_counter()
+
+    for _ in range(rounds):
+        encode(todos)
+
+    elapsed: float = (time.perf_counter() - start) / rounds
+    print(f"{name:<8} {elapsed * 1000:>8.2f} ms/response   {len(body) / 1024:>8.1f} KiB")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--todos", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    todos: List[Todo] = _todos(args.todos)
+    before: float = run("before", _before, todos, args.rounds)
+    after: float = run("after", _after, todos, args.rounds)
+    print(f"speedup  {before / after:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
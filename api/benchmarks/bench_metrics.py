@@ -0,0 +1,72 @@
+""" Benchmark: overhead of the MetricsMiddleware per request
+
+Calls a minimal ASGI app (start + body message) directly, without a server, once bare
+and once wrapped by the MetricsMiddleware, and prints the time per request and the
+difference, which is the cost of the recording path (target: well under 50 µs).
+
+Usage (from the api directory):
+    python -m benchmarks.bench_metrics [--requests 200000] [--routes 20]
+"""
+import time
+import asyncio
+import argparse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import List
+
+from shared.metrics import MetricsMiddleware, MetricsRegistry
+
+
+class _Route:
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+
+
+async def _app(scope: Scope, receive: Receive, send: Send) -> None:
+    scope["route"] = scope["_bench_route"] # <- Like the router
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _receive() -> Message:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message: Message) -> None:
+    pass
+
+
+async def _run(app: ASGIApp, scopes: List[Scope], requests: int) -> float:
+    """ Returns the time per request in µs """
+    start: float = time.perf_counter()
+
+    for i in range(requests):
+        await app(dict(scopes[i % len(scopes)]), _receive, _send)
+
+    return (time.perf_counter() - start) / requests * 1_000_000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200000)
+    parser.add_argument("--routes", type=int, default=20)
+    args = parser.parse_args()
+
+    scopes: List[Scope] = [
+        {"type": "http", "method": "GET", "path": f"/api/route/{i}", "_bench_route": _Route(f"/api/route/{i}")}
+        for i in range(args.routes)
+    ]
+    wrapped: ASGIApp = MetricsMiddleware(_app, registry=MetricsRegistry())
+
+    await _run(_app, scopes, args.requests // 10) # <- Warm up
+    await _run(wrapped, scopes, args.requests // 10)
+
+    bare: float = await _run(_app, scopes, args.requests)
+    with_metrics: float = await _run(wrapped, scopes, args.requests)
+
+    print(f"bare app:           {bare:>6.2f} µs/request")
+    print(f"with metrics:       {with_metrics:>6.2f} µs/request")
+    print(f"recording overhead: {with_metrics - bare:>6.2f} µs/request")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
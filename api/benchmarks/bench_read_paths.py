@@ -0,0 +1,127 @@
+""" Benchmark: ORM entity loading vs. the column projections of the read endpoints
+
+Loads the todo list (1 user, --todos todos) and the settings page (--sessions active
+sessions) the way they were loaded before (full User/Todo/Auth entities, selectinload
+and two sequential queries) and with the current services (TodoHome and SettingsService),
+and prints the rows per second and the peak of the allocated memory per request
+(both measured with tracemalloc running, so only the ratios are meaningful).
+
+Usage (from the api directory):
+    python -m benchmarks.bench_read_paths [--todos 2000] [--sessions 20] [--rounds 30]
+"""
+import time
+import uuid
+import asyncio
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+from sqlalchemy import select, insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker, selectinload
+from typing import Awaitable, Callable
+
+from database.connection import Base, create_db_engine
+from database.models import User, Todo, Auth
+from routes.todo.t_home import TodoHome
+from routes.todo.t_schemas import TodoSchema, TODO_LIST_ADAPTER
+from routes.settings.s_service import SettingsService, SessionSchema
+from conftest import fake_principal
+
+
+async def _prepare(engine: AsyncEngine, todos: int, sessions: int) -> uuid.UUID:
+    """ Creates the tables and the user of the benchmark """
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        result = await connection.execute(
+            insert(User).values(name="Bench", email="bench@email.com", password="-").returning(User.id)
+        )
+        user_id: uuid.UUID = result.scalar_one()
+
+        await connection.execute(insert(Todo), [
+            {"user_id": user_id, "title": f"Title {i}", "description": "A description " * 5, "completed": i % 4 == 0}
+            for i in range(todos)
+        ])
+        await connection.execute(insert(Auth), [
+            {
+                "jti_id": uuid.uuid4(), "user_id": user_id, "ip_address": "127.0.0.1", "user_agent": "Mozilla/5.0",
+                "device": "Desktop", "browser": "Firefox", "os": "Linux", "is_refresh_token": True,
+                "expires_at": int(time.time()) + 3600
+            }
+            for _ in range(sessions)
+        ])
+
+    return user_id
+
+
+async def _todos_before(session: AsyncSession, user_id: uuid.UUID) -> int:
+    result = await session.execute(select(User).options(selectinload(User.todos)).where(User.id == user_id))
+    user: User = result.scalar_one()
+    return len([TodoSchema.model_validate(todo).model_dump(mode="json") for todo in user.todos])
+
+
+async def _todos_after(session: AsyncSession, user_id: uuid.UUID) -> int:
+    _, todos, _, _ = await TodoHome(db_session=session, user_id=user_id).get_username_with_todos()
+    return len(TODO_LIST_ADAPTER.validate_python(todos, from_attributes=True))
+
+
+async def _settings_before(session: AsyncSession, user_id: uuid.UUID) -> int:
+    result = await session.execute(select(User).where(User.id == user_id))
+    result.scalar_one()
+    result = await session.execute(
+        select(Auth).where(Auth.user_id == user_id, Auth.revoked == False, Auth.expires_at > int(time.time()))
+    )
+    return len([SessionSchema.model_validate(auth, from_attributes=True).model_dump(mode="json")
+        for auth in result.scalars().all()])
+
+
+async def _settings_after(session: AsyncSession, user_id: uuid.UUID) -> int:
+    informations = await SettingsService(principal=fake_principal(user_id), db_session=session).get()
+    return len(informations["sessions"])
+
+
+async def run(
+    name: str, load: Callable[[AsyncSession, uuid.UUID], Awaitable[int]],
+    session_factory: sessionmaker, user_id: uuid.UUID, rounds: int
+) -> None:
+    """ Runs one benchmark (a new session per request) and prints the result """
+    async with session_factory() as session:
+        await load(session, user_id) # <- Warm up (statement cache)
+
+    rows: int = 0
+    peak: int = 0
+    elapsed: float = 0.0
+
+    for _ in range(rounds):
+        async with session_factory() as session:
+            tracemalloc.start()
+            start: float = time.perf_counter()
+            rows += await load(session, user_id)
+            elapsed += time.perf_counter() - start
+            peak += tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    print(f"{name:<18} rows/s: {rows / elapsed:>10.0f}   peak alloc/request: {peak / rounds / 1024:>8.1f} KiB")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--todos", type=int, default=2000)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine: AsyncEngine = create_db_engine(f"sqlite+aiosqlite:///{Path(directory) / 'bench.db'}")
+        user_id: uuid.UUID = await _prepare(engine, args.todos, args.sessions)
+        session_factory = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+        await run("todos before", _todos_before, session_factory, user_id, args.rounds)
+        await run("todos after", _todos_after, session_factory, user_id, args.rounds)
+        await run("settings before", _settings_before, session_factory, user_id, args.rounds)
+        await run("settings after", _settings_after, session_factory, user_id, args.rounds)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+""" Benchmark: default SQLite engine vs. the production profile of create_db_engine
+
+Runs concurrent writers (insert + commit of a todo) and readers (todo list of a user)
+against a fresh database file for each engine and prints the throughput and the
+number of "database is locked" errors.
+
+Usage (from the api directory):
+    python -m benchmarks.bench_sqlite_profile [--writers 8] [--readers 8] [--seconds 5]
+"""
+import asyncio
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from sqlalchemy import select, insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from typing import Dict
+
+from database.connection import Base, create_db_engine
+from database.models import User, Todo
+
+
+async def _prepare(engine: AsyncEngine) -> User:
+    """ Creates the tables and the user of the benchmark """
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        result = await connection.execute(
+            insert(User).values(name="Bench", email="bench@email.com", password="-").returning(User.id)
+        )
+        return result.scalar_one()
+
+
+async def _worker(session_factory: sessionmaker, user_id, write: bool, deadline: float, stats: Dict[str, int]) -> None:
+    """ Runs writes or reads until the deadline """
+    while time.perf_counter() < deadline:
+        try:
+            async with session_factory() as session:
+                if write:
+                    await session.execute(insert(Todo).values(title="Title", description="", user_id=user_id))
+                    await session.commit()
+                else:
+                    result = await session.execute(
+                        select(Todo.id).where(Todo.user_id == user_id).order_by(Todo.edited_at.desc()).limit(50)
+                    )
+                    result.all()
+
+            stats["writes" if write else "reads"] += 1
+        except OperationalError as e:
+            if "locked" not in str(e):
+                raise
+            stats["locked"] += 1
+
+
+async def run(name: str, engine: AsyncEngine, writers: int, readers: int, seconds: float) -> None:
+    """ Runs one benchmark round and prints the result """
+    user_id = await _prepare(engine)
+    session_factory = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    stats: Dict[str, int] = {"writes": 0, "reads": 0, "locked": 0}
+    deadline: float = time.perf_counter() + seconds
+
+    await asyncio.gather(
+        *(_worker(session_factory, user_id, True, deadline, stats) for _ in range(writers)),
+        *(_worker(session_factory, user_id, False, deadline, stats) for _ in range(readers))
+    )
+    await engine.dispose()
+
+    print(
+        f"{name:<10} writes/s: {stats['writes'] / seconds:>9.1f}   reads/s: {stats['reads'] / seconds:>9.1f}"
+        f"   locked errors: {stats['locked']}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Default engine: rollback journal, synchronous=FULL, driver default lock timeout
+        default_url: str = f"sqlite+aiosqlite:///{Path(directory) / 'default.db'}"
+        await run("default", create_async_engine(default_url), args.writers, args.readers, args.seconds)
+
+        profile_url: str = f"sqlite+aiosqlite:///{Path(directory) / 'profile.db'}"
+        await run("profile", create_db_engine(profile_url), args.writers, args.readers, args.seconds)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
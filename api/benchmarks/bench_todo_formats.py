@@ -0,0 +1,92 @@
+""" Benchmark: JSON objects vs. the columnar format of the todo list
+
+Loads the rows of /api/todo/get_all for --todos todos once and encodes the response
+body per round as the current format (one object per todo) and as the columnar format
+(one array per field, ?format=columnar). Prints the payload size (plain and gzipped)
+and the server encode time per response.
+
+Usage (from the api directory):
+    python -m benchmarks.bench_todo_formats [--todos 10000] [--rounds 20]
+"""
+import gzip
+import time
+import uuid
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+from sqlalchemy import Row, insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from typing import Callable, List
+
+from database.connection import Base, create_db_engine
+from database.models import User, Todo
+from routes.todo.t_home import TodoHome, COLUMNAR_MEDIA_TYPE, todos_to_columns
+from routes.todo.t_schemas import TODO_LIST_ADAPTER
+from shared.responses import FastJSONResponse
+
+
+async def _load_rows(todos: int) -> List[Row]:
+    """ Creates a database with one user and returns the rows of the todo list """
+    with tempfile.TemporaryDirectory() as directory:
+        engine: AsyncEngine = create_db_engine(f"sqlite+aiosqlite:///{Path(directory) / 'bench.db'}")
+
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+            result = await connection.execute(
+                insert(User).values(name="Bench", email="bench@email.com", password="-").returning(User.id)
+            )
+            user_id: uuid.UUID = result.scalar_one()
+
+            await connection.execute(insert(Todo), [
+                {"user_id": user_id, "title": f"Title {i}", "description": "Ein Beispiel – mit Umlauten: äöü" * 2,
+                    "completed": i % 3 == 0}
+                for i in range(todos)
+            ])
+
+        async with sessionmaker(engine, class_=AsyncSession)() as session:
+            _, rows, _, _ = await TodoHome(db_session=session, user_id=user_id).get_username_with_todos()
+
+        await engine.dispose()
+        return rows
+
+
+def _objects(rows: List[Row]) -> bytes:
+    return FastJSONResponse(content={
+        "username": "Bench", "todos": TODO_LIST_ADAPTER.validate_python(rows, from_attributes=True), "next_cursor": None
+    }).body
+
+
+def _columnar(rows: List[Row]) -> bytes:
+    return FastJSONResponse(media_type=COLUMNAR_MEDIA_TYPE, content={
+        "username": "Bench", "todos": todos_to_columns(rows), "next_cursor": None
+    }).body
+
+
+def run(name: str, encode: Callable[[List[Row]], bytes], rows: List[Row], rounds: int) -> None:
+    """ Runs one benchmark and prints the result """
+    body: bytes = encode(rows) # <- Warm up
+
+    start: float = time.perf_counter()
+    for _ in range(rounds):
+        body = encode(rows)
+    elapsed: float = (time.perf_counter() - start) / rounds
+
+    print(f"{name:<10} {len(body):>9} bytes   gzip: {len(gzip.compress(body)):>8} bytes   "
+        f"encode: {elapsed * 1000:>7.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--todos", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    rows: List[Row] = asyncio.run(_load_rows(args.todos))
+    run("objects", _objects, rows, args.rounds)
+    run("columnar", _columnar, rows, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,30 @@
+import time
+import pytest
 import pytest_asyncio
+from contextlib import contextmanager
+from uuid import UUID, uuid4
 from fastapi import Request
-from sqlalchemy import insert
+from sqlalchemy import event, insert, select, exists
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Tuple
+from typing import Callable, ContextManager, Iterator, List, Tuple
 
 from database.models import User, Todo
 from database.connection import engine, async_session
 
 
+@pytest.fixture(scope="session", autouse=True)
+def revocation_table_path(tmp_path_factory: pytest.TempPathFactory) -> Iterator[None]:
+    """ Fixture to map the revocation table of the app from a private temporary directory
+    instead of the default path """
+    from security.auth.revocation_table import revocation_table
+
+    revocation_table.close()
+    revocation_table.path = str(tmp_path_factory.mktemp("revocations") / "revocations.bin")
+
+    yield
+    revocation_table.close()
+
+
 @pytest_asyncio.fixture
 async def db_session():
     """ Fixture to provide a database session for tests. """
@@ -23,6 +40,42 @@ async def db_session():
             await trans.rollback()
 
 
+# Savepoints of the db_session fixture (not sent in production)
+TRANSACTION_CONTROL: Tuple[str, ...] = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+@pytest.fixture
+def query_budget(db_session: AsyncSession) -> Callable[[int], ContextManager[List[str]]]:
+    """ Fixture to declare the maximum number of statements of a block (e.g. an endpoint call)
+    that uses the db_session. Fails the test with the executed SQL if the block exceeds it:
+
+        with query_budget(2):
+            response = await ac.get("/todo/get_all")
+    """
+    @contextmanager
+    def budget(max_statements: int) -> Iterator[List[str]]:
+        statements: List[str] = []
+        connection = db_session.bind.sync_connection
+
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+            if not statement.lstrip().upper().startswith(TRANSACTION_CONTROL):
+                statements.append(statement)
+
+        event.listen(connection, "before_cursor_execute", _before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(connection, "before_cursor_execute", _before_cursor_execute)
+
+        if len(statements) > max_statements:
+            executed: str = "\n".join(f"  {i}. {statement}" for i, statement in enumerate(statements, start=1))
+            pytest.fail(
+                f"Query budget exceeded: {len(statements)} statements, at most {max_statements} allowed.\n{executed}",
+                pytrace=False
+            )
+
+    return budget
+
+
 # Fake user data for testing
 from security.hashing import hash_pwd
 
@@ -129,4 +182,17 @@ async def fake_refresh_token_with_session_id(
     payload: dict = decode_token(token=refresh_token)
     session_id: str = str(payload.get("jti"))
 
-    return (refresh_token, session_id, mock_request, user, db_session)
\ No newline at end of file
+    return (refresh_token, session_id, mock_request, user, db_session)
+
+def fake_principal(user_id: UUID, session_id: UUID | None = None) -> "AuthPrincipal":
+    """ Helper-Function to create the principal of an authenticated request """
+    from security.auth.jwt import AuthPrincipal
+
+    return AuthPrincipal(user_id=user_id, session_id=session_id or uuid4(), exp=int(time.time()) + 60)
+
+
+async def todo_in_db(db_session: AsyncSession, user_id: UUID, todo_id: UUID | None = None, title: str | None = None) -> bool:
+    """ Helper-Function to check whether a todo of the user with the id or the title is stored """
+    condition = Todo.id == todo_id if todo_id is not None else Todo.title == title
+    result = await db_session.execute(select(exists().where(Todo.user_id == user_id, condition)))
+    return result.scalar()
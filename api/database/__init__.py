@@ -1,9 +0,0 @@
-from sqlalchemy import event
-from database.connection import engine
-
-# Only needed for sqlite
-@event.listens_for(engine.sync_engine, "connect")
-def _enable_sqlite_fk(dbapi_connection, connection_record):
-    cursor = dbapi_connection.cursor()
-    cursor.execute("PRAGMA foreign_keys=ON")
-    cursor.close()
\ No newline at end of file
@@ -8,6 +8,32 @@ logger = logging.getLogger(__name__)
 
 TEST_MODE: bool = os.getenv("TEST_MODE", "false").lower() == "true"
 
+# Connection pool (not used for in-memory SQLite databases)
+DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", 30)) # Seconds to wait for a free connection
+DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 1800)) # Seconds until a connection is replaced (-1 = never)
+DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+# SQLite pragmas (applied to every new connection)
+SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL").upper()
+SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+SQLITE_BUSY_TIMEOUT: int = int(os.getenv("SQLITE_BUSY_TIMEOUT", 5000)) # Milliseconds a writer waits for the lock
+SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)) # Bytes
+SQLITE_CACHE_SIZE: int = int(os.getenv("SQLITE_CACHE_SIZE", -64000)) # Pages, or KiB if negative
+
+# Group commit: mutations of concurrent requests share one transaction (and one fsync)
+GROUP_COMMIT_ENABLED: bool = os.getenv("GROUP_COMMIT_ENABLED", "false").lower() == "true"
+GROUP_COMMIT_MAX_BATCH: int = int(os.getenv("GROUP_COMMIT_MAX_BATCH", 64))
+GROUP_COMMIT_MAX_DELAY: float = float(os.getenv("GROUP_COMMIT_MAX_DELAY_MS", 2)) / 1000 # Seconds
+
+# Statements slower than this are logged with redacted parameters (0 = disabled)
+SLOW_QUERY_THRESHOLD: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", 200)) / 1000 # Seconds
+
+# Tombstones of deleted todos for the sync endpoint
+TODO_DELETIONS_RETENTION: int = int(os.getenv("TODO_DELETIONS_RETENTION_DAYS", 30)) * 24 * 60 * 60 # Seconds
+TODO_DELETIONS_COMPACTION_INTERVAL: int = int(os.getenv("TODO_DELETIONS_COMPACTION_INTERVAL", 60 * 60)) # Seconds
+
 
 # Move the old test database file
 def move_test_database(TEST_DB: str) -> None:
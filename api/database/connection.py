@@ -1,14 +1,139 @@
+import time
 import logging
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from typing import Any, Dict, List
+
+from database.config import (
+    get_db_url,
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING,
+    SQLITE_JOURNAL_MODE, SQLITE_SYNCHRONOUS, SQLITE_BUSY_TIMEOUT, SQLITE_MMAP_SIZE, SQLITE_CACHE_SIZE,
+    SLOW_QUERY_THRESHOLD
+)
+from database.query_stats import QueryStats, current_query_stats, redact_parameters
+
+SQLITE_JOURNAL_MODES: tuple = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+SQLITE_SYNCHRONOUS_MODES: tuple = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+
+def _sqlite_pragmas(
+    journal_mode: str = SQLITE_JOURNAL_MODE, synchronous: str = SQLITE_SYNCHRONOUS,
+    busy_timeout: int = SQLITE_BUSY_TIMEOUT, mmap_size: int = SQLITE_MMAP_SIZE, cache_size: int = SQLITE_CACHE_SIZE
+) -> List[str]:
+    """ Helper-Function: Returns the validated PRAGMA statements for a new SQLite connection
+
+    Raises:
+    -------
+    ValueError
+        If the journal mode or the synchronous mode is unknown
+    """
+    if journal_mode not in SQLITE_JOURNAL_MODES:
+        raise ValueError(f"SQLITE_JOURNAL_MODE must be one of {', '.join(SQLITE_JOURNAL_MODES)}.")
+
+    if synchronous not in SQLITE_SYNCHRONOUS_MODES:
+        raise ValueError(f"SQLITE_SYNCHRONOUS must be one of {', '.join(SQLITE_SYNCHRONOUS_MODES)}.")
+
+    return [
+        f"PRAGMA journal_mode={journal_mode}", # <- WAL: readers are not blocked by the writer
+        f"PRAGMA synchronous={synchronous}", # <- NORMAL is safe in WAL mode and avoids a fsync per commit
+        f"PRAGMA busy_timeout={int(busy_timeout)}", # <- Wait for the write lock instead of "database is locked"
+        f"PRAGMA mmap_size={int(mmap_size)}",
+        f"PRAGMA cache_size={int(cache_size)}",
+        "PRAGMA foreign_keys=ON"
+    ]
+
+
+def _is_sqlite_memory(url: URL) -> bool:
+    """ Helper-Function: Checks whether the URL points to an in-memory SQLite database """
+    return url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+
+
+def _instrument_statements(sync_engine: Engine, slow_query_threshold: float = SLOW_QUERY_THRESHOLD) -> None:
+    """ Helper-Function: Adds the statement count, the DB time and the rows of every statement
+    to the stats of the current request (see database/query_stats.py) and logs slow statements """
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        duration: float = time.perf_counter() - conn.info["query_start_time"].pop()
+        stats: QueryStats | None = current_query_stats.get()
+
+        if stats is not None:
+            stats.statements += 1
+            stats.db_time += duration
+
+            # Returned rows are buffered by the async drivers (except server-side cursors)
+            if cursor.description is not None:
+                stats.rows += len(getattr(cursor, "_rows", ()))
+            elif cursor.rowcount > 0:
+                stats.rows += cursor.rowcount
+
+        if 0 < slow_query_threshold <= duration:
+            redacted: Any = redact_parameters(parameters)
+            logger.warning(
+                f"Slow query ({duration * 1000:.2f} ms): {statement} | Parameters: {redacted}",
+                extra={"duration_ms": round(duration * 1000, 2), "statement": statement, "parameters": redacted}
+            )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context) -> None:
+        if exception_context.connection is not None: # <- The failed statement has no after_cursor_execute
+            exception_context.connection.info.pop("query_start_time", None)
+
+
+def create_db_engine(db_url: str, **kwargs: Any) -> AsyncEngine:
+    """ Creates the async engine with the settings of the database dialect.
+
+    SQLite connections get the pragmas from the environment (WAL mode by default),
+    every other dialect gets the pool settings with pre-ping and recycle. Every statement
+    is counted for the current request and logged if it is slow.
+
+    Returns:
+    --------
+        - (AsyncEngine): The configured engine
+    """
+    url: URL = make_url(db_url)
+    is_sqlite: bool = url.get_backend_name() == "sqlite"
+    options: Dict[str, Any] = {"echo": False}
+
+    # In-memory SQLite uses a single static connection without a pool
+    if not (is_sqlite and _is_sqlite_memory(url)):
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=DB_POOL_PRE_PING
+        )
+
+    options.update(kwargs)
+    new_engine: AsyncEngine = create_async_engine(url, **options)
+    _instrument_statements(new_engine.sync_engine)
+
+    if is_sqlite:
+        pragmas: List[str] = _sqlite_pragmas()
+
+        @event.listens_for(new_engine.sync_engine, "connect")
+        def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+            cursor = dbapi_connection.cursor()
+
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.close()
+
+    return new_engine
 
-from database.config import get_db_url
 
 # Define global variables
 logger = logging.getLogger(__name__)
 DB_URL, TEST_MODE = get_db_url()
 
-engine = create_async_engine(DB_URL, echo=False)
+engine = create_db_engine(DB_URL)
 async_session = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 Base = declarative_base()
 
@@ -19,6 +144,15 @@ async def init_models():
 
     async with engine.begin() as connection:
         await connection.run_sync(Base.metadata.create_all)
+        await connection.run_sync(_create_missing_indexes)
+
+
+def _create_missing_indexes(sync_connection) -> None:
+    """ Helper-Function: Creates indexes that were added to a model after its table
+    was created (create_all only creates the indexes of new tables) """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_connection, checkfirst=True)
 
 
 async def get_db():
@@ -0,0 +1,238 @@
+import time
+import asyncio
+import contextvars
+import logging
+from dataclasses import dataclass, field
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Awaitable, Callable, Dict, List, TypeVar
+
+from database.config import GROUP_COMMIT_ENABLED, GROUP_COMMIT_MAX_BATCH, GROUP_COMMIT_MAX_DELAY
+from database.connection import async_session
+from shared.flight_recorder import phase
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+WriteWork = Callable[[AsyncSession], Awaitable[T]]
+
+
+@dataclass
+class _PendingWrite:
+    """ A submitted write and the future of the waiting caller """
+    work: WriteWork
+    future: asyncio.Future
+    submitted_at: float = field(default_factory=time.perf_counter)
+
+
+class GroupCommitWriter:
+    """ Coalesces the writes of concurrent requests into one transaction.
+
+    The first write opens a batch, every write that arrives within max_delay (up to
+    max_batch_size) joins it. Each write runs in its own savepoint, so a failing write
+    only rolls back itself, and the whole batch is committed once. Every caller gets
+    the result (or the exception) of its own write. """
+
+    def __init__(
+        self, session_factory: Callable[[], AsyncSession], max_batch_size: int, max_delay: float, enabled: bool = True
+    ) -> None:
+        # Validate params
+        if not isinstance(max_batch_size, int) or max_batch_size < 1:
+            raise ValueError("max_batch_size must be a positive integer.")
+
+        if not isinstance(max_delay, (int, float)) or max_delay < 0:
+            raise ValueError("max_delay must be a non-negative number.")
+
+        self.session_factory: Callable[[], AsyncSession] = session_factory
+        self.max_batch_size: int = max_batch_size
+        self.max_delay: float = max_delay
+        self.enabled: bool = enabled
+
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+
+        # Counters
+        self._batches: int = 0
+        self._writes: int = 0
+        self._failed: int = 0
+        self._max_batch: int = 0
+        self._total_latency: float = 0.0
+        self._max_latency: float = 0.0
+
+    def _ensure_running(self) -> asyncio.Queue:
+        """ Helper-Method: Starts the batch loop in the running event loop (once) """
+        loop = asyncio.get_running_loop()
+
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            # A fresh context: the batches must not be attributed to the request that started the loop
+            self._task = loop.create_task(self._run(self._queue), context=contextvars.Context())
+
+        return self._queue
+
+    async def submit(self, work: WriteWork) -> T:
+        """ Runs the write in the next batch and waits until the batch is committed
+
+        Args:
+            work (WriteWork): An async function that executes the write with the given session.
+                It must not commit, its return value is passed to the caller.
+
+        Returns:
+        --------
+            - The return value of the work
+
+        Raises:
+        -------
+        Exception
+            The exception of the work or of the commit
+        """
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._ensure_running().put_nowait(_PendingWrite(work=work, future=future))
+        return await future
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        """ Helper-Method: Collects the writes into batches and commits them
+        until it receives None (see close) """
+        loop = asyncio.get_running_loop()
+        stopped: bool = False
+
+        while not stopped:
+            first: _PendingWrite | None = await queue.get()
+
+            if first is None:
+                return
+
+            batch: List[_PendingWrite] = [first]
+            deadline: float = loop.time() + self.max_delay
+
+            while len(batch) < self.max_batch_size:
+                timeout: float = deadline - loop.time()
+
+                try:
+                    pending = queue.get_nowait() if timeout <= 0 else await asyncio.wait_for(queue.get(), timeout)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+
+                if pending is None:
+                    stopped = True
+                    break
+                batch.append(pending)
+
+            try:
+                await self._commit_batch(batch)
+            except Exception as e: # <- e.g. no connection: the callers must not wait forever
+                logger.exception(f"Group commit failed: {str(e)}", exc_info=True)
+
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+
+    async def _commit_batch(self, batch: List[_PendingWrite]) -> None:
+        """ Helper-Method: Runs every write of the batch in a savepoint and commits once """
+        results: List[tuple] = []
+
+        async with self.session_factory() as session:
+            try:
+                # pysqlite only starts a transaction before DML, not before a SAVEPOINT,
+                # so without it every released savepoint would be committed on its own
+                if session.bind.dialect.name == "sqlite":
+                    await session.execute(text("BEGIN IMMEDIATE"))
+
+                for pending in batch:
+                    if pending.future.done(): # <- The caller is gone (cancelled)
+                        results.append((False, None))
+                        continue
+
+                    try:
+                        async with session.begin_nested():
+                            results.append((True, await pending.work(session)))
+                    except Exception as e:
+                        results.append((False, e))
+
+                await session.commit()
+            except Exception as e:
+                logger.exception(f"Group commit failed: {str(e)}", exc_info=True, extra={"batch_size": len(batch)})
+                await session.rollback()
+                results = [(False, e)] * len(batch)
+
+        # Resolve the callers
+        now: float = time.perf_counter()
+
+        for pending, (success, value) in zip(batch, results):
+            latency: float = now - pending.submitted_at
+            self._total_latency += latency
+            self._max_latency = max(self._max_latency, latency)
+
+            if pending.future.done():
+                continue
+
+            if success:
+                pending.future.set_result(value)
+            else:
+                self._failed += 1
+                pending.future.set_exception(value)
+
+        self._batches += 1
+        self._writes += len(batch)
+        self._max_batch = max(self._max_batch, len(batch))
+
+    def metrics(self) -> Dict[str, Any]:
+        """ Returns the configuration and the counters
+
+        Returns:
+        --------
+            - A dictionary containing whether it is enabled, the limits, the batches, the writes,
+            the failed writes, the average and max batch size and the average and max latency
+        """
+        return {
+            "enabled": self.enabled,
+            "max_batch_size": self.max_batch_size,
+            "max_delay_ms": self.max_delay * 1000,
+            "batches": self._batches,
+            "writes": self._writes,
+            "failed": self._failed,
+            "avg_batch_size": self._writes / self._batches if self._batches else 0.0,
+            "max_batch_size_seen": self._max_batch,
+            "avg_latency_ms": self._total_latency / self._writes * 1000 if self._writes else 0.0,
+            "max_latency_ms": self._max_latency * 1000
+        }
+
+    async def close(self) -> None:
+        """ Commits the writes that are already submitted and stops the batch loop """
+        if self._task is not None and not self._task.done():
+            if self._task.get_loop() is asyncio.get_running_loop():
+                self._queue.put_nowait(None)
+                await self._task
+            else:
+                self._task.cancel()
+
+        self._task = None
+        self._queue = None
+
+
+async def run_write(db_session: AsyncSession, work: WriteWork) -> T:
+    """ Runs a write and commits it: via the group commit writer if it is enabled,
+    otherwise directly with the session of the request
+
+    Returns:
+    --------
+        - The return value of the work
+    """
+    if group_commit_writer.enabled:
+        with phase("group_commit"): # <- Includes the wait for the batch
+            return await group_commit_writer.submit(work)
+
+    result = await work(db_session)
+
+    with phase("commit"):
+        await db_session.commit()
+
+    return result
+
+
+group_commit_writer = GroupCommitWriter(
+    session_factory=async_session,
+    max_batch_size=GROUP_COMMIT_MAX_BATCH,
+    max_delay=GROUP_COMMIT_MAX_DELAY,
+    enabled=GROUP_COMMIT_ENABLED
+)
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Integer, ForeignKey, desc
+from sqlalchemy import Integer, ForeignKey, Index, desc
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from database.connection import Base
 
@@ -28,7 +28,7 @@ class User(Base):
         back_populates="user",
         cascade="all, delete-orphan",
         passive_deletes=True,
-        order_by=lambda: (Todo.completed.asc(), desc(Todo.edited_at), desc(Todo.created_at))
+        order_by=lambda: (Todo.completed.asc(), desc(Todo.edited_at), desc(Todo.created_at), desc(Todo.id))
     )
 
 class Auth(Base):
@@ -52,6 +52,11 @@ class Auth(Base):
 
     user: Mapped["User"] = relationship(back_populates="auth")
 
+    __table_args__ = (
+        # Active sessions of a user (settings, refresh token validation)
+        Index("ix_auth_user_id_revoked_expires_at", "user_id", "revoked", "expires_at"),
+    )
+
 
 
 class Todo(Base):
@@ -66,4 +71,46 @@ class Todo(Base):
 
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
 
-    user: Mapped["User"] = relationship(back_populates="todos")
\ No newline at end of file
+    user: Mapped["User"] = relationship(back_populates="todos")
+
+    __table_args__ = (
+        # Todos of a user in the order of User.todos (id: tiebreaker for the pagination)
+        Index(
+            "ix_todos_user_id_completed_edited_at_created_at_id",
+            "user_id", "completed", desc("edited_at"), desc("created_at"), desc("id")
+        ),
+        # Alternative sort orders of the list (created, title) and the title prefix filter
+        Index("ix_todos_user_id_completed_created_at_id", "user_id", "completed", desc("created_at"), desc("id")),
+        Index("ix_todos_user_id_completed_title_id", "user_id", "completed", "title", "id"),
+        # Title prefix filter of the list across both states (completed is not filtered)
+        Index("ix_todos_user_id_title", "user_id", "title"),
+        # Todos changed since a watermark (sync)
+        Index("ix_todos_user_id_edited_at", "user_id", "edited_at"),
+    )
+
+
+
+class DeletedTodo(Base):
+    """ Tombstone of a deleted todo, so that the sync endpoint can report the deletion """
+    __tablename__ = "todo_deletions"
+
+    todo_id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    deleted_at: Mapped[int] = mapped_column(Integer, default=current_timestamp, nullable=False)
+
+    __table_args__ = (
+        # Deletions of a user since a watermark
+        Index("ix_todo_deletions_user_id_deleted_at", "user_id", "deleted_at"),
+        # Compaction
+        Index("ix_todo_deletions_deleted_at", "deleted_at"),
+    )
+
+
+
+class UserVersion(Base):
+    """ Version counters of the data of a user (for the ETags of the cacheable endpoints) """
+    __tablename__ = "user_versions"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    todos_version: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    sessions_version: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -0,0 +1,47 @@
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(slots=True)
+class QueryStats:
+    """ The statements a request sent to the database (see the engine events in connection.py) """
+    statements: int = 0
+    db_time: float = 0.0 # Seconds
+    rows: int = 0 # Rows returned (SELECT / RETURNING) or affected (DML)
+
+
+# The stats of the current request, None outside of a request (e.g. background tasks)
+current_query_stats: ContextVar[QueryStats | None] = ContextVar("current_query_stats", default=None)
+
+
+def start_query_stats() -> Token:
+    """ Attributes the following statements of the current context to new stats
+
+    Returns:
+    --------
+        - The token to reset the context variable (see ContextVar.reset)
+    """
+    return current_query_stats.set(QueryStats())
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """ Replaces every bound value by its type, so that a logged statement
+    contains no user data (e.g. emails, titles or password hashes)
+
+    Returns:
+    --------
+        - The parameters with the same shape, e.g. ("<str>", "<int>")
+    """
+    if isinstance(parameters, dict):
+        return {key: f"<{type(value).__name__}>" for key, value in parameters.items()}
+
+    if isinstance(parameters, (list, tuple)):
+        # executemany: a list of parameter sets
+        if parameters and isinstance(parameters[0], (list, tuple, dict)):
+            return [redact_parameters(parameter_set) for parameter_set in parameters[:3]] + (
+                [f"... {len(parameters) - 3} more"] if len(parameters) > 3 else []
+            )
+        return tuple(f"<{type(value).__name__}>" for value in parameters)
+
+    return f"<{type(parameters).__name__}>"
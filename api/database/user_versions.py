@@ -0,0 +1,79 @@
+import time
+from uuid import UUID
+from sqlalchemy import select, update, insert, func
+from sqlalchemy.dialects import sqlite, postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Tuple
+
+from database.models import Auth, UserVersion
+
+TODOS_VERSION: str = "todos_version"
+SESSIONS_VERSION: str = "sessions_version"
+
+
+async def bump_user_version(db_session: AsyncSession, user_id: UUID, column: str) -> int:
+    """ Increments the version counter of the user (in the transaction of the change)
+
+    Args:
+        db_session (AsyncSession): The session of the change (not committed here)
+        user_id (UUID): The owner of the changed data
+        column (str): TODOS_VERSION or SESSIONS_VERSION
+
+    Returns:
+    --------
+        - The new version
+    """
+    if column not in (TODOS_VERSION, SESSIONS_VERSION):
+        raise ValueError(f"Unknown version column: {column}.")
+
+    counter = getattr(UserVersion, column)
+    dialect: str = db_session.bind.dialect.name
+
+    # Upsert: one statement, the row is created by the first change of the user
+    if dialect in ("sqlite", "postgresql"):
+        dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = (
+            dialect_insert(UserVersion)
+            .values(user_id=user_id, **{column: 1})
+            .on_conflict_do_update(index_elements=[UserVersion.user_id], set_={column: counter + 1})
+            .returning(counter)
+        )
+        result = await db_session.execute(stmt)
+        return result.scalar_one()
+
+    result = await db_session.execute(
+        update(UserVersion).where(UserVersion.user_id == user_id).values({column: counter + 1}).returning(counter)
+    )
+    version: int | None = result.scalar_one_or_none()
+
+    if version is None:
+        await db_session.execute(insert(UserVersion).values(user_id=user_id, **{column: 1}))
+        version = 1
+
+    return version
+
+
+async def get_todos_version(db_session: AsyncSession, user_id: UUID) -> int:
+    """ Returns the version of the todos of the user (0 if they were never changed) """
+    result = await db_session.execute(select(UserVersion.todos_version).where(UserVersion.user_id == user_id))
+    return result.scalar_one_or_none() or 0
+
+
+async def get_sessions_state(db_session: AsyncSession, user_id: UUID) -> Tuple[int, int | None]:
+    """ Returns the version of the sessions of the user and the expiration of the next active
+    session, since an expired session disappears from the list without any change
+
+    Returns:
+    --------
+        - A tuple containing the version and the next expiration (None if there is no active session)
+    """
+    version = select(UserVersion.sessions_version).where(UserVersion.user_id == user_id).scalar_subquery()
+    next_expiration = (
+        select(func.min(Auth.expires_at))
+        .where(Auth.user_id == user_id, Auth.revoked == False, Auth.expires_at > int(time.time()))
+        .scalar_subquery()
+    )
+
+    result = await db_session.execute(select(version, next_expiration))
+    version_value, next_expiration_value = result.one()
+    return version_value or 0, next_expiration_value
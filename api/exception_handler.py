@@ -1,14 +1,16 @@
-from fastapi import Request, status
-from fastapi.responses import JSONResponse
+from fastapi import Request, Response, status
 from fastapi.exceptions import RequestValidationError
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from typing import Dict
 
+from shared.responses import FastJSONResponse
+
 ERROR_MAPPING: Dict[str, str] = {
     "email": "Email must be a valid email address."
 }
 DEFAULT_ERROR_MSG: str = "Server error: The server was unable to verify the action. Please try again later."
 
-async def validation_exception_handler(request: Request, exc: RequestValidationError) -> JSONResponse:
+async def validation_exception_handler(request: Request, exc: RequestValidationError) -> FastJSONResponse:
     """ Handler for validation errors (as from pydantic) """
     errors = exc.errors()
 
@@ -23,7 +25,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         error_msg: set = errors[0].get("msg", DEFAULT_ERROR_MSG)
         error_msg = error_msg.replace("String", field.capitalize())
 
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "detail": {
@@ -32,4 +34,14 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
             },
             "errors": errors
         }
-    )
\ No newline at end of file
+    )
+
+
+async def http_exception_handler(request: Request, exc: StarletteHTTPException) -> Response:
+    """ Handler for HTTP exceptions, like the default one but encoded by FastJSONResponse """
+    headers: Dict[str, str] | None = getattr(exc, "headers", None)
+
+    if exc.status_code in (status.HTTP_204_NO_CONTENT, status.HTTP_304_NOT_MODIFIED):
+        return Response(status_code=exc.status_code, headers=headers)
+
+    return FastJSONResponse(status_code=exc.status_code, content={"detail": exc.detail}, headers=headers)
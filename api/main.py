@@ -1,13 +1,27 @@
+import asyncio
 import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from fastapi.exceptions import RequestValidationError
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from database.connection import init_models
-from exception_handler import validation_exception_handler
+from database.group_commit import group_commit_writer
+from security.hashing import hashing_service
+from security.admission import hashing_admission
+from security.auth.session_cache import session_cache
+from security.auth.revocation_table import revocation_table
+from exception_handler import validation_exception_handler, http_exception_handler
+from shared.responses import FastJSONResponse
+from shared.compression import CompressionMiddleware
+from shared.metrics import MetricsMiddleware, metrics_registry
+from shared.flight_recorder import FlightRecorderMiddleware
+from shared.loop_monitor import loop_monitor
 from routes.auth import AuthRouter
 from routes.todo import TodoRouter
+from routes.todo.t_sync import run_todo_deletions_compaction
 from routes.settings import SettingsRouter
+from routes.ops import OpsRouter
 from security.auth.refresh_token_service import router as RefreshRouter
 
 logging.basicConfig(level=logging.INFO, format="[%(name)s.py:%(lineno)d | %(levelname)s] - %(asctime)s: %(message)s")
@@ -16,9 +30,22 @@ logging.basicConfig(level=logging.INFO, format="[%(name)s.py:%(lineno)d | %(leve
 async def lifespan(api: FastAPI):
     # Load db models
     await init_models()
+    compaction_task = asyncio.create_task(run_todo_deletions_compaction())
+    loop_monitor.start()
     yield
 
-api = FastAPI(lifespan=lifespan)
+    # Stop the compaction and the loop monitor, commit the pending writes and stop the hashing threads
+    compaction_task.cancel()
+    try:
+        await compaction_task
+    except asyncio.CancelledError:
+        pass
+
+    await loop_monitor.stop()
+    await group_commit_writer.close()
+    hashing_service.shutdown()
+
+api = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # Add middleware
 origins = [
@@ -32,12 +59,28 @@ api.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"]
 )
+api.add_middleware(CompressionMiddleware)
+api.add_middleware(FlightRecorderMiddleware) # <- Inside the metrics: sees the query stats of the request
+api.add_middleware(MetricsMiddleware) # <- Outermost: the latency includes the other middleware
+
+# Add the metrics of the components to the metrics endpoint (counters: the keys that only ever increase)
+metrics_registry.register_collector("hashing", hashing_service.metrics, counters=("completed",))
+metrics_registry.register_collector("hashing_admission", hashing_admission.metrics, counters=("admitted", "queued", "shed"))
+metrics_registry.register_collector("group_commit", group_commit_writer.metrics, counters=("batches", "writes", "failed"))
+metrics_registry.register_collector("session_cache", session_cache.metrics, counters=("hits", "misses", "invalidations"))
+metrics_registry.register_collector("revocation_table", revocation_table.metrics, counters=("generation",))
+metrics_registry.register_collector("event_loop", loop_monitor.metrics, counters=("blocked_calls",))
+metrics_registry.register_histogram(
+    "event_loop_lag_seconds", "Delay of the wake-ups of the event loop monitor.", loop_monitor.histogram
+)
 
 # Add exception handler(s)
 api.add_exception_handler(RequestValidationError, validation_exception_handler)
+api.add_exception_handler(StarletteHTTPException, http_exception_handler)
 
 # Add routers 
 api.include_router(AuthRouter)
 api.include_router(TodoRouter)
 api.include_router(RefreshRouter)
-api.include_router(SettingsRouter)
\ No newline at end of file
+api.include_router(SettingsRouter)
+api.include_router(OpsRouter)
\ No newline at end of file
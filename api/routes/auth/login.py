@@ -1,7 +1,5 @@
-import bcrypt
 import logging
 from fastapi import HTTPException, status, APIRouter, Depends, Request
-from fastapi.responses import JSONResponse
 from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -10,9 +8,13 @@ from typing import Tuple
 
 from database.models import User
 from database.connection import get_db
-from security.hashing import is_hashed
+from security.hashing import is_hashed, hashing_service
 from security.auth.refresh_token_service import RefreshTokenService
+from security.admission import require_hashing_slot
 from shared.decorators import validate_params
+from shared.flight_recorder import phase
+from shared.responses import FastJSONResponse
+from shared.compression import no_compression
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -27,7 +29,7 @@ class Login:
         self.db_session: AsyncSession = db_session
         self.data: LoginModel = data
     
-    def _verify_password(self, password_in_db: bytes) -> bool:
+    async def _verify_password(self, password_in_db: bytes) -> bool:
         """ Verifies the password against the stored hash. 
         The method compares the password with the method parameter 
         and the class instance from LoginModel.
@@ -54,7 +56,8 @@ class Login:
             raise ValueError("Password in database is not a valid hash format.")
 
         # Return the boolean whether the password is correct or not
-        return bcrypt.checkpw(self.data.password.encode("utf-8"), password_in_db_str.encode("utf-8"))
+        # (bcrypt runs in the hashing thread pool to keep the event loop free)
+        return await hashing_service.verify(password=self.data.password, hashed_password=password_in_db_str)
 
     async def _get_user(self) -> User | None:
         """ Helper method: Tries to get the user from the database 
@@ -77,14 +80,18 @@ class Login:
             - (str): A detailed message 
         """
         try:
-            user_obj = await self._get_user()
+            with phase("user_lookup"):
+                user_obj = await self._get_user()
 
             # Checks whether the user could found with this email address
             if not user_obj:
                 return None, "Login failed: This email address is not registered."
             
             # Checks whether the password, the user typed in, is not correct
-            if not self._verify_password(password_in_db=user_obj.password):
+            with phase("password_verify"): # <- bcrypt in the hashing threads
+                password_correct: bool = await self._verify_password(password_in_db=user_obj.password)
+
+            if not password_correct:
                 return None, "Login failed: Password is incorrect."
 
             return user_obj, "Login successful: Email address and password are correct."
@@ -94,7 +101,11 @@ class Login:
     
 
 @router.post("/login")
-async def login_endpoint(request: Request, data: LoginModel, db_session: AsyncSession = Depends(get_db)) -> JSONResponse:
+@no_compression # <- Carries tokens
+async def login_endpoint(
+    request: Request, data: LoginModel, db_session: AsyncSession = Depends(get_db),
+    _: None = Depends(require_hashing_slot)
+) -> FastJSONResponse:
     """ Endpoint to log in a user """
     try:
         # Default http exception
@@ -1,6 +1,5 @@
 import logging
 from fastapi import APIRouter, HTTPException, status, Depends, Request
-from fastapi.responses import JSONResponse
 from sqlalchemy import select, insert, exists
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -9,9 +8,12 @@ from typing import Tuple
 
 from database.models import User
 from database.connection import get_db
-from security.hashing import hash_pwd
+from security.hashing import hashing_service
 from security.auth.refresh_token_service import RefreshTokenService
+from security.admission import require_hashing_slot
 from shared.decorators import validate_params
+from shared.responses import FastJSONResponse
+from shared.compression import no_compression
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -57,8 +59,8 @@ class Register:
             - (User): The user object or None
         """
         try:
-            # Hashes the password
-            hashed_pwd: str = hash_pwd(self.data.password)
+            # Hashes the password (in the hashing thread pool)
+            hashed_pwd: str = await hashing_service.hash(self.data.password)
 
             # Creates the user
             stmt = (
@@ -111,7 +113,11 @@ class Register:
 
 
 @router.post("/register")
-async def register_endpoint(request: Request, data: RegisterModel, db_session: AsyncSession = Depends(get_db)) -> JSONResponse:
+@no_compression # <- Carries tokens
+async def register_endpoint(
+    request: Request, data: RegisterModel, db_session: AsyncSession = Depends(get_db),
+    _: None = Depends(require_hashing_slot)
+) -> FastJSONResponse:
     """ Endpoint to register a new user """
     try:
         # Default http exception
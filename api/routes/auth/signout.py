@@ -1,12 +1,17 @@
 import logging
+from sqlalchemy import update
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import APIRouter, Request, Depends, HTTPException, status
-from fastapi.responses import JSONResponse
 
 from security.auth.refresh_token_service import RefreshTokenVerifier
+from security.auth.session_cache import session_cache
+from security.auth.revocation_table import revocation_table
 from database.connection import get_db
+from database.group_commit import run_write
+from database.user_versions import bump_user_version, SESSIONS_VERSION
 from database.models import Auth
+from shared.responses import FastJSONResponse
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -25,10 +30,17 @@ async def signout_endpoint(request: Request, db_session: AsyncSession = Depends(
 
         # Check whether the token is valid
         if auth_obj: # <- Security, in case something goes wrong, but not necessarily
-            auth_obj.revoked = True
-            await db_session.commit()
+            stmt = update(Auth).where(Auth.jti_id == auth_obj.jti_id).values(revoked=True)
 
-            return JSONResponse(
+            async def _execute(session: AsyncSession) -> None:
+                await session.execute(stmt)
+                await bump_user_version(session, auth_obj.user_id, SESSIONS_VERSION)
+
+            await run_write(db_session=db_session, work=_execute)
+            session_cache.invalidate(auth_obj.jti_id)
+            revocation_table.add(auth_obj.jti_id, expires_at=auth_obj.expires_at)
+
+            return FastJSONResponse(
                 status_code=status.HTTP_200_OK,
                 content={"message": "You have successfully logged out."}
             )
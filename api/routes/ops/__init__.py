@@ -0,0 +1,8 @@
+from fastapi import APIRouter
+from routes.ops.o_metrics import router as MetricsRouter
+from routes.ops.o_flight_recorder import router as FlightRecorderRouter
+
+OpsRouter = APIRouter(prefix="/api/ops")
+
+OpsRouter.include_router(MetricsRouter)
+OpsRouter.include_router(FlightRecorderRouter)
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends, status
+
+from security.ops import require_ops_token
+from shared.flight_recorder import flight_recorder
+from shared.responses import FastJSONResponse
+
+router = APIRouter()
+
+
+@router.get("/flight_recorder", dependencies=[Depends(require_ops_token)])
+async def flight_recorder_endpoint() -> FastJSONResponse:
+    """ Endpoint to dump the slowest recent requests of this worker process with their phases """
+    return FastJSONResponse(status_code=status.HTTP_200_OK, content={
+        "capacity": flight_recorder.capacity,
+        "window": flight_recorder.window,
+        "requests": flight_recorder.snapshot()
+    })
@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Depends, Response
+
+from security.ops import require_ops_token
+from shared.metrics import metrics_registry, PROMETHEUS_CONTENT_TYPE
+
+router = APIRouter()
+
+
+@router.get("/metrics", dependencies=[Depends(require_ops_token)])
+async def metrics_endpoint() -> Response:
+    """ Endpoint for the Prometheus scraper: the metrics of this worker process """
+    return Response(content=metrics_registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
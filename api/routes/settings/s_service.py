@@ -1,17 +1,19 @@
 import logging
 import time
 from uuid import UUID
-from fastapi import APIRouter, HTTPException, status, Depends
-from fastapi.responses import JSONResponse
-from sqlalchemy import select
+from fastapi import APIRouter, HTTPException, status, Depends, Header, Response
+from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from typing import List, Tuple, Dict
 from pydantic import BaseModel
 
-from security.auth.jwt import get_bearer_token, decode_token
+from security.auth.jwt import get_current_principal, AuthPrincipal
 from shared.decorators import validate_params
+from shared.etag import make_etag, etag_matches, with_etag, not_modified
+from shared.responses import FastJSONResponse
 from database.connection import get_db
+from database.user_versions import get_sessions_state
 from database.models import User, Auth
 
 router = APIRouter()
@@ -27,76 +29,57 @@ class SessionSchema(BaseModel):
 
 class SettingsService:
     @validate_params
-    def __init__(self, payload: dict, db_session: AsyncSession) -> None:
+    def __init__(self, principal: AuthPrincipal, db_session: AsyncSession) -> None:
         # Validate param
-        if not isinstance(payload, dict):
-            raise TypeError("payload must be a dict.")
+        if not isinstance(principal, AuthPrincipal):
+            raise TypeError("principal must be an instance of AuthPrincipal.")
 
-        self.payload: dict = payload
+        self.principal: AuthPrincipal = principal
         self.db_session: AsyncSession = db_session
 
         # Define values
-        self.user_id_str: str = self.payload.get("sub")
-        self.session_id_str: str = self.payload.get("session_id")
-
-        # Validate params
-        if not self.user_id_str:
-            raise ValueError("Authentication failed: User could not be identified.")
-        
-        if not self.session_id_str:
-            raise ValueError("Authentication failed: Server could not verify the user.")
-        
-        # Define values with correct type
-        self.user_id: UUID = UUID(self.user_id_str)
-
-
-    async def _get_sessions(self) -> List[Dict[str, str]]:
-        """ Helper-Method: Returns a list of sessions with the schema 'SessionSchema' 
-        
+        self.user_id: UUID = principal.user_id
+        self.session_id: UUID = principal.session_id
+
+
+    async def _get_user_with_sessions(self) -> Tuple[str | None, str | None, List[Dict[str, str]]]:
+        """ Helper-Method: Fetches the username, the email address and the active sessions
+        (schema 'SessionSchema') with one query and only the needed columns
+
         Returns:
         --------
-            - A List contains:
-                - A dictionary with active sessions
+            - A Tuple contains:
+                - (str): Username (None if the user does not exist)
+                - (str): Email address (None if the user does not exist)
+                - (list): A list with a dictionary per active session
         """
-        stmt = select(Auth).where(
-            Auth.user_id == self.user_id, 
-            Auth.revoked == False,
-            Auth.expires_at > int(time.time())
+        # Outer join: a user without active sessions is still one row
+        stmt = (
+            select(User.name, User.email, Auth.jti_id, Auth.ip_address, Auth.browser, Auth.os)
+            .select_from(User)
+            .outerjoin(Auth, and_(
+                Auth.user_id == User.id,
+                Auth.revoked == False,
+                Auth.expires_at > int(time.time())
+            ))
+            .where(User.id == self.user_id)
         )
         result = await self.db_session.execute(stmt)
-        session_objs = result.scalars().all()
+        rows = result.all()
+
+        if not rows:
+            return None, None, []
 
-        return [
+        sessions: List[Dict[str, str]] = [
             {
-                **SessionSchema.model_validate(session, from_attributes=True).model_dump(mode="json"),
-                "current": str(session.jti_id) == str(self.session_id_str)
-            } 
-            for session in session_objs
+                **SessionSchema.model_validate(row, from_attributes=True).model_dump(mode="json"),
+                "current": row.jti_id == self.session_id
+            }
+            for row in rows if row.jti_id is not None
         ]
+        return rows[0].name, rows[0].email, sessions
 
-    
-    async def _get_username_and_email(self) -> Tuple[str | None, str | None]:
-        """ Helper-Method: Returns the username and email address 
-        
-        Returns:
-        --------
-            - A Tuple contains:
-                - (str): Username
-                - (str): Email address
-        """
-        stmt = select(User).where(User.id == self.user_id)
-        result = await self.db_session.execute(stmt)
-        user_obj: User = result.scalar_one_or_none()
-
-        if user_obj:
-            username: str = user_obj.name
-            email: str = user_obj.email
 
-            return username, email
-        
-        return None, None
-    
-    
     async def get(self) -> Dict[str, str | List]:
         """ Handler for user information
          
@@ -108,16 +91,13 @@ class SettingsService:
                 - (sessions): A list containing one or more dictionaries with different active sessions
         """
         try:
-            # Fetch username and email
-            username, email = await self._get_username_and_email()
+            # Fetch username, email and the sessions
+            username, email, sessions = await self._get_user_with_sessions()
 
-            # Check whether user_id or email exists before querying the sessions
+            # Check whether user_id or email exists
             if username is None or email is None:
                 raise ValueError("Authentication failed: User could not be identified.")
 
-            # Fetch the session
-            sessions: List = await self._get_sessions()
-
             return {
                 "username": username,
                 "email": email,
@@ -130,8 +110,8 @@ class SettingsService:
 
 @router.post("/service")
 async def settings_service_endpoint(
-    token: str = Depends(get_bearer_token), db_session: AsyncSession = Depends(get_db)
-) -> JSONResponse:
+    principal: AuthPrincipal = Depends(get_current_principal), db_session: AsyncSession = Depends(get_db)
+) -> FastJSONResponse:
     """ Endpoint to get the user information and sessions """
     try:
         # Define default http exception
@@ -140,15 +120,12 @@ async def settings_service_endpoint(
             detail="Loading failed: An unknown error has occurred. Please try again later."
         )
 
-        # Decode token
-        payload: dict = decode_token(token=token)
-
         # Get the informations
-        service = SettingsService(payload=payload, db_session=db_session)
+        service = SettingsService(principal=principal, db_session=db_session)
         informations = await service.get()
 
         if informations:
-            return JSONResponse(status_code=status.HTTP_200_OK, content={"informations": informations})
+            return FastJSONResponse(status_code=status.HTTP_200_OK, content={"informations": informations})
     except TypeError as e:
         http_exception.detail = "Server error: A server error has occurred. Please try again later."
         http_exception.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -158,4 +135,27 @@ async def settings_service_endpoint(
         http_exception.detail = str(e)
         logger.exception(str(e), exc_info=True)
     
-    raise http_exception
\ No newline at end of file
+    raise http_exception
+
+
+@router.get("/service")
+async def settings_service_cached_endpoint(
+    if_none_match: str | None = Header(None), principal: AuthPrincipal = Depends(get_current_principal),
+    db_session: AsyncSession = Depends(get_db)
+) -> Response:
+    """ Cacheable variant of settings_service_endpoint: Answers 304 without loading the sessions
+    if they did not change (or expire) since the ETag was issued """
+    try:
+        version, next_expiration = await get_sessions_state(db_session=db_session, user_id=principal.user_id)
+    except SQLAlchemyError as e: # <- Serve the informations without an ETag
+        logger.exception(f"Database error: {str(e)}", exc_info=True, extra={"user_id": principal.user_id})
+        return await settings_service_endpoint(principal=principal, db_session=db_session)
+
+    # The session id is part of it because of the "current" flag of the sessions
+    etag: str = make_etag("settings", principal.user_id, principal.session_id, version, next_expiration)
+
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    response = await settings_service_endpoint(principal=principal, db_session=db_session)
+    return with_etag(response, etag)
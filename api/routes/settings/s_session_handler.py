@@ -1,14 +1,18 @@
 import logging
 from uuid import UUID
 from fastapi import APIRouter, HTTPException, status, Depends
-from fastapi.responses import JSONResponse
 from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
-from security.auth.jwt import get_bearer_token, decode_token
+from security.auth.jwt import get_current_principal, AuthPrincipal
+from security.auth.session_cache import session_cache
+from security.auth.revocation_table import revocation_table
 from shared.decorators import validate_params
+from shared.responses import FastJSONResponse
 from database.connection import get_db
+from database.group_commit import run_write
+from database.user_versions import bump_user_version, SESSIONS_VERSION
 from database.models import Auth
 
 router = APIRouter()
@@ -16,45 +20,19 @@ logger = logging.getLogger(__name__)
 
 class SettingSessionsHandler:
     @validate_params
-    def __init__(self, jti_id: UUID, current_token: str, db_session: AsyncSession) -> None:
+    def __init__(self, jti_id: UUID, principal: AuthPrincipal, db_session: AsyncSession) -> None:
         # Validate params
         if not isinstance(jti_id, UUID):
             raise TypeError("jti_id must be an UUID.")
         
-        if not isinstance(current_token, str):
-            raise TypeError("current_token must be a string.")
+        if not isinstance(principal, AuthPrincipal):
+            raise TypeError("principal must be an instance of AuthPrincipal.")
 
         self.jti_id: UUID = jti_id
-        self.token: str = current_token
         self.db_session: AsyncSession = db_session
 
-        self.session_id: str | None = None
-        self.user_id: str | None = None
-
-        # Decode the token
-        self.__decode_token()
-
-    def __decode_token(self) -> None:
-        """ Decode the token and set the session_id and user_id globally """
-        payload: dict = decode_token(token=self.token)
-        
-        # Check whether the token could not be decoded correclty
-        if not payload:
-            raise ValueError("Invalid token: Token has no payload.")
-
-        # Extract the session id and the user id from the token
-        self.session_id: str = payload.get("session_id", None)
-        self.user_id: str = payload.get("sub", None)
-
-        # Check whether the values are in the token
-        if not self.session_id:
-            raise ValueError("session_id must be not None.")
-        
-        if not self.user_id:
-            raise ValueError("sub must be not None.")
-        
-        # Try to convert the user_id to a UUID
-        self.user_id: UUID = UUID(self.user_id)
+        self.session_id: UUID = principal.session_id
+        self.user_id: UUID = principal.user_id
 
 
     async def revoke(self) -> bool:
@@ -66,12 +44,12 @@ class SettingSessionsHandler:
         """
         # Check whether the session is connected with the current session
         # if self._is_session_match():
-        if str(self.jti_id) == str(self.session_id):
+        if self.jti_id == self.session_id:
             logger.warning(
                 "User tried to revoke the current session", extra={
                     "user_id": self.user_id,
                     "jti_id": self.jti_id,
-                    "token": self.token
+                    "session_id": self.session_id
                 }
             )
             raise HTTPException(
@@ -85,23 +63,34 @@ class SettingSessionsHandler:
                 Auth.jti_id == self.jti_id,
                 Auth.user_id == self.user_id
             ).values(revoked=True)
+            .returning(Auth.expires_at)
         )
-        result = await self.db_session.execute(stmt)
+
+        async def _execute(db_session: AsyncSession) -> int | None:
+            result = await db_session.execute(stmt)
+            expires_at = result.scalar_one_or_none()
+
+            if expires_at is not None:
+                await bump_user_version(db_session, self.user_id, SESSIONS_VERSION)
+            return expires_at
+
+        expires_at: int | None = await run_write(db_session=self.db_session, work=_execute)
 
         # Check whether the update was unsuccessful
-        if not result.rowcount > 0:
+        if expires_at is None:
             logger.warning(
                 "Update failed: The session could not be revoked successfully due to an " \
                 "unexpected update error.", extra={
                     "user_id": self.user_id,
                     "jti_id": self.jti_id,
-                    "token": self.token,
+                    "session_id": self.session_id,
                 }
             )
             return False, self.user_id
 
         # If the update was successful
-        await self.db_session.commit()
+        session_cache.invalidate(self.jti_id)
+        revocation_table.add(self.jti_id, expires_at=expires_at)
         return True, self.user_id
 
 
@@ -114,8 +103,9 @@ class SessionID(BaseModel):
 
 @router.post("/session/revoke")
 async def settings_revoke_session_endpoint(
-    payload: SessionID, token: str = Depends(get_bearer_token), db_session: AsyncSession = Depends(get_db) 
-) -> JSONResponse:
+    payload: SessionID, principal: AuthPrincipal = Depends(get_current_principal), 
+    db_session: AsyncSession = Depends(get_db)
+) -> FastJSONResponse:
     """ """
     http_exception = HTTPException(
         status_code=status.HTTP_400_BAD_REQUEST,
@@ -123,7 +113,7 @@ async def settings_revoke_session_endpoint(
     )
 
     try:
-        handler = SettingSessionsHandler(jti_id=UUID(payload.jti_id), current_token=token, db_session=db_session)
+        handler = SettingSessionsHandler(jti_id=UUID(payload.jti_id), principal=principal, db_session=db_session)
         result, user_id = await handler.revoke()
 
         if not result:
@@ -135,11 +125,11 @@ async def settings_revoke_session_endpoint(
             "Device successfully logged out.", extra={
                 "user_id": user_id,
                 "jti_id": payload.jti_id,
-                "token": token
+                "session_id": principal.session_id
             }
         )
 
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=status.HTTP_200_OK,
             content={"message": "The device has been successfully logged out."}
         )
@@ -4,6 +4,10 @@ from .t_creation import router as TodoCreationRouter
 from .t_deletion import router as TodoDeletionRouter
 from .t_editor import router as TodoEditorRouter
 from .t_completor import router as TodoCompletorRouter
+from .t_sync import router as TodoSyncRouter
+from .t_bulk import router as TodoBulkRouter
+from .t_export import router as TodoExportRouter
+from .t_counts import router as TodoCountsRouter
 
 TodoRouter = APIRouter(prefix="/api/todo")
 
@@ -11,4 +15,8 @@ TodoRouter.include_router(HomeRouter)
 TodoRouter.include_router(TodoCreationRouter)
 TodoRouter.include_router(TodoDeletionRouter)
 TodoRouter.include_router(TodoEditorRouter)
-TodoRouter.include_router(TodoCompletorRouter)
\ No newline at end of file
+TodoRouter.include_router(TodoCompletorRouter)
+TodoRouter.include_router(TodoSyncRouter)
+TodoRouter.include_router(TodoBulkRouter)
+TodoRouter.include_router(TodoExportRouter)
+TodoRouter.include_router(TodoCountsRouter)
\ No newline at end of file
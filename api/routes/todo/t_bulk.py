@@ -0,0 +1,196 @@
+import logging
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import insert, update, delete, case
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Set, Tuple
+
+from database.models import Todo, DeletedTodo
+from database.connection import get_db
+from database.group_commit import run_write
+from database.user_versions import bump_user_version, TODOS_VERSION
+from security.auth.jwt import get_current_principal, AuthPrincipal
+from shared.decorators import validate_params
+from shared.responses import FastJSONResponse
+from routes.todo.t_validation_models import TodoBulkModel
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+DEFAULT_BULK_ERROR_MSG: str = "Bulk operation failed: The todos could not be changed for technical reasons. " \
+"Please try again later."
+DUPLICATE_TODO_MSG: str = "Operation failed: The todo is already part of another operation of this request."
+
+# Per operation: (execution type, success message), in the wording of the single endpoints
+OPERATIONS: Dict[str, Tuple[str, str]] = {
+    "create": ("Creation", "Creation successful: Todo successfully created."),
+    "update": ("Update", "Update successful: Todo successfully updated!"),
+    "complete": ("Completion", "Completion successful: Todo marked as completed successfully."),
+    "delete": ("Deletion", "Deletion successful: Todo successfully deleted!")
+}
+
+
+class TodoBulk:
+    """ Class to run a list of mixed todo operations with one statement per operation type
+    and one commit """
+    @validate_params
+    def __init__(self, data: TodoBulkModel, user_id: UUID, db_session: AsyncSession) -> None:
+        self.data: TodoBulkModel = data
+        self.user_id: UUID = user_id
+        self.db_session: AsyncSession = db_session
+
+    def _group_operations(self) -> Tuple[Dict[str, List[Tuple[int, Any]]], Dict[int, Dict[str, Any]]]:
+        """ Helper-Method: Groups the operations by type, a todo can only be part of one operation
+
+        Returns:
+        --------
+            - A tuple containing:
+                - The operations (with their index) per type
+                - The results of the rejected operations per index
+        """
+        grouped: Dict[str, List[Tuple[int, Any]]] = {op: [] for op in OPERATIONS}
+        rejected: Dict[int, Dict[str, Any]] = {}
+        seen: Set[UUID] = set()
+
+        for index, operation in enumerate(self.data.operations):
+            todo_id: UUID | None = getattr(operation, "todo_id", None)
+
+            if todo_id is not None:
+                if todo_id in seen:
+                    rejected[index] = self._result(index, operation.op, False, DUPLICATE_TODO_MSG, todo_id)
+                    continue
+                seen.add(todo_id)
+
+            grouped[operation.op].append((index, operation))
+
+        return grouped, rejected
+
+    @staticmethod
+    def _result(index: int, op: str, success: bool, message: str, todo_id: UUID | None) -> Dict[str, Any]:
+        """ Helper-Method: Returns the result of one operation """
+        return {
+            "index": index, "op": op, "success": success, "message": message,
+            "todo_id": str(todo_id) if todo_id is not None else None
+        }
+
+    async def _execute(
+        self, db_session: AsyncSession, grouped: Dict[str, List[Tuple[int, Any]]]
+    ) -> Tuple[List[UUID], Set[UUID]]:
+        """ Helper-Method: Runs the set-based statements (in one transaction, see run_write)
+
+        Returns:
+        --------
+            - A tuple containing:
+                - The ids of the created todos (in the order of the creations)
+                - The ids of the updated, completed and deleted todos
+        """
+        created: List[UUID] = []
+        changed: Set[UUID] = set()
+
+        # Multi-row INSERT
+        if grouped["create"]:
+            result = await db_session.execute(
+                insert(Todo).returning(Todo.id, sort_by_parameter_order=True),
+                [
+                    {"user_id": self.user_id, "title": op.title.strip(), "description": op.description.strip()}
+                    for _, op in grouped["create"]
+                ]
+            )
+            created = list(result.scalars().all())
+
+        # One UPDATE with a CASE per column
+        if grouped["update"]:
+            updates: List[Any] = [op for _, op in grouped["update"]]
+            result = await db_session.execute(
+                update(Todo)
+                .where(Todo.user_id == self.user_id, Todo.id.in_([op.todo_id for op in updates]))
+                .values(
+                    title=case({op.todo_id: op.title for op in updates}, value=Todo.id),
+                    description=case({op.todo_id: op.description for op in updates}, value=Todo.id)
+                )
+                .returning(Todo.id)
+            )
+            changed.update(result.scalars().all())
+
+        if grouped["complete"]:
+            result = await db_session.execute(
+                update(Todo)
+                .where(Todo.user_id == self.user_id, Todo.id.in_([op.todo_id for _, op in grouped["complete"]]))
+                .values(completed=True)
+                .returning(Todo.id)
+            )
+            changed.update(result.scalars().all())
+
+        if grouped["delete"]:
+            result = await db_session.execute(
+                delete(Todo)
+                .where(Todo.user_id == self.user_id, Todo.id.in_([op.todo_id for _, op in grouped["delete"]]))
+                .returning(Todo.id)
+            )
+            deleted: List[UUID] = list(result.scalars().all())
+            changed.update(deleted)
+
+            # Tombstones for the sync endpoint
+            if deleted:
+                await db_session.execute(
+                    insert(DeletedTodo), [{"todo_id": todo_id, "user_id": self.user_id} for todo_id in deleted]
+                )
+
+        if created or changed:
+            await bump_user_version(db_session, self.user_id, TODOS_VERSION)
+
+        return created, changed
+
+    async def run(self) -> Tuple[List[Dict[str, Any]], str | None]:
+        """ Method to run the operations and commit them once
+
+        Returns:
+        --------
+            - A tuple containing:
+                - The results in the order of the operations
+                - An error message if the whole batch failed (nothing was changed)
+        """
+        grouped, results = self._group_operations()
+
+        try:
+            created, changed = await run_write(
+                db_session=self.db_session, work=lambda db_session: self._execute(db_session, grouped)
+            )
+        except SQLAlchemyError as e:
+            logger.exception(f"Database error: {str(e)}", exc_info=True, extra={"user_id": self.user_id})
+            return [], DEFAULT_BULK_ERROR_MSG
+
+        for (index, _), todo_id in zip(grouped["create"], created):
+            results[index] = self._result(index, "create", True, OPERATIONS["create"][1], todo_id)
+
+        for op in ("update", "complete", "delete"):
+            execution_type, success_msg = OPERATIONS[op]
+
+            for index, operation in grouped[op]:
+                success: bool = operation.todo_id in changed
+                message: str = success_msg if success else f"{execution_type} failed: Todo could not be found."
+                results[index] = self._result(index, op, success, message, operation.todo_id)
+
+        logger.info("Bulk operation executed.", extra={
+            "user_id": self.user_id, "operations": len(results),
+            "failed": sum(not result["success"] for result in results.values())
+        })
+        return [results[index] for index in range(len(self.data.operations))], None
+
+
+@router.post("/bulk")
+async def todo_bulk_endpoint(
+    data: TodoBulkModel, principal: AuthPrincipal = Depends(get_current_principal),
+    db_session: AsyncSession = Depends(get_db)
+) -> FastJSONResponse:
+    """ Endpoint to create, update, complete and delete several todos with one request """
+    try:
+        results, error_msg = await TodoBulk(data=data, user_id=principal.user_id, db_session=db_session).run()
+
+        if error_msg is None:
+            return FastJSONResponse(status_code=status.HTTP_200_OK, content={"results": results})
+    except (TypeError, ValueError) as e: # Fallback
+        logger.exception(str(e), exc_info=True)
+
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=DEFAULT_BULK_ERROR_MSG)
@@ -3,13 +3,13 @@ from uuid import UUID
 from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import APIRouter, Depends
-from fastapi.responses import JSONResponse
-from typing import Tuple
+from typing import Any, Dict, Tuple
 
 from database.models import Todo
 from database.connection import get_db
-from security.auth.jwt import get_bearer_token
+from security.auth.jwt import get_current_principal, AuthPrincipal
 from shared.decorators import validate_params
+from shared.responses import FastJSONResponse
 from routes.todo.t_validation_models import TodoCompletorModel
 from routes.todo.t_utils import (
     TodoExistCheckModel,
@@ -30,13 +30,14 @@ class TodoCompletor:
         self.db_session: AsyncSession = db_session
         self.user_id: UUID = user_id
 
-    async def mark_as_completed(self) -> Tuple[bool, str]:
+    async def mark_as_completed(self) -> Tuple[bool, str, Dict[str, Any] | None]:
         """ Method to mark a todo as completed 
         
         Returns:
         --------
             - A boolean: To check whether the completion was successful or not
             - A string containing the completion information
+            - The changed todo and the new version of the todo list (None if it failed)
         """
         return await run_todo_db_statement(
             ctx=RunTodoDbStatementContext(
@@ -60,14 +61,14 @@ class TodoCompletor:
 
 @router.post("/complete")
 async def completor_endpoint(
-    data: TodoCompletorModel, token: str = Depends(get_bearer_token), 
+    data: TodoCompletorModel, principal: AuthPrincipal = Depends(get_current_principal), 
     db_session: AsyncSession = Depends(get_db)
-) -> JSONResponse:
+) -> FastJSONResponse:
     """ Endpoint to mark a todo as completed """
     return await handle_todo_request(
         data_model=data, db_session=db_session,
         params=HandleTodoRequestModel(
-            token=token,
+            principal=principal,
             service_class=TodoCompletor,
             service_method="mark_as_completed",
             default_error_message=DEFAULT_COMPLETION_ERROR_MSG
@@ -0,0 +1,70 @@
+import logging
+from uuid import UUID
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy import select, func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict
+
+from database.models import Todo
+from database.connection import get_db
+from database.user_versions import get_todos_version
+from security.auth.jwt import get_current_principal, AuthPrincipal
+from shared.decorators import validate_params
+from shared.etag import make_etag, etag_matches, with_etag, not_modified
+from shared.responses import FastJSONResponse
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+DEFAULT_COUNTS_ERROR_MSG: str = "Counts failed: The todos could not be counted. Please try again later."
+
+
+class TodoCounts:
+    @validate_params
+    def __init__(self, db_session: AsyncSession, user_id: UUID) -> None:
+        self.user_id: UUID = user_id
+        self.db_session: AsyncSession = db_session
+
+    async def get(self) -> Dict[str, int]:
+        """ Counts the open and completed todos with one aggregate query
+        (served by the (user_id, completed, ...) index, no todo is loaded)
+
+        Returns:
+        --------
+            - A dictionary containing the open, completed and total number of todos
+        """
+        result = await self.db_session.execute(
+            select(Todo.completed, func.count()).where(Todo.user_id == self.user_id).group_by(Todo.completed)
+        )
+        counts: Dict[bool, int] = dict(result.all())
+
+        return {
+            "open": counts.get(False, 0),
+            "completed": counts.get(True, 0),
+            "total": sum(counts.values())
+        }
+
+
+@router.get("/counts")
+async def todo_counts_endpoint(
+    if_none_match: str | None = Header(None), principal: AuthPrincipal = Depends(get_current_principal),
+    db_session: AsyncSession = Depends(get_db)
+) -> Response:
+    """ Endpoint to get the number of open and completed todos (e.g. for badges),
+    answers 304 if the todos did not change since the ETag was issued """
+    try:
+        version: int = await get_todos_version(db_session=db_session, user_id=principal.user_id)
+        etag: str = make_etag("todo_counts", principal.user_id, version)
+
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+        counts = await TodoCounts(db_session=db_session, user_id=principal.user_id).get()
+        return with_etag(FastJSONResponse(status_code=status.HTTP_200_OK, content=counts), etag)
+    except SQLAlchemyError as e:
+        logger.exception(f"Database error: {str(e)}", exc_info=True, extra={"user_id": principal.user_id})
+    except (TypeError, ValueError) as e: # Fallback
+        logger.exception(str(e), exc_info=True)
+
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=DEFAULT_COUNTS_ERROR_MSG)
@@ -1,15 +1,15 @@
 from uuid import UUID
 from logging import getLogger
 from fastapi import APIRouter, Depends
-from fastapi.responses import JSONResponse
 from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Tuple
+from typing import Any, Dict, Tuple
 
 from database.models import Todo
 from database.connection import get_db
-from security.auth.jwt import get_bearer_token
+from security.auth.jwt import get_current_principal, AuthPrincipal
 from shared.decorators import validate_params
+from shared.responses import FastJSONResponse
 from routes.todo.t_utils import (
     run_todo_db_statement, RunTodoDbStatementContext,
     handle_todo_request
@@ -38,13 +38,14 @@ class TodoCreation:
         self.description: str = self.data.description.strip()
         
 
-    async def create(self) -> Tuple[bool, str]:
+    async def create(self) -> Tuple[bool, str, Dict[str, Any] | None]:
         """ Method to create the todo for the user
          
         Returns:
         ---------
             - A boolean: To check whether the deletion was successful or not
             - A string containing the deletion information
+            - The changed todo and the new version of the todo list (None if it failed)
         """
         return await run_todo_db_statement(
             ctx=RunTodoDbStatementContext(
@@ -58,7 +59,6 @@ class TodoCreation:
                     .returning(Todo)
                 ),
                 db_session=self.db_session,
-                should_todo_exist=False,
                 success_msg="Creation successful: Todo successfully created.",
                 default_error_msg=DEFAULT_UPDATE_FAILED_MSG,
                 execution_type="Creation"
@@ -68,14 +68,14 @@ class TodoCreation:
 
 @router.post("/create")
 async def create_todo_endpoint(
-    data: TodoCreationModel, token: str = Depends(get_bearer_token), 
+    data: TodoCreationModel, principal: AuthPrincipal = Depends(get_current_principal), 
     db_session: AsyncSession = Depends(get_db)
-) -> JSONResponse:
+) -> FastJSONResponse:
     """ Endpoint to create a new todo """
     return await handle_todo_request(
         data_model=data, db_session=db_session,
         params=HandleTodoRequestModel(
-            token=token, service_class=TodoCreation, service_method="create",
+            principal=principal, service_class=TodoCreation, service_method="create",
             default_error_message=DEFAULT_UPDATE_FAILED_MSG
         )
     )
\ No newline at end of file
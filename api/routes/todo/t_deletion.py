@@ -1,15 +1,15 @@
 import logging
 from uuid import UUID
 from fastapi import APIRouter, Depends
-from fastapi.responses import JSONResponse
-from sqlalchemy import delete
+from sqlalchemy import delete, insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Tuple
+from typing import Any, Dict, Tuple
 
-from database.models import Todo
+from database.models import Todo, DeletedTodo
 from database.connection import get_db
-from security.auth.jwt import get_bearer_token
+from security.auth.jwt import get_current_principal, AuthPrincipal
 from shared.decorators import validate_params
+from shared.responses import FastJSONResponse
 from routes.todo.t_validation_models import TodoDeletionModel, TodoExistCheckModel
 from routes.todo.t_utils import (
     run_todo_db_statement, RunTodoDbStatementContext,
@@ -29,13 +29,14 @@ class TodoDeletion:
         self.user_id: UUID = user_id
         self.db_session: AsyncSession = db_session
 
-    async def delete(self) -> Tuple[bool, str]:
+    async def delete(self) -> Tuple[bool, str, Dict[str, Any] | None]:
         """ Method to delete a todo for the user
 
         Returns:
         ---------
             - A boolean: To check whether the deletion was successful or not
             - A string containing the deletion information
+            - The changed todo and the new version of the todo list (None if it failed)
         """
         return await run_todo_db_statement(
             ctx=RunTodoDbStatementContext(
@@ -51,22 +52,27 @@ class TodoDeletion:
                 db_session=self.db_session,
                 success_msg="Deletion successful: Todo successfully deleted!",
                 default_error_msg=DEFAULT_DELETION_ERROR_MSG,
-                execution_type="Deletion"
+                execution_type="Deletion",
+                after_execute=self._record_deletion
             )
         )
 
+    async def _record_deletion(self, db_session: AsyncSession, todo_id: UUID) -> None:
+        """ Helper-Method: Stores the tombstone for the sync endpoint (in the transaction of the deletion) """
+        await db_session.execute(insert(DeletedTodo).values(todo_id=todo_id, user_id=self.user_id))
+
 
 
 @router.post("/delete")
 async def todo_deletion_endpoint(
     data: TodoDeletionModel, db_session: AsyncSession = Depends(get_db), 
-    token: str = Depends(get_bearer_token)
-) -> JSONResponse:
+    principal: AuthPrincipal = Depends(get_current_principal)
+) -> FastJSONResponse:
     """ Endpoint to delete a todo for an user """
     return await handle_todo_request(
         data_model=data, db_session=db_session,
         params=HandleTodoRequestModel(
-            token=token, 
+            principal=principal, 
             service_class=TodoDeletion,
             service_method="delete",
             default_error_message=DEFAULT_DELETION_ERROR_MSG
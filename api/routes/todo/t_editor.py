@@ -3,13 +3,13 @@ from uuid import UUID
 from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import APIRouter, Depends
-from fastapi.responses import JSONResponse
-from typing import Tuple
+from typing import Any, Dict, Tuple
 
 from database.models import Todo
 from database.connection import get_db
-from security.auth.jwt import get_bearer_token
+from security.auth.jwt import get_current_principal, AuthPrincipal
 from shared.decorators import validate_params
+from shared.responses import FastJSONResponse
 from routes.todo.t_validation_models import TodoEditorModel, TodoExistCheckModel
 from routes.todo.t_utils import (
     run_todo_db_statement, RunTodoDbStatementContext,
@@ -30,13 +30,14 @@ class TodoEditor:
         self.user_id: UUID = user_id
         self.data: TodoEditorModel = data
 
-    async def update(self) -> Tuple[bool, str]:
+    async def update(self) -> Tuple[bool, str, Dict[str, Any] | None]:
         """ Method to update a todo for the user 
         
         Returns:
         ---------
             - A boolean to check whether the update was successful or not
             - A detailed string
+            - The changed todo and the new version of the todo list (None if it failed)
         """
         return await run_todo_db_statement(
             ctx=RunTodoDbStatementContext(
@@ -61,13 +62,13 @@ class TodoEditor:
 @router.post("/update")
 async def todo_update_endpoint(
     data: TodoEditorModel,
-    db_session: AsyncSession = Depends(get_db), token: str = Depends(get_bearer_token),
-) -> JSONResponse:
+    db_session: AsyncSession = Depends(get_db), principal: AuthPrincipal = Depends(get_current_principal),
+) -> FastJSONResponse:
     """ Endpoint to update a todo for an user """
     return await handle_todo_request(
         data_model=data, db_session=db_session,
         params=HandleTodoRequestModel(
-            token=token,
+            principal=principal,
             service_class=TodoEditor,
             service_method="update",
             default_error_message=DEFAULT_UPDATE_FAILED_MSG
@@ -0,0 +1,65 @@
+import logging
+from uuid import UUID
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator
+
+from database.models import Todo
+from database.connection import get_db
+from security.auth.jwt import get_current_principal, AuthPrincipal
+from shared.decorators import validate_params
+from routes.todo.t_schemas import TODO_COLUMNS
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Rows per fetch of the server-side cursor (and per chunk of the response)
+EXPORT_BATCH_SIZE: int = 500
+
+
+class TodoExport:
+    @validate_params
+    def __init__(self, db_session: AsyncSession, user_id: UUID) -> None:
+        self.user_id: UUID = user_id
+        self.db_session: AsyncSession = db_session
+
+    async def stream_ndjson(self, batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[bytes]:
+        """ Streams the todos in the order of User.todos as NDJSON (one todo per line).
+
+        Only one batch of rows is held in memory, no matter how many todos the user has.
+
+        Returns:
+        --------
+            - An async iterator of chunks with up to batch_size lines
+        """
+        stmt = (
+            select(*TODO_COLUMNS)
+            .where(Todo.user_id == self.user_id)
+            .order_by(Todo.completed.asc(), Todo.edited_at.desc(), Todo.created_at.desc(), Todo.id.desc())
+            .execution_options(yield_per=batch_size)
+        )
+
+        try:
+            result = await self.db_session.stream(stmt)
+
+            async for rows in result.partitions():
+                yield b"".join(to_json(row._asdict()) + b"\n" for row in rows)
+        except SQLAlchemyError as e: # <- The status is already sent: the export ends early
+            logger.exception(f"Database error: {str(e)}", exc_info=True, extra={"user_id": self.user_id})
+
+
+@router.get("/export")
+async def export_todos_endpoint(
+    principal: AuthPrincipal = Depends(get_current_principal), db_session: AsyncSession = Depends(get_db)
+) -> StreamingResponse:
+    """ Endpoint to download all todos as NDJSON, streamed from the database """
+    service = TodoExport(db_session=db_session, user_id=principal.user_id)
+
+    return StreamingResponse(
+        service.stream_ndjson(), media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="todos.ndjson"'}
+    )
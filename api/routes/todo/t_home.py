@@ -1,23 +1,43 @@
+import json
+import base64
 import logging
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import JSONResponse
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy import Row, select, tuple_
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Tuple
-from pydantic import BaseModel, ConfigDict
+from typing import Dict, List, Tuple
 
-from database.models import User
+from database.models import User, Todo
 from database.connection import get_db
-from security.auth.jwt import decode_token, get_bearer_token
+from database.user_versions import get_todos_version
+from security.auth.jwt import get_current_principal, AuthPrincipal
 from shared.decorators import validate_params
+from shared.etag import make_etag, etag_matches, with_etag, not_modified
+from shared.responses import FastJSONResponse
+from routes.todo.t_schemas import TODO_COLUMNS, TODO_LIST_ADAPTER
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 DEFAULT_UNKNOWN_ERROR_MSG: str = "Unknown user: User could not be indentified."
+INVALID_CURSOR_MSG: str = "Invalid cursor: The page could not be loaded."
+MAX_PAGE_SIZE: int = 200
+MAX_TITLE_PREFIX_LENGTH: int = 140 # <- Max length of a title
+
+# Sort orders of the list (open todos always come first): the keyset columns in the order of
+# their index (see Todo.__table_args__) and whether they are descending. The last column is unique
+# (id: tiebreaker, so that no todo is skipped at a page boundary).
+TODO_SORTS: Dict[str, Tuple[tuple, bool]] = {
+    "edited": ((Todo.edited_at, Todo.created_at, Todo.id), True),
+    "created": ((Todo.created_at, Todo.id), True),
+    "title": ((Todo.title, Todo.id), False)
+}
+SORT_PATTERN: str = f"^({'|'.join(TODO_SORTS)})$"
+
+# Opt-in format of the todo list: one array per field instead of one object per todo
+COLUMNAR_MEDIA_TYPE: str = "application/vnd.mytasks.columnar+json"
+COLUMNAR_FIELDS: Tuple[str, ...] = ("id", "title", "description", "completed") # <- Fields of TodoSchema
 
 class TodoHome():
     @validate_params
@@ -25,55 +45,230 @@ class TodoHome():
         self.user_id: UUID = user_id
         self.db_session: AsyncSession = db_session
 
-    async def get_username_with_todos(self) -> Tuple[str | None, list, str | None]:
+    async def _get_todos(
+        self, completed: bool | None, after: tuple | None, limit: int | None,
+        title_prefix: str | None = None, sort: str = "edited"
+    ) -> List[Row]:
+        """ Helper-Method: Fetches the todos in the sort order (the default is the order of User.todos)
+
+        Args:
+            completed (bool | None): Only todos with this state (None = both, completed ones last)
+            after (tuple | None): Only todos after this key (the keyset columns of the sort)
+            limit (int | None): The maximum number of todos (None = all)
+            title_prefix (str | None): Only todos whose title starts with it (case-sensitive)
+            sort (str): The sort order (see TODO_SORTS)
+
+        Returns:
+        --------
+            - A list of todo rows (see TODO_COLUMNS)
+        """
+        columns, descending = TODO_SORTS[sort]
+        stmt = select(*TODO_COLUMNS).where(Todo.user_id == self.user_id)
+
+        if completed is not None:
+            stmt = stmt.where(Todo.completed == completed)
+
+        # A range instead of LIKE, so that it is served by the (user_id, title) indexes
+        if title_prefix:
+            stmt = stmt.where(Todo.title >= title_prefix)
+            upper_bound: str | None = _prefix_upper_bound(title_prefix)
+
+            if upper_bound is not None:
+                stmt = stmt.where(Todo.title < upper_bound)
+
+        # Row-value comparison: an index range scan no matter how deep the page is
+        if after is not None:
+            stmt = stmt.where(tuple_(*columns) < after if descending else tuple_(*columns) > after)
+
+        stmt = stmt.order_by(
+            Todo.completed.asc(), *(column.desc() if descending else column.asc() for column in columns)
+        ).limit(limit)
+
+        result = await self.db_session.execute(stmt)
+        return list(result.all())
+
+    async def _get_todos_page(
+        self, limit: int | None, cursor: str | None, completed: bool | None = None,
+        title_prefix: str | None = None, sort: str = "edited"
+    ) -> Tuple[List[Row], str | None]:
+        """ Helper-Method: Fetches the page of todos after the cursor
+
+        Open todos come first, so a page may span both partitions (at most two queries).
+        With a completed filter, only its partition is read.
+
+        Returns:
+        --------
+            - A tuple containing the todos and the cursor of the next page (None on the last page)
+        """
+        if limit is None and cursor is None:
+            todos: List[Row] = await self._get_todos(
+                completed=completed, after=None, limit=None, title_prefix=title_prefix, sort=sort
+            )
+            return todos, None
+
+        partition, after = decode_cursor(cursor, sort) if cursor else (bool(completed), None)
+
+        if completed is not None and partition != completed:
+            raise ValueError(INVALID_CURSOR_MSG)
+
+        fetch: int | None = limit + 1 if limit is not None else None # <- One more to know whether a next page exists
+
+        todos = await self._get_todos(
+            completed=partition, after=after, limit=fetch, title_prefix=title_prefix, sort=sort
+        )
+
+        if completed is None and not partition and (fetch is None or len(todos) < fetch):
+            todos += await self._get_todos(
+                completed=True, after=None, limit=fetch - len(todos) if fetch is not None else None,
+                title_prefix=title_prefix, sort=sort
+            )
+
+        if limit is not None and len(todos) > limit:
+            todos = todos[:limit]
+            return todos, encode_cursor(todos[-1], sort)
+
+        return todos, None
+
+    async def get_username_with_todos(
+        self, limit: int | None = None, cursor: str | None = None, completed: bool | None = None,
+        title_prefix: str | None = None, sort: str = "edited"
+    ) -> Tuple[str | None, list, str | None, str | None]:
         """Fetches the username and todos for the user.
 
+        Args:
+            limit (int | None): The page size (None = all todos)
+            cursor (str | None): The next_cursor of the previous page (of the same options)
+            completed (bool | None): Only open (False) or completed (True) todos (None = both)
+            title_prefix (str | None): Only todos whose title starts with it (case-sensitive)
+            sort (str): The sort order within the open and the completed todos (see TODO_SORTS)
+
         Returns:
         --------
-            Tuple[str, list, str]: A tuple containing:
+            Tuple[str, list, str, str]: A tuple containing:
                 - The username as a string.
                 - A list of todo items.
+                - The cursor of the next page, otherwise NoneType.
                 - An error message if an error occurred, otherwise NoneType.
+
+        Raises:
+        -------
+        ValueError
+            If the cursor is invalid
         """
         try:
-            stmt: tuple = (
-                select(User)
-                .options(selectinload(User.todos))
-                .where(User.id == self.user_id)
-            )
-
-            # Fetches the user object
-            result = await self.db_session.execute(stmt)
-            user_obj: User = result.scalar_one_or_none()
+            # Fetches the username
+            result = await self.db_session.execute(select(User.name).where(User.id == self.user_id))
+            username: str | None = result.scalar_one_or_none()
 
             # Checks whether the user could not be found
-            if not user_obj:
-                return None, [], DEFAULT_UNKNOWN_ERROR_MSG
+            if username is None:
+                return None, [], None, DEFAULT_UNKNOWN_ERROR_MSG
             
             # Return the requested informations
-            username: str = user_obj.name
-            todos: list = user_obj.todos
-
-            return username, todos, None
+            todos, next_cursor = await self._get_todos_page(
+                limit=limit, cursor=cursor, completed=completed, title_prefix=title_prefix, sort=sort
+            )
+            return username, todos, next_cursor, None
         except SQLAlchemyError as e: # Fallback, if an unexpected database error occurrs
             logger.exception(f"Database error: {str(e)}", exc_info=True, extra={"user_id": self.user_id})
-            return None, [], "Server error: Please try it later again."
+            return None, [], None, "Server error: Please try it later again."
+
 
+def _prefix_upper_bound(prefix: str) -> str | None:
+    """ Helper-Function: Returns the smallest string that is greater than every string with the prefix
 
-class TodoSchema(BaseModel):
-    """ Schema to return every todo correctly """
-    id: UUID
-    title: str
-    description: str
-    completed: bool
+    Returns:
+    --------
+        - The bound or None if there is none (the prefix only consists of U+10FFFF)
+    """
+    # The last code point cannot be incremented: the bound of the shorter prefix
+    stripped: str = prefix.rstrip(chr(0x10FFFF))
+
+    if not stripped:
+        return None
+
+    next_code_point: int = ord(stripped[-1]) + 1
+
+    # Skip the surrogates (they cannot be encoded as UTF-8 when the bound is sent to the database)
+    if next_code_point == 0xD800:
+        next_code_point = 0xE000
+
+    return stripped[:-1] + chr(next_code_point)
+
+
+def encode_cursor(todo: Row, sort: str = "edited") -> str:
+    """ Helper-Function: Creates the opaque cursor that points behind the todo """
+    columns, _ = TODO_SORTS[sort]
+    values: list = [getattr(todo, column.key) for column in columns]
+
+    key: list = [todo.completed] + [value.hex if isinstance(value, UUID) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(",", ":")).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, sort: str = "edited") -> Tuple[bool, tuple]:
+    """ Helper-Function: Reads the cursor created by encode_cursor
+
+    Returns:
+    --------
+        - A tuple containing the completed state and the key (the keyset columns of the sort)
+
+    Raises:
+    -------
+    ValueError
+        If the cursor is invalid (or was created for another sort)
+    """
+    columns, _ = TODO_SORTS[sort]
+
+    try:
+        completed, *values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+
+        if not isinstance(completed, bool) or len(values) != len(columns):
+            raise ValueError
+
+        key: list = []
+        for column, value in zip(columns, values):
+            python_type: type = column.type.python_type
+
+            if python_type is UUID:
+                value = UUID(hex=value)
+            elif not isinstance(value, python_type) or isinstance(value, bool):
+                raise ValueError
+
+            key.append(value)
+
+        return completed, tuple(key)
+    except (ValueError, TypeError, UnicodeError, AttributeError):
+        raise ValueError(INVALID_CURSOR_MSG)
+
+
+def is_columnar_requested(response_format: str | None, accept: str | None) -> bool:
+    """ Helper-Function: Checks whether the client asked for the columnar format,
+    the query parameter takes precedence over the Accept header """
+    if response_format is not None:
+        return response_format == "columnar"
+
+    return accept is not None and COLUMNAR_MEDIA_TYPE in accept
+
+
+def todos_to_columns(todos: List[Row]) -> Dict[str, tuple]:
+    """ Helper-Function: Transposes the rows (see TODO_COLUMNS) into one array per field
+    of TodoSchema, without building a dict or a model per todo """
+    columns: List[tuple] = list(zip(*todos)) if todos else [()] * len(COLUMNAR_FIELDS)
+    return dict(zip(COLUMNAR_FIELDS, columns))
 
-    model_config = ConfigDict(from_attributes=True)
 
 @router.post("/get_all")
 async def get_all_todos_endpoint(
-    token: str = Depends(get_bearer_token), db_session: AsyncSession = Depends(get_db)
-) -> JSONResponse:
-    """ Endpoint to get all todos """
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE), cursor: str | None = Query(None, max_length=256),
+    completed: bool | None = Query(None), sort: str = Query("edited", pattern=SORT_PATTERN),
+    title_prefix: str | None = Query(None, min_length=1, max_length=MAX_TITLE_PREFIX_LENGTH),
+    response_format: str | None = Query(None, alias="format", pattern="^(json|columnar)$"),
+    accept: str | None = Header(None), principal: AuthPrincipal = Depends(get_current_principal),
+    db_session: AsyncSession = Depends(get_db)
+) -> FastJSONResponse:
+    """ Endpoint to get the todos: all of them, or one page if a limit is given. They can be filtered
+    by the completed state and a title prefix and sorted by edited (default), created or title.
+    With ?format=columnar (or the columnar media type in Accept) the todos are parallel arrays. """
     try:
         # Define standard http exception
         http_exception = HTTPException(
@@ -81,17 +276,11 @@ async def get_all_todos_endpoint(
             detail=DEFAULT_UNKNOWN_ERROR_MSG
         )
 
-        # Gets the user id from the token
-        payload: dict = decode_token(token=token)
-        user_id: str = payload.get("sub")
-
-        # If the token has no user id
-        if not user_id:
-            raise http_exception
-        
         # Request to get the todos and the username
-        todo_service = TodoHome(db_session=db_session, user_id=UUID(user_id))
-        username, todos, error_msg = await todo_service.get_username_with_todos()
+        todo_service = TodoHome(db_session=db_session, user_id=principal.user_id)
+        username, todos, next_cursor, error_msg = await todo_service.get_username_with_todos(
+            limit=limit, cursor=cursor, completed=completed, title_prefix=title_prefix, sort=sort
+        )
 
         # If an error is occurred
         if error_msg is not None:
@@ -99,13 +288,59 @@ async def get_all_todos_endpoint(
             raise http_exception
 
         # Return response if no error is occurred
-        return JSONResponse(
+        if is_columnar_requested(response_format, accept):
+            return FastJSONResponse(
+                status_code=status.HTTP_200_OK, media_type=COLUMNAR_MEDIA_TYPE, headers={"Vary": "Accept"},
+                content={"username": username, "todos": todos_to_columns(todos), "next_cursor": next_cursor}
+            )
+
+        return FastJSONResponse(
             status_code=status.HTTP_200_OK, content={
                 "username": username, 
-                "todos": [todo.model_dump(mode="json") for todo in map(TodoSchema.model_validate, todos)]
-            }
+                "todos": TODO_LIST_ADAPTER.validate_python(todos, from_attributes=True), # <- Encoded by the response
+                "next_cursor": next_cursor
+            }, headers={"Vary": "Accept"}
         )
     except (TypeError, ValueError) as e: # Fallback
         logger.exception(str(e), exc_info=True)
-        http_exception.detail = "An unexpected error occurred: Please try again later."
-        raise http_exception
\ No newline at end of file
+        http_exception.detail = (
+            INVALID_CURSOR_MSG if str(e) == INVALID_CURSOR_MSG else "An unexpected error occurred: Please try again later."
+        )
+        raise http_exception
+
+
+@router.get("/get_all")
+async def get_all_todos_cached_endpoint(
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE), cursor: str | None = Query(None, max_length=256),
+    completed: bool | None = Query(None), sort: str = Query("edited", pattern=SORT_PATTERN),
+    title_prefix: str | None = Query(None, min_length=1, max_length=MAX_TITLE_PREFIX_LENGTH),
+    response_format: str | None = Query(None, alias="format", pattern="^(json|columnar)$"),
+    accept: str | None = Header(None), if_none_match: str | None = Header(None),
+    principal: AuthPrincipal = Depends(get_current_principal), db_session: AsyncSession = Depends(get_db)
+) -> Response:
+    """ Cacheable variant of get_all_todos_endpoint: Answers 304 without loading the todos
+    if the version of the todos did not change since the ETag was issued """
+    try:
+        version: int = await get_todos_version(db_session=db_session, user_id=principal.user_id)
+    except SQLAlchemyError as e: # <- Serve the list without an ETag
+        logger.exception(f"Database error: {str(e)}", exc_info=True, extra={"user_id": principal.user_id})
+        return await get_all_todos_endpoint(
+            limit=limit, cursor=cursor, completed=completed, sort=sort, title_prefix=title_prefix,
+            response_format=response_format, accept=accept, principal=principal, db_session=db_session
+        )
+
+    columnar: bool = is_columnar_requested(response_format, accept)
+    etag: str = make_etag(
+        "todos", principal.user_id, version, limit, cursor, completed, sort, title_prefix, columnar
+    )
+
+    if etag_matches(if_none_match, etag):
+        response = not_modified(etag)
+        response.headers["Vary"] = "Accept"
+        return response
+
+    response = await get_all_todos_endpoint(
+        limit=limit, cursor=cursor, completed=completed, sort=sort, title_prefix=title_prefix,
+        response_format=response_format, accept=accept, principal=principal, db_session=db_session
+    )
+    return with_etag(response, etag)
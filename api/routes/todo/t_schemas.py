@@ -0,0 +1,25 @@
+from uuid import UUID
+from typing import List
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+
+from database.models import Todo
+
+# The columns the todo endpoints serialize: plain rows instead of ORM entities (no identity map)
+TODO_COLUMNS: tuple = (Todo.id, Todo.title, Todo.description, Todo.completed, Todo.created_at, Todo.edited_at)
+
+class TodoSchema(BaseModel):
+    """ Schema to return every todo correctly """
+    id: UUID
+    title: str
+    description: str
+    completed: bool
+
+    model_config = ConfigDict(from_attributes=True)
+
+# Validates the rows in one call, the models are encoded to bytes by FastJSONResponse
+TODO_LIST_ADAPTER: TypeAdapter[List[TodoSchema]] = TypeAdapter(List[TodoSchema])
+
+class TodoDetailSchema(TodoSchema):
+    """ Schema to return a changed todo, with the timestamps for the order of the list """
+    created_at: int
+    edited_at: int
@@ -0,0 +1,122 @@
+import math
+import time
+import asyncio
+import logging
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import Row, select, delete
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List
+
+from database.models import Todo, DeletedTodo
+from database.connection import get_db, async_session
+from database.config import (
+    TODO_DELETIONS_RETENTION, TODO_DELETIONS_COMPACTION_INTERVAL, SQLITE_BUSY_TIMEOUT, GROUP_COMMIT_MAX_DELAY
+)
+from security.auth.jwt import get_current_principal, AuthPrincipal
+from shared.decorators import validate_params
+from shared.responses import FastJSONResponse
+from routes.todo.t_schemas import TodoSchema, TODO_COLUMNS
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYNC_ERROR_MSG: str = "Sync failed: Todos could not be loaded. Please try again later."
+
+# Timestamps have a resolution of one second and are set before the commit. A write can still
+# wait for the write lock (SQLITE_BUSY_TIMEOUT) and for its group-commit batch after that, so the
+# watermark lags behind by that much to pick up writes that were still in flight during the read
+WATERMARK_LAG: int = math.ceil(SQLITE_BUSY_TIMEOUT / 1000 + GROUP_COMMIT_MAX_DELAY) + 2 # Seconds
+
+
+class TodoSync:
+    @validate_params
+    def __init__(self, db_session: AsyncSession, user_id: UUID) -> None:
+        self.user_id: UUID = user_id
+        self.db_session: AsyncSession = db_session
+
+    async def get_changes(self, since: int | None) -> Dict[str, list | int | bool]:
+        """ Fetches the todos created or edited since the watermark and the ids of the deleted todos
+
+        Args:
+            since (int | None): The watermark of the previous sync (None = first sync)
+
+        Returns:
+        --------
+            - A dictionary containing:
+                - (todos): The changed todos (all todos if reset is True)
+                - (deleted): The ids of the deleted todos
+                - (watermark): The value for the next sync
+                - (reset): Whether the client must replace its list (first sync or
+                    the watermark is older than the kept deletions)
+        """
+        watermark: int = int(time.time()) - WATERMARK_LAG
+        reset: bool = since is None or since < int(time.time()) - TODO_DELETIONS_RETENTION
+
+        stmt = select(*TODO_COLUMNS).where(Todo.user_id == self.user_id)
+        deleted: List[UUID] = []
+
+        if not reset:
+            stmt = stmt.where(Todo.edited_at >= since)
+
+            result = await self.db_session.execute(
+                select(DeletedTodo.todo_id).where(DeletedTodo.user_id == self.user_id, DeletedTodo.deleted_at >= since)
+            )
+            deleted = list(result.scalars().all())
+
+        result = await self.db_session.execute(stmt)
+        todos: List[Row] = list(result.all())
+
+        return {
+            "todos": [TodoSchema.model_validate(todo).model_dump(mode="json") for todo in todos],
+            "deleted": [str(todo_id) for todo_id in deleted],
+            "watermark": watermark,
+            "reset": reset
+        }
+
+
+async def compact_todo_deletions(db_session: AsyncSession, retention: int = TODO_DELETIONS_RETENTION) -> int:
+    """ Deletes the tombstones that are older than the retention window
+
+    Returns:
+    --------
+        - The number of deleted tombstones
+    """
+    result = await db_session.execute(
+        delete(DeletedTodo).where(DeletedTodo.deleted_at < int(time.time()) - retention)
+    )
+    await db_session.commit()
+    return result.rowcount
+
+
+async def run_todo_deletions_compaction(interval: int = TODO_DELETIONS_COMPACTION_INTERVAL) -> None:
+    """ Background task (see lifespan): Compacts the tombstones periodically """
+    while True:
+        try:
+            async with async_session() as db_session:
+                removed: int = await compact_todo_deletions(db_session=db_session)
+
+            if removed:
+                logger.info("Compacted todo deletions.", extra={"removed": removed})
+        except SQLAlchemyError as e:
+            logger.exception(f"Database error: {str(e)}", exc_info=True)
+
+        await asyncio.sleep(interval)
+
+
+@router.post("/sync")
+async def sync_todos_endpoint(
+    since: int | None = Query(None, ge=0),
+    principal: AuthPrincipal = Depends(get_current_principal), db_session: AsyncSession = Depends(get_db)
+) -> FastJSONResponse:
+    """ Endpoint to get the todos changed since the watermark of the previous sync """
+    try:
+        changes = await TodoSync(db_session=db_session, user_id=principal.user_id).get_changes(since=since)
+        return FastJSONResponse(status_code=status.HTTP_200_OK, content=changes)
+    except SQLAlchemyError as e:
+        logger.exception(f"Database error: {str(e)}", exc_info=True, extra={"user_id": principal.user_id})
+    except (TypeError, ValueError) as e: # Fallback
+        logger.exception(str(e), exc_info=True)
+
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=DEFAULT_SYNC_ERROR_MSG)
@@ -1,17 +1,18 @@
 import logging
 from uuid import UUID
-from sqlalchemy import select, exists
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from dataclasses import dataclass
 from fastapi import HTTPException
-from fastapi.responses import JSONResponse
-from typing import Any, Tuple, TYPE_CHECKING
+from typing import Any, Awaitable, Callable, Dict, Tuple, TYPE_CHECKING
 from sqlalchemy.sql import Executable
 
 from routes.todo.t_validation_models import TodoExistCheckModel, HandleTodoRequestModel
-from database.models import Todo
-from security.auth.jwt import decode_token
+from database.group_commit import run_write
+from database.user_versions import bump_user_version, TODOS_VERSION
+from routes.todo.t_schemas import TodoDetailSchema
+from shared.flight_recorder import phase
+from shared.responses import FastJSONResponse
 
 if TYPE_CHECKING:
     from routes.todo.t_validation_models import TodoExistCheckModel
@@ -19,30 +20,6 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
-async def todo_exists(data: TodoExistCheckModel, db_session: AsyncSession) -> bool:
-    """ Helper-Function to check whether the task already exists or not. 
-    
-    Returns:
-    ---------
-        - A boolean
-    """
-    # Validate the db session
-    if not isinstance(db_session, AsyncSession):
-        raise ValueError("db_session must be an AsyncSession.")
-    
-    # Check what information is provided
-    if data.todo_id:
-        stmt = select(exists().where(Todo.user_id == data.user_id, Todo.id == data.todo_id))
-    
-    elif data.title:
-        stmt = select(exists().where(Todo.user_id == data.user_id, Todo.title == data.title))
-        
-    # Start db request
-    result = await db_session.execute(stmt)
-    return result.scalar()
-
-
-
 @dataclass
 class RunTodoDbStatementContext:
     """ 
@@ -65,8 +42,9 @@ class RunTodoDbStatementContext:
             
             execution_type (str): Describes the tyoe of execution (e.g. Creation, Update, Deletion, ...)
 
-            should_todo_exist (bool): If it is set to True, a todo with the title or id must exist. 
-                Default is False.
+            after_execute (Callable | None): Runs with the db session and the todo id after a
+                successful statement, in the same transaction (e.g. to record the deletion).
+                Default is None.
     """
 
     data: "TodoExistCheckModel"
@@ -75,9 +53,9 @@ class RunTodoDbStatementContext:
     success_msg: str
     default_error_msg: str
     execution_type: str
-    should_todo_exist: bool = True
+    after_execute: Callable[[AsyncSession, UUID], Awaitable[None]] | None = None
 
-async def run_todo_db_statement(ctx: RunTodoDbStatementContext) -> Tuple[bool, str]:
+async def run_todo_db_statement(ctx: RunTodoDbStatementContext) -> Tuple[bool, str, Dict[str, Any] | None]:
     """
     Helper-Function to run a database statement for the todo
 
@@ -88,41 +66,55 @@ async def run_todo_db_statement(ctx: RunTodoDbStatementContext) -> Tuple[bool, s
         tuple:
             - bool: Whether the operation was successful
             - str: A message describing the outcome
+            - dict | None: The changed todo (see TodoDetailSchema) and the new version
+                of the todo list, so that the client does not have to reload the list
     """
 
     try:
-        # Checks whether the todo does not exist but only if it is required
-        if ctx.should_todo_exist:
-            if not await todo_exists(data=ctx.data, db_session=ctx.db_session):
-                return (False, f"{ctx.execution_type} failed: Todo could not be found.")
+        # Execute and commit the statement (it filters on the user and the todo
+        # and returns the row, so no row means that the todo does not exist)
+        async def _execute(db_session: AsyncSession) -> Dict[str, Any] | None:
+            with phase("todo_statement"):
+                result = await db_session.execute(ctx.db_statement)
+                todo_obj = result.scalar_one_or_none()
 
-        # Execute the statement
-        result = await ctx.db_session.execute(ctx.db_statement)
-        todo_obj = result.scalar_one_or_none()
+            if todo_obj is None:
+                return None
 
-        # Check whether the execution was successfully
-        if todo_obj is not None:
-            await ctx.db_session.commit()
+            # Serialize the row before the commit expires it
+            todo: Dict[str, Any] = TodoDetailSchema.model_validate(todo_obj).model_dump(mode="json")
+
+            if ctx.after_execute is not None:
+                await ctx.after_execute(db_session, todo_obj.id)
+
+            # Invalidates the ETag of the todo list (see t_home.py)
+            version: int = await bump_user_version(db_session, ctx.data.user_id, TODOS_VERSION)
+            return {"todo": todo, "version": version}
 
-            logger.info(ctx.success_msg, extra={"user_id": ctx.data.user_id, "todo_id": todo_obj.id})
-            return (True, ctx.success_msg)
+        payload: Dict[str, Any] | None = await run_write(db_session=ctx.db_session, work=_execute)
+
+        # Check whether the execution was successfully
+        if payload is not None:
+            logger.info(ctx.success_msg, extra={"user_id": ctx.data.user_id, "todo_id": payload["todo"]["id"]})
+            return (True, ctx.success_msg, payload)
         
-        # If the execution wasn't successfully
-        logger.warning(f"{ctx.execution_type} failed: Unknown error occurred.", extra={
+        # If no todo matched
+        logger.warning(f"{ctx.execution_type} failed: Todo could not be found.", extra={
             "user_id": ctx.data.user_id, "todo_id": ctx.data.todo_id
         })
+        return (False, f"{ctx.execution_type} failed: Todo could not be found.", None)
     # Fallback exception handler if the database has problems
     except IntegrityError as e:
         logger.exception(f"Insertion failed: {str(e)}", exc_info=True)
     except SQLAlchemyError as e:
         logger.exception(f"Database error: {str(e)}", exc_info=True)
     
-    return (False, ctx.default_error_msg)
+    return (False, ctx.default_error_msg, None)
 
 
 async def handle_todo_request(
     data_model: Any, db_session: AsyncSession, params: HandleTodoRequestModel
-) -> JSONResponse:
+) -> FastJSONResponse:
     """
         Helper-Function for todo api endpoints
 
@@ -133,7 +125,7 @@ async def handle_todo_request(
                 (see more information on the docs of this Pydantic model) 
 
         Returns:
-            JSONResponse: A FastAPI response
+            FastJSONResponse: A FastAPI response
     """
     # Default http exception
     http_exception = HTTPException(
@@ -142,24 +134,17 @@ async def handle_todo_request(
     )
 
     try:
-        # Extract the user id from token
-        payload: dict = decode_token(token=params.token)
-        user_id: str = payload.get("sub")
-
-        # Check whether the user ID exists
-        if not user_id:
-            raise ValueError("Token error: User ID is not included in the token.")
-
         # Define service instance and method
-        service = params.service_class(data=data_model, db_session=db_session, user_id=UUID(user_id))
+        service = params.service_class(data=data_model, db_session=db_session, user_id=params.principal.user_id)
         method = getattr(service, params.service_method)
 
         # Calls the method
-        success, msg = await method()
+        with phase("todo_service"):
+            success, msg, payload = await method()
 
-        # Checks whether the call was successful
+        # Checks whether the call was successful (with the changed todo and the list version)
         if success:
-            return JSONResponse(status_code=params.http_status_success, content={"message": msg})
+            return FastJSONResponse(status_code=params.http_status_success, content={"message": msg, **(payload or {})})
 
         # If it wasn't successfully
         http_exception.detail = msg
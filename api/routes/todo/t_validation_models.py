@@ -1,7 +1,9 @@
 from uuid import UUID
 from fastapi import status
 from pydantic import BaseModel, Field, model_validator, field_validator
-from typing import Optional, Type, Any
+from typing import Annotated, List, Literal, Optional, Type, Any, Union
+
+from security.auth.jwt import AuthPrincipal
 
 class TodoCreationModel(BaseModel):
     title: str = Field(min_length=2, max_length=140)
@@ -15,6 +17,27 @@ class TodoEditorModel(TodoCreationModel):
 
 TodoCompletorModel = TodoDeletionModel
 
+MAX_BULK_OPERATIONS: int = 200
+
+class BulkCreationModel(TodoCreationModel):
+    op: Literal["create"]
+
+class BulkEditorModel(TodoEditorModel):
+    op: Literal["update"]
+
+class BulkCompletorModel(TodoCompletorModel):
+    op: Literal["complete"]
+
+class BulkDeletionModel(TodoDeletionModel):
+    op: Literal["delete"]
+
+BulkOperationModel = Annotated[
+    Union[BulkCreationModel, BulkEditorModel, BulkCompletorModel, BulkDeletionModel], Field(discriminator="op")
+]
+
+class TodoBulkModel(BaseModel):
+    operations: List[BulkOperationModel] = Field(min_length=1, max_length=MAX_BULK_OPERATIONS)
+
 class TodoExistCheckModel(BaseModel):
     user_id: UUID
     title: Optional[str] = None
@@ -31,7 +54,7 @@ class TodoExistCheckModel(BaseModel):
 class HandleTodoRequestModel(BaseModel):
     """
         Args:
-            token (str): Bearer token
+            principal (AuthPrincipal): The authenticated user (see get_current_principal)
             service_class (Any): The service class to instantiate (e.g., TodoEditor)
             service_method (str): The method name to call (e.g. "update", "delete", ...)
             default_error_message (str): The default error message which should be returned if an error occurred
@@ -39,7 +62,7 @@ class HandleTodoRequestModel(BaseModel):
             http_status_exception (int): The exception status_code. Default is 400 (BAD REQUEST).
     """
 
-    token: str = Field(..., min_length=10)
+    principal: AuthPrincipal
     service_class: Type[Any]
     service_method: str
     default_error_message: str
@@ -1,4 +1,5 @@
 import os
+import hashlib
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -7,4 +8,30 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 15))
 REFRESH_MAX_AGE = int(os.getenv("REFRESH_MAX_AGE", 60 * 60 * 24 * 7))  # Default to 7 days
-SECURE_HTTPS = os.getenv("SECURE_HTTPS", "False").lower() == "true"
\ No newline at end of file
+SECURE_HTTPS = os.getenv("SECURE_HTTPS", "False").lower() == "true"
+HASHING_WORKERS = int(os.getenv("HASHING_WORKERS", min(4, os.cpu_count() or 1)))  # Threads for bcrypt
+
+# Admission control for the password hashing endpoints (per worker process)
+HASHING_MAX_CONCURRENT = int(os.getenv("HASHING_MAX_CONCURRENT", HASHING_WORKERS * 2))
+HASHING_MAX_QUEUE = int(os.getenv("HASHING_MAX_QUEUE", 32))
+HASHING_QUEUE_TIMEOUT = float(os.getenv("HASHING_QUEUE_TIMEOUT", 5))  # Seconds
+HASHING_RETRY_AFTER = int(os.getenv("HASHING_RETRY_AFTER", 2))  # Seconds
+
+# Cache for the session validity (bounded by the lifetime of an access token)
+SESSION_CACHE_TTL = min(int(os.getenv("SESSION_CACHE_TTL", 60)), ACCESS_TOKEN_EXPIRE_MINUTES * 60)  # Seconds
+SESSION_CACHE_MAX_ENTRIES = int(os.getenv("SESSION_CACHE_MAX_ENTRIES", 10000))
+
+
+# Revoked sessions shared by all worker processes on the host (empty path disables it). The default
+# is a private directory: the runtime directory of the user or .run in the app directory
+_REVOCATION_TABLE_DIR = os.getenv("XDG_RUNTIME_DIR") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".run"
+)
+_DEFAULT_REVOCATION_TABLE_PATH = os.path.join(
+    _REVOCATION_TABLE_DIR,
+    f"mytasks-revocations-{hashlib.sha1(os.getenv('DATABASE_URL', '').encode('utf-8')).hexdigest()[:12]}.bin"
+)
+REVOCATION_TABLE_PATH = os.getenv("REVOCATION_TABLE_PATH", _DEFAULT_REVOCATION_TABLE_PATH)
+REVOCATION_TABLE_SLOTS = int(os.getenv("REVOCATION_TABLE_SLOTS", 65536))
+# Bearer token of the ops endpoints (metrics), empty disables them
+OPS_TOKEN = os.getenv("OPS_TOKEN", "")
@@ -0,0 +1,148 @@
+import asyncio
+import logging
+from collections import deque
+from fastapi import HTTPException, status
+from typing import AsyncGenerator, Callable, Deque, Dict
+
+from security import (
+    HASHING_MAX_CONCURRENT, HASHING_MAX_QUEUE,
+    HASHING_QUEUE_TIMEOUT, HASHING_RETRY_AFTER
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OVERLOAD_MSG: str = "Server overloaded: Too many requests at the moment. Please try again later."
+
+class AdmissionController:
+    """ Limits how many requests can run an expensive endpoint at the same time.
+    Requests above the limit wait in a bounded queue, everything beyond the queue
+    (or waiting longer than the timeout) is rejected immediately with a 503. """
+
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float, retry_after: int) -> None:
+        # Validate params
+        if not isinstance(max_concurrent, int) or max_concurrent < 1:
+            raise ValueError("max_concurrent must be a positive integer.")
+
+        if not isinstance(max_queue, int) or max_queue < 0:
+            raise ValueError("max_queue must be a non-negative integer.")
+
+        if not isinstance(queue_timeout, (int, float)) or queue_timeout <= 0:
+            raise ValueError("queue_timeout must be a positive number.")
+
+        self.max_concurrent: int = max_concurrent
+        self.max_queue: int = max_queue
+        self.queue_timeout: float = queue_timeout
+        self.retry_after: int = retry_after
+
+        self._active: int = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+        # Counters
+        self._admitted: int = 0
+        self._queued: int = 0
+        self._shed: int = 0
+
+    def _shed_request(self, reason: str) -> HTTPException:
+        """ Helper-Method: Counts the rejected request and returns the 503 exception """
+        self._shed += 1
+        logger.warning(f"Request shed: {reason}", extra={
+            "active": self._active, "queue_depth": len(self._waiters)
+        })
+
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=DEFAULT_OVERLOAD_MSG,
+            headers={"Retry-After": str(self.retry_after)}
+        )
+
+    async def acquire(self) -> None:
+        """ Waits for a free slot
+
+        Raises:
+        -------
+        HTTPException
+            If the queue is full or the request waited longer than the queue timeout
+        """
+        # Admit directly if a slot is free and nobody is waiting before us
+        if self._active < self.max_concurrent and not self._waiters:
+            self._active += 1
+            self._admitted += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            raise self._shed_request("The wait queue is full.")
+
+        # Wait until a finished request hands over its slot
+        waiter: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._queued += 1
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over in the meantime -> give it back
+                self.release()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise self._shed_request("The request waited too long for a free slot.")
+
+        self._admitted += 1
+
+    def release(self) -> None:
+        """ Frees the slot or hands it over to the next waiting request """
+        while self._waiters:
+            waiter = self._waiters.popleft()
+
+            if not waiter.done():
+                waiter.set_result(None) # <- The slot stays active for the waiter
+                return
+
+        self._active -= 1
+
+    def metrics(self) -> Dict[str, int]:
+        """ Returns the current state and the counters
+
+        Returns:
+        --------
+            - A dictionary containing the limits, the active requests, the queue depth
+            and the admitted, queued and shed requests
+        """
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "active": self._active,
+            "queue_depth": len(self._waiters),
+            "admitted": self._admitted,
+            "queued": self._queued,
+            "shed": self._shed
+        }
+
+
+def admission_dependency(controller: AdmissionController) -> Callable[[], AsyncGenerator[None, None]]:
+    """ Creates a FastAPI dependency that holds a slot of the controller
+    for the whole request """
+    async def dependency() -> AsyncGenerator[None, None]:
+        await controller.acquire()
+
+        try:
+            yield
+        finally:
+            controller.release()
+
+    return dependency
+
+
+# Shared by every endpoint that hashes or verifies a password,
+# since they all compete for the same hashing threads
+hashing_admission = AdmissionController(
+    max_concurrent=HASHING_MAX_CONCURRENT,
+    max_queue=HASHING_MAX_QUEUE,
+    queue_timeout=HASHING_QUEUE_TIMEOUT,
+    retry_after=HASHING_RETRY_AFTER
+)
+require_hashing_slot = admission_dependency(hashing_admission)
@@ -5,12 +5,16 @@ from datetime import datetime, timedelta, timezone
 from fastapi import HTTPException, status, Header, Depends
 from jwt.exceptions import PyJWTError
 from passlib.context import CryptContext
+from pydantic import BaseModel, ConfigDict
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database.models import Auth
 from database.connection import get_db
 from security import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from security.auth.session_cache import session_cache
+from security.auth.revocation_table import revocation_table
+from shared.flight_recorder import phase
 
 logger = logging.getLogger(__name__)
 
@@ -62,26 +66,70 @@ def create_token(data: dict, expire_delta: timedelta | None = None) -> str:
 
 
 
-async def _verify_bearer_token(token: str, db_session: AsyncSession) -> bool:
-    """ Helper-Function for get_bearer_token to validate the correctness of the token """
+class AuthPrincipal(BaseModel):
+    """ The authenticated user of the current request (decoded once from the access token) """
+    user_id: UUID
+    session_id: UUID
+    exp: int
+
+    model_config = ConfigDict(frozen=True)
+
+
+def _decode_principal(token: str) -> AuthPrincipal:
+    """ Helper-Function: Decodes the access token into the principal
+
+    Raises:
+    -------
+    TypeError
+        If the token could not be decoded or has no user id or session id
+    """
     payload: dict = decode_token(token=token)
+    user_id: str = payload.get("sub")
     session_id: str = payload.get("session_id")
 
-    if not session_id:
+    if not user_id or not session_id:
         raise TypeError("Authentication failed: Server could not verify the user.")
 
-    # Start checking 
-    stmt = select(Auth).where(Auth.jti_id == UUID(session_id), Auth.revoked == False)
-    result = await db_session.execute(stmt)
-    return bool(result.scalar_one_or_none())
+    return AuthPrincipal(user_id=UUID(user_id), session_id=UUID(session_id), exp=payload["exp"])
+
+
+async def _verify_bearer_token(token: str, db_session: AsyncSession) -> AuthPrincipal | None:
+    """ Helper-Function for get_current_principal to validate the correctness of the token
+
+    Returns:
+    --------
+        - (AuthPrincipal | None): The principal or None (if the session is not valid)
+    """
+    with phase("jwt_decode"):
+        principal: AuthPrincipal = _decode_principal(token=token)
+
+    # Check whether the session was revoked by any worker on this host
+    if revocation_table.contains(principal.session_id):
+        return None
+
+    # Check whether the validity of the session is already cached
+    is_valid: bool | None = session_cache.get(principal.session_id)
+
+    if is_valid is None:
+        stmt = select(Auth.jti_id).where(Auth.jti_id == principal.session_id, Auth.revoked == False)
+
+        with phase("session_lookup"):
+            result = await db_session.execute(stmt)
+            is_valid = result.scalar_one_or_none() is not None
+
+        session_cache.set(principal.session_id, is_valid)
+
+    return principal if is_valid else None
 
 
-async def get_bearer_token(authorization: str = Header(None), db_session: AsyncSession = Depends(get_db)) -> str:
-    """ Function to get the bearer token from header
+async def get_current_principal(
+    authorization: str = Header(None), db_session: AsyncSession = Depends(get_db)
+) -> AuthPrincipal:
+    """ Dependency to authenticate the request with the bearer token from header
     
     Returns:
     ---------
-        - (str): A token in string format
+        - (AuthPrincipal): The authenticated user and session
     """
     try:
         http_exception = HTTPException(
@@ -92,9 +140,10 @@ async def get_bearer_token(authorization: str = Header(None), db_session: AsyncS
         # Verify the access token
         if authorization and authorization.startswith("Bearer "):
             token: str = authorization[len("Bearer "):]
+            principal: AuthPrincipal | None = await _verify_bearer_token(token=token, db_session=db_session)
 
-            if await _verify_bearer_token(token=token, db_session=db_session):
-                return token
+            if principal is not None:
+                return principal
         
         raise http_exception
     except (TypeError, Exception) as e:
@@ -5,13 +5,14 @@ from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Request, Depends, HTTPException, status, APIRouter
-from fastapi.responses import JSONResponse
 from jwt.exceptions import PyJWTError
 
 from security import REFRESH_MAX_AGE, SECURE_HTTPS
 from security.auth.jwt import create_token, decode_token
 from security.auth.store_token_service import StoreAuthToken, AuthTokenDetails
 from shared.decorators import validate_params
+from shared.responses import FastJSONResponse
+from shared.compression import no_compression
 from database.models import Auth
 from database.connection import get_db
 
@@ -77,13 +78,13 @@ class RefreshTokenService:
 
         return refresh_token
     
-    async def set_refresh_token(self) -> JSONResponse:
+    async def set_refresh_token(self) -> FastJSONResponse:
         """ Set refresh token as HttpOnly cookie and store the refresh token
         into the database
 
         Returns:
         --------
-            - (JSONResponse): A JSONResponse that has set the refresh token in the cookie
+            - (FastJSONResponse): A FastJSONResponse that has set the refresh token in the cookie
         """
         refresh_token = await self._create_and_store_refresh_token()
 
@@ -94,7 +95,7 @@ class RefreshTokenService:
             )
 
         # Set the cookie in the response
-        response = JSONResponse(status_code=self.status_code, content=self.content)
+        response = FastJSONResponse(status_code=self.status_code, content=self.content)
         response.set_cookie(
             key="refresh_token",
             value=refresh_token,
@@ -211,16 +212,17 @@ class RefreshTokenVerifier:
         
 
 @router.post("/valid")
+@no_compression # <- Carries tokens
 async def is_refresh_token_valid_endpoint(
     request: Request, db_session: AsyncSession = Depends(get_db)
-) -> JSONResponse:
+) -> FastJSONResponse:
     """ Endpoint which returns a access token if the user has a valid refresh token """
     try:
         verifier = RefreshTokenVerifier(request=request, db_session=db_session)
         auth_obj: Auth = await verifier.is_valid()
 
         access_token = create_token(data={"sub": str(auth_obj.user_id), "session_id": str(auth_obj.jti_id)})
-        return JSONResponse(status_code=status.HTTP_200_OK, content={"access_token": access_token, "token_type": "bearer"})
+        return FastJSONResponse(status_code=status.HTTP_200_OK, content={"access_token": access_token, "token_type": "bearer"})
     except PyJWTError:
         logger.exception("JWT verification failed for refresh token", exc_info=True)
         raise HTTPException(
@@ -0,0 +1,247 @@
+import os
+import mmap
+import stat
+import time
+import struct
+import logging
+from uuid import UUID
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from security import REVOCATION_TABLE_PATH, REVOCATION_TABLE_SLOTS
+
+try:
+    import fcntl
+except ImportError: # Windows: writes are not locked between processes
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# File layout:
+#   Header: magic (4s) | slots (I) | generation (Q)  -> padded to 32 bytes
+#   Slots:  jti_id (16s) | expires_at (q)            -> 24 bytes per slot (zeros = empty)
+MAGIC: bytes = b"MTRV"
+HEADER = struct.Struct("<4sIQ")
+HEADER_SIZE: int = 32
+GENERATION_OFFSET: int = 8
+SLOT = struct.Struct("<16sq")
+EMPTY_KEY: bytes = bytes(16)
+
+
+def _check_private(path: str, file_stat: os.stat_result) -> None:
+    """ Helper-Function: Checks that the file is a regular file of the user of the app
+    that no other user can read or write (a foreign file could forge or erase revocations)
+
+    Raises:
+    -------
+    ValueError
+        If the file is no regular file, has a foreign owner or is accessible to the group or others
+    """
+    if not stat.S_ISREG(file_stat.st_mode):
+        raise ValueError(f"{path} is not a regular file.")
+
+    if hasattr(os, "getuid") and file_stat.st_uid != os.getuid():
+        raise ValueError(f"{path} is owned by another user.")
+
+    if file_stat.st_mode & 0o077:
+        raise ValueError(f"{path} is accessible to other users (mode {oct(stat.S_IMODE(file_stat.st_mode))}).")
+
+
+class SharedRevocationTable:
+    """ Fixed-size hash table (open addressing) of revoked session ids in a memory-mapped file.
+    Every worker process on the host maps the same file, so a revocation made in one worker
+    is visible to all the others immediately, without a database lookup.
+
+    Lookups are lock-free, writes are serialized with a file lock. The database stays the
+    source of truth: a session that is not in the table still has to be checked there. """
+
+    def __init__(self, path: str, slots: int) -> None:
+        # Validate params
+        if not isinstance(path, str):
+            raise ValueError("path must be a string.")
+
+        if not isinstance(slots, int) or slots < 1:
+            raise ValueError("slots must be a positive integer.")
+
+        self.path: str = path
+        self.slots: int = slots
+        self._file = None
+        self._mmap: mmap.mmap | None = None
+        self._disabled: bool = not path
+
+    def _open(self) -> bool:
+        """ Helper-Method: Maps the file into memory (it is created on the first use)
+
+        Returns:
+        --------
+            - A boolean whether the table can be used
+        """
+        if self._mmap is not None:
+            return True
+
+        if self._disabled:
+            return False
+
+        try:
+            # Never follow a symlink and only use a file that no other user can write to
+            os.makedirs(os.path.dirname(self.path) or ".", mode=0o700, exist_ok=True)
+            flags: int = os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0)
+            self._file = os.fdopen(os.open(self.path, flags, 0o600), "r+b")
+            _check_private(self.path, os.fstat(self._file.fileno()))
+
+            with self._locked():
+                size: int = os.fstat(self._file.fileno()).st_size
+
+                # Initialize a new file, otherwise take the size of the existing one
+                if size < HEADER_SIZE:
+                    self._file.truncate(HEADER_SIZE + self.slots * SLOT.size)
+                    self._file.seek(0)
+                    self._file.write(HEADER.pack(MAGIC, self.slots, 0))
+                    self._file.flush()
+                else:
+                    self._file.seek(0)
+                    magic, slots, _ = HEADER.unpack(self._file.read(HEADER.size))
+
+                    if magic != MAGIC:
+                        raise ValueError(f"{self.path} is not a revocation table.")
+                    self.slots = slots
+
+            self._mmap = mmap.mmap(self._file.fileno(), HEADER_SIZE + self.slots * SLOT.size)
+            return True
+        except (OSError, ValueError) as e:
+            logger.exception(f"Revocation table could not be opened: {str(e)}", exc_info=True)
+            self._disabled = True
+            self.close()
+
+        return False
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """ Helper-Method: Holds the exclusive file lock (shared by all processes) """
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def _first_slot(self, key: bytes) -> int:
+        """ Helper-Method: Returns the first slot to probe (session ids are random UUIDs) """
+        return int.from_bytes(key[:8], "little") % self.slots
+
+    def _offset(self, slot: int) -> int:
+        """ Helper-Method: Returns the byte offset of the slot """
+        return HEADER_SIZE + slot * SLOT.size
+
+    def contains(self, jti_id: UUID) -> bool:
+        """ Checks whether the session id is in the table
+
+        Returns:
+        --------
+            - A boolean
+        """
+        if not self._open():
+            return False
+
+        key: bytes = jti_id.bytes
+        slot: int = self._first_slot(key)
+
+        for _ in range(self.slots):
+            offset: int = self._offset(slot)
+            stored: bytes = self._mmap[offset:offset + 16]
+
+            if stored == key:
+                return True
+
+            if stored == EMPTY_KEY:
+                return False
+
+            slot = (slot + 1) % self.slots
+
+        return False
+
+    def add(self, jti_id: UUID, expires_at: int) -> bool:
+        """ Adds the revoked session id to the table. Slots of sessions that
+        are already expired are reused.
+
+        Returns:
+        --------
+            - A boolean whether the session id is in the table now
+        """
+        if not self._open():
+            return False
+
+        key: bytes = jti_id.bytes
+        now: int = int(time.time())
+
+        with self._locked():
+            slot: int = self._first_slot(key)
+            free_slot: int | None = None
+
+            for _ in range(self.slots):
+                stored, stored_expires_at = SLOT.unpack_from(self._mmap, self._offset(slot))
+
+                if stored == key:
+                    return True
+
+                if stored == EMPTY_KEY or stored_expires_at <= now:
+                    free_slot = slot if free_slot is None else free_slot
+
+                    if stored == EMPTY_KEY:
+                        break
+
+                slot = (slot + 1) % self.slots
+
+            if free_slot is None:
+                logger.warning("Revocation table is full: The session is only revoked in the database.", extra={
+                    "jti_id": jti_id
+                })
+                return False
+
+            # Write the expiration before the key, so a reader never sees a key with a stale expiration
+            offset: int = self._offset(free_slot)
+            struct.pack_into("<q", self._mmap, offset + 16, expires_at)
+            self._mmap[offset:offset + 16] = key
+
+            generation: int = struct.unpack_from("<Q", self._mmap, GENERATION_OFFSET)[0]
+            struct.pack_into("<Q", self._mmap, GENERATION_OFFSET, generation + 1)
+
+        return True
+
+    @property
+    def generation(self) -> int:
+        """ Counter that is incremented by every revocation (in any process) """
+        if not self._open():
+            return 0
+
+        return struct.unpack_from("<Q", self._mmap, GENERATION_OFFSET)[0]
+
+    def metrics(self) -> Dict[str, int | bool]:
+        """ Returns the state of the table
+
+        Returns:
+        --------
+            - A dictionary containing whether the table is enabled, the slots and the generation
+        """
+        enabled: bool = self._open()
+
+        return {
+            "enabled": enabled,
+            "slots": self.slots,
+            "generation": self.generation if enabled else 0
+        }
+
+    def close(self) -> None:
+        """ Unmaps and closes the file """
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+revocation_table = SharedRevocationTable(path=REVOCATION_TABLE_PATH, slots=REVOCATION_TABLE_SLOTS)
@@ -0,0 +1,77 @@
+import time
+from uuid import UUID
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+from security import SESSION_CACHE_TTL, SESSION_CACHE_MAX_ENTRIES
+
+class SessionCache:
+    """ In-process cache of the session validity, keyed by the session id.
+    Saves the database lookup for every authenticated request, as long as the
+    entry is younger than the TTL. Revocations must call invalidate(). """
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        # Validate params
+        if not isinstance(ttl, (int, float)) or ttl < 0:
+            raise ValueError("ttl must be a non-negative number.")
+
+        if not isinstance(max_entries, int) or max_entries < 1:
+            raise ValueError("max_entries must be a positive integer.")
+
+        self.ttl: float = ttl
+        self.max_entries: int = max_entries
+        self._entries: OrderedDict[UUID, Tuple[bool, float]] = OrderedDict()
+
+        # Counters
+        self._hits: int = 0
+        self._misses: int = 0
+        self._invalidations: int = 0
+
+    def get(self, session_id: UUID) -> bool | None:
+        """ Returns the cached validity or None (if the session is not cached or the entry is expired) """
+        entry = self._entries.get(session_id)
+
+        if entry is None or entry[1] <= time.monotonic():
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        self._entries.move_to_end(session_id)
+        return entry[0]
+
+    def set(self, session_id: UUID, valid: bool) -> None:
+        """ Stores the validity of the session (the least recently used entry is dropped, if full) """
+        if self.ttl == 0:
+            return
+
+        self._entries[session_id] = (valid, time.monotonic() + self.ttl)
+        self._entries.move_to_end(session_id)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, session_id: UUID) -> None:
+        """ Removes the session from the cache (e.g. after it was revoked) """
+        if self._entries.pop(session_id, None) is not None:
+            self._invalidations += 1
+
+    def clear(self) -> None:
+        """ Removes every entry """
+        self._entries.clear()
+
+    def metrics(self) -> Dict[str, int]:
+        """ Returns the counters
+
+        Returns:
+        --------
+            - A dictionary containing the size, the hits, the misses and the invalidations
+        """
+        return {
+            "size": len(self._entries),
+            "hits": self._hits,
+            "misses": self._misses,
+            "invalidations": self._invalidations
+        }
+
+
+session_cache = SessionCache(ttl=SESSION_CACHE_TTL, max_entries=SESSION_CACHE_MAX_ENTRIES)
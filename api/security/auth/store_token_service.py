@@ -8,7 +8,10 @@ from fastapi import Request
 from user_agents import parse
 from pydantic import BaseModel
 from database.models import Auth
+from database.group_commit import run_write
+from database.user_versions import bump_user_version, SESSIONS_VERSION
 from shared.decorators import validate_params
+from shared.flight_recorder import phase
 
 logger = logging.getLogger(__name__)
 
@@ -85,11 +88,18 @@ class StoreAuthToken:
         try:
             # Store the token
             stmt = self._extract_informations(ip_address=ip_address)
-            result = await self.db_session.execute(stmt)
-            await self.db_session.commit()
+
+            async def _execute(db_session: AsyncSession) -> uuid.UUID | None:
+                result = await db_session.execute(stmt)
+                jti_id = result.scalar_one_or_none()
+
+                if jti_id is not None:
+                    await bump_user_version(db_session, self.data.user_id, SESSIONS_VERSION)
+                return jti_id
 
             # Check whether the insertion was successful
-            jti_id = result.scalar_one_or_none()
+            with phase("store_token"):
+                jti_id = await run_write(db_session=self.db_session, work=_execute)
 
             if jti_id:
                 return True
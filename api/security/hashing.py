@@ -1,5 +1,12 @@
 import re
+import time
+import asyncio
 import bcrypt
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from security import HASHING_WORKERS
 
 def hash_pwd(password: str) -> str:
     """ Hashes the password 
@@ -13,6 +20,18 @@ def hash_pwd(password: str) -> str:
 
     return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
 
+def verify_pwd(password: str, hashed_password: str) -> bool:
+    """ Checks the password against the hashed password
+
+    Returns:
+    --------
+        - A boolean
+    """
+    if not isinstance(password, str) or not isinstance(hashed_password, str):
+        raise ValueError("Password and hashed password must be strings.")
+
+    return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+
 def is_hashed(password: str) -> bool:
     """ Checks if the password is in a valid hashed format 
     
@@ -23,4 +42,107 @@ def is_hashed(password: str) -> bool:
     if isinstance(password, str):
         return re.match(r'^\$2[aby]\$\d{2}\$[./A-Za-z0-9]{53}$', password) is not None
     
-    return False
\ No newline at end of file
+    return False
+
+
+class HashingService:
+    """ Runs the bcrypt operations in a bounded thread pool,
+    so that a hash does not block the event loop for the other requests """
+
+    def __init__(self, max_workers: int) -> None:
+        # Validate param
+        if not isinstance(max_workers, int) or max_workers < 1:
+            raise ValueError("max_workers must be a positive integer.")
+
+        self.max_workers: int = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._queued: int = 0
+        self._running: int = 0
+        self._completed: int = 0
+        self._total_wait: float = 0.0
+        self._max_wait: float = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """ Returns the thread pool (it is created on the first use) """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="hashing")
+        return self._executor
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """ Helper-Method: Runs the function in the thread pool and
+        records how long the job had to wait for a free worker """
+        submitted_at: float = time.perf_counter()
+        dequeued: bool = False # <- Set by the job when it starts or by the caller if it never starts
+
+        def job() -> Any:
+            nonlocal dequeued
+            wait: float = time.perf_counter() - submitted_at
+
+            with self._lock:
+                if not dequeued: # <- The caller may have been cancelled after the job was picked up
+                    dequeued = True
+                    self._queued -= 1
+
+                self._running += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+
+        with self._lock:
+            self._queued += 1
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_executor(), job)
+        finally:
+            # A cancelled caller (e.g. a disconnected client) also cancels the job if it has not been picked up
+            with self._lock:
+                if not dequeued:
+                    dequeued = True
+                    self._queued -= 1
+
+    async def hash(self, password: str) -> str:
+        """ Hashes the password without blocking the event loop (see hash_pwd) """
+        return await self._run(hash_pwd, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """ Verifies the password without blocking the event loop (see verify_pwd) """
+        return await self._run(verify_pwd, password, hashed_password)
+
+    def metrics(self) -> Dict[str, int | float]:
+        """ Returns the current metrics of the thread pool
+
+        Returns:
+        --------
+            - A dictionary containing the workers, the queue depth, the running and
+            completed jobs and the average and maximum wait time in milliseconds
+        """
+        with self._lock:
+            started: int = self._running + self._completed
+
+            return {
+                "workers": self.max_workers,
+                "queue_depth": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "avg_wait_ms": (self._total_wait / started * 1000) if started else 0.0,
+                "max_wait_ms": self._max_wait * 1000
+            }
+
+    def shutdown(self) -> None:
+        """ Shuts the thread pool down (a new one is created on the next use) """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+hashing_service = HashingService(max_workers=HASHING_WORKERS)
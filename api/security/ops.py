@@ -0,0 +1,20 @@
+import hmac
+from fastapi import Header, HTTPException, status
+
+import security
+
+
+def require_ops_token(authorization: str | None = Header(None)) -> None:
+    """ Dependency: Only lets requests with the ops token (Authorization: Bearer <OPS_TOKEN>) through.
+    Without a configured token the ops endpoints do not exist (404). """
+    if not security.OPS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    scheme, _, token = (authorization or "").partition(" ")
+    valid: bool = hmac.compare_digest(token.encode("utf-8"), security.OPS_TOKEN.encode("utf-8"))
+
+    if scheme.lower() != "bearer" or not valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Authorization failed: Invalid ops token.",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
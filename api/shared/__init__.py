@@ -0,0 +1,20 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Response compression (see shared/compression.py)
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))  # Bytes, smaller bodies are sent as they are
+COMPRESSION_THREAD_MIN_SIZE = int(os.getenv("COMPRESSION_THREAD_MIN_SIZE", 64 * 1024))  # Bytes, compressed off the event loop
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4))
+
+# Flight recorder of the slowest requests (see shared/flight_recorder.py)
+FLIGHT_RECORDER_SIZE = int(os.getenv("FLIGHT_RECORDER_SIZE", 50))  # Kept requests, 0 disables the recorder
+FLIGHT_RECORDER_WINDOW = float(os.getenv("FLIGHT_RECORDER_WINDOW", 15 * 60))  # Seconds, older requests are dropped
+
+# Event loop lag monitor (see shared/loop_monitor.py)
+LOOP_MONITOR_INTERVAL = float(os.getenv("LOOP_MONITOR_INTERVAL", 0.5))  # Seconds between two lag samples, 0 disables it
+LOOP_MONITOR_DEBUG = os.getenv("LOOP_MONITOR_DEBUG", "false").lower() == "true"  # Logs the stack of blocking calls
+LOOP_BLOCK_THRESHOLD = float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", 100)) / 1000  # Seconds the loop may be held
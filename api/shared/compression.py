@@ -0,0 +1,230 @@
+import zlib
+import asyncio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Any, Callable, Dict, List, Tuple
+
+from shared import (
+    COMPRESSION_ENABLED, COMPRESSION_MIN_SIZE, COMPRESSION_THREAD_MIN_SIZE,
+    COMPRESSION_GZIP_LEVEL, COMPRESSION_BROTLI_QUALITY
+)
+
+try:
+    import brotli
+except ImportError: # In requirements.txt, without it only gzip is offered
+    brotli = None
+
+# Media types that are worth compressing (JSON, NDJSON, text, any +json type)
+COMPRESSIBLE_TYPES: Tuple[str, ...] = ("application/json", "application/x-ndjson", "text/")
+COMPRESSIBLE_SUFFIX: str = "+json"
+
+# Statuses without a body
+NO_BODY_STATUSES: Tuple[int, ...] = (204, 304)
+
+
+def no_compression(endpoint: Callable) -> Callable:
+    """ Marks an endpoint whose responses are never compressed (e.g. responses with tokens,
+    see BREACH). Has to be placed below the route decorator. """
+    endpoint.__no_compression__ = True
+    return endpoint
+
+
+def supported_encodings() -> List[str]:
+    """ Returns the supported content codings in the order of preference """
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """ Picks the content coding for the Accept-Encoding header of the request
+
+    Returns:
+    --------
+        - The supported coding with the highest q-value (br before gzip on a tie),
+        or None if the client accepts none of them
+    """
+    qualities: Dict[str, float] = {}
+
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+
+        if not coding:
+            continue
+
+        quality: float = 1.0
+        param_name, _, value = params.strip().partition("=")
+
+        if param_name.strip().lower() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+
+        qualities[coding] = quality
+
+    best: str | None = None
+    best_quality: float = 0.0
+
+    for coding in supported_encodings():
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+
+        if quality > best_quality:
+            best, best_quality = coding, quality
+
+    return best
+
+
+class _Compressor:
+    """ Incremental compressor for one response body """
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int) -> None:
+        self.encoding: str = encoding
+
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, zlib.MAX_WBITS | 16) # <- gzip container
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        """ Compresses a chunk, with flush=True the client can decode everything sent so far """
+        if self.encoding == "br":
+            chunk: bytes = self._compressor.process(data)
+            return chunk + self._compressor.flush() if flush else chunk
+
+        chunk = self._compressor.compress(data)
+        return chunk + self._compressor.flush(zlib.Z_SYNC_FLUSH) if flush else chunk
+
+    def finish(self) -> bytes:
+        """ Returns the end of the compressed stream """
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+class CompressionMiddleware:
+    """ Compresses JSON and text responses with brotli or gzip (see negotiate_encoding).
+
+    Bodies below minimum_size, responses that are already encoded and endpoints marked with
+    no_compression are sent as they are. Chunks of at least thread_min_size bytes are compressed
+    in a worker thread, so that a large payload does not block the event loop. Streamed responses
+    are compressed chunk by chunk. The ETag of a compressed response becomes weak, because the
+    bytes differ from the uncompressed representation. """
+
+    def __init__(
+        self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE,
+        thread_min_size: int = COMPRESSION_THREAD_MIN_SIZE, gzip_level: int = COMPRESSION_GZIP_LEVEL,
+        brotli_quality: int = COMPRESSION_BROTLI_QUALITY, enabled: bool = COMPRESSION_ENABLED
+    ) -> None:
+        # Validate params
+        if not isinstance(minimum_size, int) or minimum_size < 0:
+            raise ValueError("minimum_size must be a non-negative integer.")
+
+        if not isinstance(thread_min_size, int) or thread_min_size < 0:
+            raise ValueError("thread_min_size must be a non-negative integer.")
+
+        self.app: ASGIApp = app
+        self.minimum_size: int = minimum_size
+        self.thread_min_size: int = thread_min_size
+        self.gzip_level: int = gzip_level
+        self.brotli_quality: int = brotli_quality
+        self.enabled: bool = enabled
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding: str | None = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        responder = _CompressionResponder(self, scope, send, encoding)
+        await self.app(scope, receive, responder.send)
+        await responder.close()
+
+
+class _CompressionResponder:
+    """ Wraps the send of one request: holds back the response start until the first body
+    chunk shows whether (and how) the response is compressed """
+
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, send: Send, encoding: str | None) -> None:
+        self.middleware: CompressionMiddleware = middleware
+        self.scope: Scope = scope
+        self.encoding: str | None = encoding
+        self._send: Send = send
+
+        self._start: Message | None = None
+        self._compressor: _Compressor | None = None
+        self._passthrough: bool = False
+
+    def _is_compressible(self, headers: MutableHeaders) -> bool:
+        """ Helper-Method: Checks whether the response may vary with the Accept-Encoding """
+        endpoint: Any = self.scope.get("endpoint")
+        media_type: str = headers.get("content-type", "").split(";")[0].strip()
+
+        return (
+            self._start["status"] not in NO_BODY_STATUSES
+            and "content-encoding" not in headers
+            and (media_type.startswith(COMPRESSIBLE_TYPES) or media_type.endswith(COMPRESSIBLE_SUFFIX))
+            and not getattr(endpoint, "__no_compression__", False)
+        )
+
+    async def _compress(self, data: bytes, flush: bool, finish: bool) -> bytes:
+        """ Helper-Method: Compresses the chunk, in a worker thread if it is large """
+        def work() -> bytes:
+            chunk: bytes = self._compressor.compress(data, flush=flush and not finish)
+            return chunk + self._compressor.finish() if finish else chunk
+
+        if len(data) >= self.middleware.thread_min_size:
+            return await asyncio.to_thread(work)
+        return work()
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+
+        if message["type"] != "http.response.body" or self._start is None:
+            await self._send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        # Later chunks of a passed through or a streamed response
+        if self._passthrough or self._compressor is not None:
+            if self._compressor is not None and (body or not more_body):
+                body = await self._compress(body, flush=True, finish=not more_body)
+            await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+            return
+
+        headers = MutableHeaders(raw=self._start["headers"])
+        compressible: bool = self._is_compressible(headers)
+
+        if compressible:
+            headers.add_vary_header("Accept-Encoding")
+
+        if not compressible or self.encoding is None or (not more_body and len(body) < self.middleware.minimum_size):
+            self._passthrough = True
+            await self._send(self._start)
+            await self._send(message)
+            return
+
+        self._compressor = _Compressor(self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+        body = await self._compress(body, flush=True, finish=not more_body)
+
+        headers["Content-Encoding"] = self.encoding
+
+        if more_body:
+            del headers["Content-Length"] # <- Streamed: chunked transfer encoding
+        else:
+            headers["Content-Length"] = str(len(body))
+
+        etag: str | None = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+        await self._send(self._start)
+        await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+    async def close(self) -> None:
+        """ Sends a response start that was never followed by a body """
+        if self._start is not None and not self._passthrough and self._compressor is None:
+            await self._send(self._start)
@@ -0,0 +1,30 @@
+import hashlib
+from fastapi import Response, status
+from typing import Any
+
+
+def make_etag(*parts: Any) -> str:
+    """ Creates a strong ETag from the parts that identify the version of a payload """
+    digest: str = hashlib.sha256("|".join(map(str, parts)).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """ Checks whether the If-None-Match header contains the ETag (or *) """
+    if not if_none_match:
+        return False
+
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def with_etag(response: Response, etag: str) -> Response:
+    """ Adds the ETag to the response, the client has to revalidate it on every use """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def not_modified(etag: str) -> Response:
+    """ Returns the empty 304 response for a matching ETag """
+    return with_etag(Response(status_code=status.HTTP_304_NOT_MODIFIED), etag)
@@ -0,0 +1,157 @@
+import time
+import heapq
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from itertools import count
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Any, Dict, Iterator, List, Tuple
+
+from database.query_stats import QueryStats, current_query_stats
+from shared import FLIGHT_RECORDER_SIZE, FLIGHT_RECORDER_WINDOW
+from shared.metrics import route_template
+
+
+@dataclass(slots=True)
+class RequestTrace:
+    """ The timing breakdown of one request by phase (see phase) """
+    method: str
+    path: str
+    started_at: float # Unix time
+    phases: Dict[str, float] = field(default_factory=dict) # Seconds per phase (summed if it ran more than once)
+    route: str = ""
+    status_code: int = 500
+    duration: float = 0.0 # Seconds
+    query_stats: QueryStats | None = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "method": self.method,
+            "route": self.route,
+            "path": self.path,
+            "status_code": self.status_code,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 3),
+            "phases_ms": {name: round(seconds * 1000, 3) for name, seconds in self.phases.items()},
+            "db": None if self.query_stats is None else {
+                "statements": self.query_stats.statements,
+                "time_ms": round(self.query_stats.db_time * 1000, 3),
+                "rows": self.query_stats.rows
+            }
+        }
+
+
+# The trace of the current request, None outside of a request (e.g. background tasks)
+current_trace: ContextVar[RequestTrace | None] = ContextVar("current_trace", default=None)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """ Adds the time of the block to the phase of the current request (no-op outside of a request).
+    Phases may be nested, every phase has its inclusive time (e.g. store_token contains the commit). """
+    trace: RequestTrace | None = current_trace.get()
+
+    if trace is None:
+        yield
+        return
+
+    start: float = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.phases[name] = trace.phases.get(name, 0.0) + time.perf_counter() - start
+
+
+class FlightRecorder:
+    """ Bounded buffer of the slowest requests of the last window seconds (a min-heap by duration:
+    a request is only kept if it is slower than the fastest kept one). Only mutated on the event loop,
+    so it needs no lock. """
+
+    def __init__(self, capacity: int = FLIGHT_RECORDER_SIZE, window: float = FLIGHT_RECORDER_WINDOW) -> None:
+        # Validate params
+        if not isinstance(capacity, int) or capacity < 0:
+            raise ValueError("capacity must be a non-negative integer.")
+
+        if not isinstance(window, (int, float)) or window <= 0:
+            raise ValueError("window must be a positive number.")
+
+        self.capacity: int = capacity
+        self.window: float = window
+        self._heap: List[Tuple[float, int, float, RequestTrace]] = [] # <- (duration, seq, finished_at, trace)
+        self._seq = count()
+        self._next_expiry: float = float("inf")
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def _expire(self, now: float) -> None:
+        """ Helper-Method: Drops the requests that are older than the window """
+        if now < self._next_expiry:
+            return
+
+        self._heap = [entry for entry in self._heap if entry[2] + self.window > now]
+        heapq.heapify(self._heap)
+        self._next_expiry = min((entry[2] + self.window for entry in self._heap), default=float("inf"))
+
+    def record(self, trace: RequestTrace) -> None:
+        """ Keeps the finished request, if it is one of the capacity slowest of the window """
+        now: float = time.monotonic()
+        self._expire(now)
+
+        if len(self._heap) >= self.capacity and (not self._heap or trace.duration <= self._heap[0][0]):
+            return
+
+        entry = (trace.duration, next(self._seq), now, trace)
+
+        if len(self._heap) < self.capacity:
+            heapq.heappush(self._heap, entry)
+        else:
+            heapq.heapreplace(self._heap, entry)
+
+        self._next_expiry = min(self._next_expiry, now + self.window)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """ Returns the kept requests, the slowest first """
+        self._expire(time.monotonic())
+        return [entry[3].to_dict() for entry in sorted(self._heap, key=lambda entry: entry[0], reverse=True)]
+
+    def clear(self) -> None:
+        """ Removes every kept request """
+        self._heap.clear()
+        self._next_expiry = float("inf")
+
+
+class FlightRecorderMiddleware:
+    """ Traces every request, so that the choke points can record their phases (see phase),
+    and hands the finished trace to the flight recorder """
+
+    def __init__(self, app: ASGIApp, recorder: FlightRecorder | None = None) -> None:
+        self.app: ASGIApp = app
+        self.recorder: FlightRecorder = recorder if recorder is not None else flight_recorder
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.recorder.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        trace = RequestTrace(method=scope["method"], path=scope["path"], started_at=time.time())
+        token = current_trace.set(trace)
+        start: float = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                trace.status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            current_trace.reset(token)
+            trace.duration = time.perf_counter() - start
+            trace.route = route_template(scope)
+            trace.query_stats = current_query_stats.get() # <- Set by the MetricsMiddleware (outside)
+            self.recorder.record(trace)
+
+
+flight_recorder = FlightRecorder()
@@ -0,0 +1,133 @@
+import sys
+import time
+import asyncio
+import logging
+import threading
+import traceback
+from typing import Dict, Tuple
+
+from shared import LOOP_MONITOR_INTERVAL, LOOP_MONITOR_DEBUG, LOOP_BLOCK_THRESHOLD
+from shared.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the lag buckets in seconds (the +Inf bucket is implicit)
+LAG_BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class LoopMonitor:
+    """ Measures the scheduling lag of the event loop: a task sleeps for the interval and
+    records how much later than requested it was woken up (time in which the loop ran
+    other callbacks, e.g. a synchronous bcrypt, user agent parsing or logging I/O).
+
+    In debug mode a watchdog thread logs the stack of the loop thread whenever the loop is
+    held longer than block_threshold, i.e. the stack of the blocking call while it still runs. """
+
+    def __init__(
+        self, interval: float = LOOP_MONITOR_INTERVAL, debug: bool = LOOP_MONITOR_DEBUG,
+        block_threshold: float = LOOP_BLOCK_THRESHOLD
+    ) -> None:
+        # Validate params
+        if not isinstance(interval, (int, float)) or interval < 0:
+            raise ValueError("interval must be a non-negative number.")
+
+        if not isinstance(block_threshold, (int, float)) or block_threshold <= 0:
+            raise ValueError("block_threshold must be a positive number.")
+
+        self.interval: float = interval
+        self.debug: bool = debug
+        self.block_threshold: float = block_threshold
+        self.histogram: Histogram = Histogram(bounds=LAG_BUCKETS)
+
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._heartbeat: float = time.monotonic()
+        self._loop_thread_id: int | None = None
+
+        # Counters
+        self._max_lag: float = 0.0
+        self._blocked: int = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    @property
+    def sample_interval(self) -> float:
+        """ The watchdog needs a heartbeat at least twice per threshold """
+        return min(self.interval, self.block_threshold / 2) if self.debug else self.interval
+
+    def start(self) -> None:
+        """ Starts the sampling task on the running loop (and the watchdog thread in debug mode) """
+        if not self.enabled or (self._task is not None and not self._task.done()):
+            return
+
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+
+        if self.debug:
+            self._stop.clear()
+            self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        """ Stops the sampling task and the watchdog thread """
+        self._stop.set()
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self.block_threshold)
+
+        self._task = None
+        self._watchdog = None
+
+    async def _sample(self) -> None:
+        """ Helper-Method: Records the lag of every wake-up """
+        interval: float = self.sample_interval
+
+        while True:
+            start: float = time.monotonic()
+            await asyncio.sleep(interval)
+            now: float = time.monotonic()
+
+            lag: float = max(0.0, now - start - interval)
+            self.histogram.observe(lag)
+            self._max_lag = max(self._max_lag, lag)
+            self._heartbeat = now
+
+    def _watch(self) -> None:
+        """ Helper-Method (watchdog thread): Logs the stack of the loop thread once per blocking call """
+        interval: float = self.sample_interval
+        reported: float | None = None
+
+        while not self._stop.wait(self.block_threshold / 2):
+            heartbeat: float = self._heartbeat
+            held: float = time.monotonic() - heartbeat - interval
+
+            if held < self.block_threshold or heartbeat == reported:
+                continue
+
+            reported = heartbeat
+            self._blocked += 1
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack: str = "".join(traceback.format_stack(frame)) if frame is not None else "Unknown stack.\n"
+            logger.warning(f"Event loop blocked for more than {held * 1000:.0f} ms:\n{stack}")
+
+    def metrics(self) -> Dict[str, float | int]:
+        """ Returns the maximum lag in milliseconds and the blocking calls reported by the watchdog """
+        return {
+            "max_lag_ms": round(self._max_lag * 1000, 3),
+            "blocked_calls": self._blocked
+        }
+
+
+loop_monitor = LoopMonitor()
@@ -0,0 +1,237 @@
+import time
+from bisect import bisect_left
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Any, Callable, Dict, List, Tuple
+
+from database.query_stats import QueryStats, current_query_stats, start_query_stats
+
+# Upper bounds of the latency buckets in seconds (the +Inf bucket is implicit)
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Route label of requests that did not match a route (bounds the number of series)
+UNMATCHED_ROUTE: str = "unmatched"
+
+PROMETHEUS_CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """ Latency histogram with fixed buckets. Only mutated on the event loop,
+    so the counters need no lock. """
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.bounds: Tuple[float, ...] = bounds
+        self.counts: List[int] = [0] * (len(bounds) + 1) # <- Per bucket, not cumulative (last: +Inf)
+        self.sum: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """ Returns the (le, cumulative count) pairs of the exposition format """
+        total: int = 0
+        buckets: List[Tuple[str, int]] = []
+
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            buckets.append(("+Inf" if bound == float("inf") else repr(bound), total))
+
+        return buckets
+
+
+class MetricsRegistry:
+    """ Request metrics per (method, route template) and the metrics of other components
+    (collectors), rendered in the Prometheus text exposition format """
+
+    def __init__(self) -> None:
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.latencies: Dict[Tuple[str, str], Histogram] = {}
+        self.db: Dict[Tuple[str, str], List[float]] = {} # <- [statements, seconds, rows] per route
+        self.active: Dict[int, Scope] = {} # <- Requests in flight (routing adds the route to their scope)
+        self._collectors: Dict[str, Tuple[Callable[[], Dict[str, Any]], Tuple[str, ...]]] = {}
+        self._histograms: Dict[str, Tuple[str, Histogram]] = {}
+
+    def observe_request(
+        self, method: str, route: str, status_code: int, duration: float, query_stats: QueryStats | None = None
+    ) -> None:
+        """ Records a finished request (and the statements it sent to the database) """
+        key: Tuple[str, str, int] = (method, route, status_code)
+        self.requests[key] = self.requests.get(key, 0) + 1
+
+        histogram: Histogram | None = self.latencies.get((method, route))
+        if histogram is None:
+            histogram = self.latencies[(method, route)] = Histogram()
+
+        histogram.observe(duration)
+
+        if query_stats is not None and query_stats.statements:
+            totals: List[float] = self.db.setdefault((method, route), [0, 0.0, 0])
+            totals[0] += query_stats.statements
+            totals[1] += query_stats.db_time
+            totals[2] += query_stats.rows
+
+    def in_flight(self) -> Dict[Tuple[str, str], int]:
+        """ Returns the requests in flight per (method, route template), requests
+        that are not routed yet count as unmatched """
+        counts: Dict[Tuple[str, str], int] = {}
+
+        for scope in list(self.active.values()):
+            key: Tuple[str, str] = (scope["method"], route_template(scope))
+            counts[key] = counts.get(key, 0) + 1
+
+        return counts
+
+    def register_collector(
+        self, name: str, collect: Callable[[], Dict[str, Any]], counters: Tuple[str, ...] = ()
+    ) -> None:
+        """ Adds a component whose numeric metrics (e.g. hashing_service.metrics) are exported
+        as gauges named <name>_<key>, the keys in counters only ever increase and are exported
+        as counters named <name>_<key>_total """
+        self._collectors[name] = (collect, counters)
+
+    def register_histogram(self, name: str, help_text: str, histogram: Histogram) -> None:
+        """ Adds a histogram of another component (e.g. the event loop lag) without labels """
+        self._histograms[name] = (help_text, histogram)
+
+    def render(self) -> str:
+        """ Renders every metric in the Prometheus text exposition format (version 0.0.4)
+
+        Returns:
+        --------
+            - The exposition as a string
+        """
+        lines: List[str] = [
+            "# HELP http_requests_total Finished HTTP requests.",
+            "# TYPE http_requests_total counter"
+        ]
+        for (method, route, status_code), count in sorted(self.requests.items()):
+            lines.append(f'http_requests_total{{{_labels(method, route)},status="{status_code}"}} {count}')
+
+        lines += [
+            "# HELP http_request_duration_seconds Latency of the HTTP requests.",
+            "# TYPE http_request_duration_seconds histogram"
+        ]
+        for (method, route), histogram in sorted(self.latencies.items()):
+            labels: str = _labels(method, route)
+
+            for le, count in histogram.cumulative():
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{le}"}} {count}')
+
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {histogram.sum!r}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {histogram.count}")
+
+        for index, (name, help_text) in enumerate((
+            ("http_request_db_statements_total", "Statements sent to the database by the requests."),
+            ("http_request_db_seconds_total", "Time the requests spent in database statements."),
+            ("http_request_db_rows_total", "Rows returned or changed by the statements of the requests.")
+        )):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+
+            for (method, route), totals in sorted(self.db.items()):
+                lines.append(f"{name}{{{_labels(method, route)}}} {totals[index]!r}")
+
+        lines += [
+            "# HELP http_requests_in_flight HTTP requests that are being processed.",
+            "# TYPE http_requests_in_flight gauge"
+        ]
+        for (method, route), count in sorted(self.in_flight().items()):
+            lines.append(f"http_requests_in_flight{{{_labels(method, route)}}} {count}")
+
+        for name, (help_text, histogram) in self._histograms.items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            lines += [f'{name}_bucket{{le="{le}"}} {count}' for le, count in histogram.cumulative()]
+            lines += [f"{name}_sum {histogram.sum!r}", f"{name}_count {histogram.count}"]
+
+        for name, (collect, counters) in self._collectors.items():
+            for key, value in collect().items():
+                if not isinstance(value, (bool, int, float)):
+                    continue
+
+                if key in counters:
+                    lines.append(f"# TYPE {name}_{key}_total counter")
+                    lines.append(f"{name}_{key}_total {float(value)!r}")
+                else:
+                    lines.append(f"# TYPE {name}_{key} gauge")
+                    lines.append(f"{name}_{key} {float(value)!r}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    """ Helper-Function: Escapes a label value of the exposition format """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(method: str, route: str) -> str:
+    return f'method="{_escape(method)}",route="{_escape(route)}"'
+
+
+def route_template(scope: Scope) -> str:
+    """ Helper-Function: Returns the full path template of the matched route (after the request)
+
+    FastAPI keeps included routers nested, so scope["route"] only has the path relative to
+    its router, the effective route context has the path with every prefix. The context is
+    not a public API: tests/shared/test_metrics.py pins the full template of nested routers. """
+    context: Any = scope.get("fastapi", {}).get("effective_route_context")
+    path: str | None = getattr(context, "path", None) or getattr(scope.get("route"), "path", None)
+    return path or UNMATCHED_ROUTE
+
+
+def server_timing(query_stats: QueryStats, elapsed: float) -> str:
+    """ Helper-Function: Returns the Server-Timing header with the DB time (and the statements and
+    rows as description) and the time of the whole request until the response starts """
+    return (
+        f'db;dur={query_stats.db_time * 1000:.2f};desc="{query_stats.statements} statements, '
+        f'{query_stats.rows} rows", app;dur={elapsed * 1000:.2f}'
+    )
+
+
+class MetricsMiddleware:
+    """ Records the count, the status code and the latency of every request per route template
+    (e.g. /api/todo/get_all, never the raw path) and the requests in flight per route template.
+
+    The statements of the request are counted in a context variable (see database/query_stats.py),
+    reported in the Server-Timing header and added to the metrics of the route. """
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry | None = None) -> None:
+        self.app: ASGIApp = app
+        self.registry: MetricsRegistry = registry if registry is not None else metrics_registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code: int = 500 # <- If the app fails before it sends a response
+        start: float = time.perf_counter()
+        token = start_query_stats()
+        query_stats: QueryStats = current_query_stats.get()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                timing: Tuple[bytes, bytes] = (
+                    b"server-timing", server_timing(query_stats, time.perf_counter() - start).encode("latin-1")
+                )
+                message = {**message, "headers": [*message.get("headers", []), timing]}
+            await send(message)
+
+        registry: MetricsRegistry = self.registry
+        registry.active[id(scope)] = scope
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            registry.active.pop(id(scope), None)
+            current_query_stats.reset(token)
+            registry.observe_request(
+                scope["method"], route_template(scope), status_code, time.perf_counter() - start, query_stats
+            )
+
+
+metrics_registry = MetricsRegistry()
@@ -0,0 +1,16 @@
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+from typing import Any
+
+from shared.flight_recorder import phase
+
+
+class FastJSONResponse(JSONResponse):
+    """ JSONResponse that is encoded by pydantic-core directly to bytes.
+
+    Besides the types of the stdlib encoder, the content can contain pydantic models,
+    UUIDs and datetimes, which are serialized without building intermediate dicts. """
+
+    def render(self, content: Any) -> bytes:
+        with phase("json_encode"):
+            return to_json(content)
@@ -5,7 +5,8 @@ from sqlalchemy import inspect, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import AsyncGenerator, Any
 
-from database.connection import engine, init_models, get_db
+from database.config import DB_POOL_SIZE, DB_POOL_RECYCLE, SQLITE_BUSY_TIMEOUT
+from database.connection import engine, init_models, get_db, create_db_engine, _sqlite_pragmas
 
 class TestInitModels:
     """ Test class for database model initialization """
@@ -25,11 +26,46 @@ class TestInitModels:
                 assert "auth" in tables
                 assert "users" in tables
                 assert "todos" in tables
-                assert len(tables) == 3
+                assert "todo_deletions" in tables
+                assert "user_versions" in tables
+                assert len(tables) == 5
 
             await conn.run_sync(check_tables)
 
 
+class TestCreateDbEngine:
+    """ Test class for the dialect-aware engine factory """
+
+    @pytest.mark.asyncio
+    async def test_sqlite_pragmas_are_applied(self, tmp_path: Any) -> None:
+        """ Tests that every new SQLite connection gets the configured pragmas """
+        sqlite_engine = create_db_engine(f"sqlite+aiosqlite:///{tmp_path / 'pragmas.db'}")
+
+        try:
+            async with sqlite_engine.connect() as conn:
+                assert (await conn.exec_driver_sql("PRAGMA journal_mode")).scalar() == "wal"
+                assert (await conn.exec_driver_sql("PRAGMA synchronous")).scalar() == 1 # <- NORMAL
+                assert (await conn.exec_driver_sql("PRAGMA foreign_keys")).scalar() == 1
+                assert (await conn.exec_driver_sql("PRAGMA busy_timeout")).scalar() == SQLITE_BUSY_TIMEOUT
+        finally:
+            await sqlite_engine.dispose()
+
+    def test_pool_settings(self, tmp_path: Any) -> None:
+        """ Tests that a file database uses a sized pool and an in-memory database none """
+        file_engine = create_db_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}")
+        memory_engine = create_db_engine("sqlite+aiosqlite:///:memory:")
+
+        assert file_engine.pool.size() == DB_POOL_SIZE
+        assert file_engine.pool._recycle == DB_POOL_RECYCLE
+        assert not hasattr(memory_engine.pool, "size")
+
+    @pytest.mark.parametrize("pragma", ["journal_mode", "synchronous"])
+    def test_sqlite_pragmas_failed_because_invalid_mode(self, pragma: str) -> None:
+        """ Tests the failed case when a mode is not a valid SQLite value """
+        with pytest.raises(ValueError):
+            _sqlite_pragmas(**{pragma: "WAL; DROP TABLE users"})
+
+
 class TestGetDb:
     """ Test class for the get_db dependency """
     
@@ -0,0 +1,132 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from pathlib import Path
+from sqlalchemy import insert, select, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from unittest.mock import AsyncMock
+
+from database.connection import Base, create_db_engine
+from database.group_commit import GroupCommitWriter, run_write, group_commit_writer
+from database.models import User
+
+
+class TestGroupCommitWriter:
+    """ Test class for different test scenarios for the GroupCommitWriter class """
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup(self, tmp_path: Path) -> None:
+        """ Set up a separate database, since the writer commits with its own sessions """
+        self.engine = create_db_engine(f"sqlite+aiosqlite:///{tmp_path / 'group_commit.db'}")
+        self.session_factory = sessionmaker(self.engine, expire_on_commit=False, class_=AsyncSession)
+
+        async with self.engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+        self.writer = GroupCommitWriter(session_factory=self.session_factory, max_batch_size=10, max_delay=0.05)
+
+        yield
+        await self.writer.close()
+        await self.engine.dispose()
+
+    def _insert_user(self, email: str):
+        """ Returns a write that inserts a user and returns its email """
+        async def work(db_session: AsyncSession) -> str:
+            result = await db_session.execute(
+                insert(User).values(name="User", email=email, password="-").returning(User.email)
+            )
+            return result.scalar_one()
+
+        return work
+
+    async def _count_users(self) -> int:
+        async with self.session_factory() as session:
+            return (await session.execute(select(func.count()).select_from(User))).scalar_one()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_writes_share_one_commit(self) -> None:
+        """ Tests that concurrent writes are committed in one batch and every caller gets its result """
+        emails: list = [f"user{i}@email.com" for i in range(5)]
+        results: list = await asyncio.gather(*(self.writer.submit(self._insert_user(email)) for email in emails))
+
+        assert results == emails
+        assert await self._count_users() == 5
+
+        metrics: dict = self.writer.metrics()
+        assert metrics["batches"] == 1
+        assert metrics["writes"] == 5
+        assert metrics["avg_batch_size"] == 5
+
+    @pytest.mark.asyncio
+    async def test_failed_write_only_fails_its_caller(self) -> None:
+        """ Tests that a failing write is rolled back alone and the rest of the batch is committed """
+        results: list = await asyncio.gather(
+            self.writer.submit(self._insert_user("same@email.com")),
+            self.writer.submit(self._insert_user("same@email.com")), # <- violates the unique email
+            self.writer.submit(self._insert_user("other@email.com")),
+            return_exceptions=True
+        )
+
+        assert results[0] == "same@email.com"
+        assert isinstance(results[1], IntegrityError)
+        assert results[2] == "other@email.com"
+
+        assert await self._count_users() == 2
+        assert self.writer.metrics()["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_size_is_limited(self) -> None:
+        """ Tests that a batch never exceeds max_batch_size """
+        writer = GroupCommitWriter(session_factory=self.session_factory, max_batch_size=2, max_delay=0.05)
+        await asyncio.gather(*(writer.submit(self._insert_user(f"user{i}@email.com")) for i in range(5)))
+        await writer.close()
+
+        metrics: dict = writer.metrics()
+        assert metrics["batches"] == 3
+        assert metrics["max_batch_size_seen"] == 2
+
+    @pytest.mark.asyncio
+    async def test_close_commits_submitted_writes(self) -> None:
+        """ Tests that writes submitted before close are still committed """
+        pending = asyncio.create_task(self.writer.submit(self._insert_user("user@email.com")))
+        await asyncio.sleep(0)
+
+        await self.writer.close()
+
+        assert await pending == "user@email.com"
+        assert await self._count_users() == 1
+
+    @pytest.mark.parametrize("max_batch_size, max_delay", [(0, 0.01), (1, -1)])
+    def test_init_failed_because_invalid_params(self, max_batch_size: int, max_delay: float) -> None:
+        """ Tests the failed case when a limit is invalid """
+        with pytest.raises(ValueError):
+            GroupCommitWriter(session_factory=self.session_factory, max_batch_size=max_batch_size, max_delay=max_delay)
+
+
+class TestRunWrite:
+    """ Test class for the run_write function """
+
+    @pytest.mark.asyncio
+    async def test_run_write_commits_directly_when_disabled(self) -> None:
+        """ Tests that the write runs on the request session and is committed there """
+        db_session = AsyncMock(spec=AsyncSession)
+        work = AsyncMock(return_value="result")
+
+        assert await run_write(db_session=db_session, work=work) == "result"
+        work.assert_awaited_once_with(db_session)
+        db_session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_run_write_uses_the_writer_when_enabled(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """ Tests that the write is submitted to the group commit writer """
+        db_session = AsyncMock(spec=AsyncSession)
+        work = AsyncMock()
+
+        monkeypatch.setattr(group_commit_writer, "enabled", True)
+        monkeypatch.setattr(group_commit_writer, "submit", AsyncMock(return_value="result"))
+
+        assert await run_write(db_session=db_session, work=work) == "result"
+        group_commit_writer.submit.assert_awaited_once_with(work)
+        db_session.commit.assert_not_awaited()
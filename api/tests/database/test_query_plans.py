@@ -0,0 +1,203 @@
+import re
+import time
+import uuid
+import pytest
+import pytest_asyncio
+from contextlib import asynccontextmanager
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, List, Tuple
+
+from database.models import User, Todo
+from database.connection import engine, init_models
+from database.user_versions import get_todos_version, get_sessions_state
+from routes.todo.t_home import TodoHome, TODO_SORTS
+from routes.todo.t_counts import TodoCounts
+from routes.todo.t_creation import TodoCreation
+from routes.todo.t_editor import TodoEditor
+from routes.todo.t_completor import TodoCompletor
+from routes.todo.t_deletion import TodoDeletion
+from routes.todo.t_validation_models import (
+    TodoCreationModel, TodoEditorModel, TodoCompletorModel, TodoDeletionModel, TodoBulkModel
+)
+from routes.todo.t_sync import TodoSync, compact_todo_deletions
+from routes.todo.t_bulk import TodoBulk
+from routes.settings.s_service import SettingsService
+from security.auth.refresh_token_service import RefreshTokenVerifier
+from security.auth.jwt import _verify_bearer_token, create_token
+from conftest import fake_principal
+
+# "SCAN <table>" is a full table scan, "SEARCH <table> USING ..." uses an index
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+@asynccontextmanager
+async def capture_statements() -> AsyncIterator[List[Tuple[str, tuple]]]:
+    """ Records every statement (with its parameters) that is sent to the database """
+    statements: List[Tuple[str, tuple]] = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+
+
+async def assert_no_full_scan(db_session: AsyncSession, statements: List[Tuple[str, tuple]]) -> None:
+    """ Runs EXPLAIN QUERY PLAN for every captured statement and fails on a full table scan """
+    assert statements, "No statement was captured."
+    connection = await db_session.connection()
+
+    for statement, parameters in statements:
+        # Transaction control statements (e.g. SAVEPOINT) have no query plan
+        if not statement.lstrip().upper().startswith(("SELECT", "INSERT", "UPDATE", "DELETE")):
+            continue
+
+        result = await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        plan: List[str] = [row[-1] for row in result.all()]
+
+        assert not any(FULL_SCAN.match(step) for step in plan), f"Full table scan:\n{statement}\n{plan}"
+
+
+class TestQueryPlans:
+    """ Test class to make sure that the hot queries are served by an index """
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup(
+        self, fake_refresh_token_with_session_id: Tuple[str, str, Request, User, AsyncSession]
+    ) -> None:
+        """ Set up common test data """
+        # Make sure the indexes also exist in an already created database
+        await init_models()
+
+        (
+            self.refresh_token,
+            self.session_id,
+            self.mock_request,
+            self.user,
+            self.db_session
+        ) = fake_refresh_token_with_session_id
+
+        self.todo: Todo = Todo(title="Valid title", description="Valid description", user_id=self.user.id)
+        self.db_session.add_all([self.todo, Todo(title="Second title", description="", user_id=self.user.id)])
+        await self.db_session.commit()
+
+    @pytest.mark.asyncio
+    async def test_todo_home(self) -> None:
+        """ Tests the query of the todo list (t_home.py) """
+        service = TodoHome(db_session=self.db_session, user_id=self.user.id)
+        _, _, next_cursor, _ = await service.get_username_with_todos(limit=1)
+
+        async with capture_statements() as statements:
+            await service.get_username_with_todos()
+            await service.get_username_with_todos(limit=1, cursor=next_cursor) # <- Deeper page
+            await get_todos_version(db_session=self.db_session, user_id=self.user.id) # <- ETag
+
+        await assert_no_full_scan(self.db_session, statements)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("sort", list(TODO_SORTS))
+    async def test_todo_list_options(self, sort: str) -> None:
+        """ Tests the filter and sort options of the todo list and the counts (t_home.py, t_counts.py) """
+        service = TodoHome(db_session=self.db_session, user_id=self.user.id)
+        _, _, next_cursor, _ = await service.get_username_with_todos(limit=1, sort=sort)
+
+        async with capture_statements() as statements:
+            await service.get_username_with_todos(sort=sort)
+            await service.get_username_with_todos(limit=1, cursor=next_cursor, sort=sort)
+            await service.get_username_with_todos(completed=False, title_prefix="Val", sort=sort)
+            await TodoCounts(db_session=self.db_session, user_id=self.user.id).get()
+
+        await assert_no_full_scan(self.db_session, statements)
+
+    @pytest.mark.asyncio
+    async def test_todo_statements(self) -> None:
+        """ Tests the existence checks and the statements run by run_todo_db_statement (t_utils.py) """
+        async with capture_statements() as statements:
+            assert (await TodoCreation(
+                data=TodoCreationModel(title="Another title", description=""),
+                user_id=self.user.id, db_session=self.db_session
+            ).create())[0]
+
+            assert (await TodoEditor(
+                data=TodoEditorModel(todo_id=self.todo.id, title="New title", description=""),
+                user_id=self.user.id, db_session=self.db_session
+            ).update())[0]
+
+            assert (await TodoCompletor(
+                data=TodoCompletorModel(todo_id=self.todo.id),
+                user_id=self.user.id, db_session=self.db_session
+            ).mark_as_completed())[0]
+
+            assert (await TodoDeletion(
+                data=TodoDeletionModel(todo_id=self.todo.id),
+                user_id=self.user.id, db_session=self.db_session
+            ).delete())[0]
+
+        await assert_no_full_scan(self.db_session, statements)
+
+    @pytest.mark.asyncio
+    async def test_todo_bulk(self) -> None:
+        """ Tests the set-based statements of the bulk endpoint (t_bulk.py) """
+        second: Todo = Todo(title="Third title", description="", user_id=self.user.id)
+        self.db_session.add(second)
+        await self.db_session.commit()
+        todo_ids = [str(self.todo.id), str(second.id)]
+
+        async with capture_statements() as statements:
+            results, _ = await TodoBulk(
+                data=TodoBulkModel(operations=[
+                    {"op": "create", "title": "Another title", "description": ""},
+                    {"op": "update", "todo_id": todo_ids[0], "title": "New title", "description": ""},
+                    {"op": "complete", "todo_id": todo_ids[1]},
+                    {"op": "delete", "todo_id": str(uuid.uuid4())}
+                ]),
+                user_id=self.user.id, db_session=self.db_session
+            ).run()
+
+        assert [result["success"] for result in results] == [True, True, True, False]
+        await assert_no_full_scan(self.db_session, statements)
+
+    @pytest.mark.asyncio
+    async def test_todo_sync(self) -> None:
+        """ Tests the queries of the sync endpoint and of the compaction (t_sync.py) """
+        async with capture_statements() as statements:
+            await TodoSync(db_session=self.db_session, user_id=self.user.id).get_changes(since=int(time.time()))
+            await compact_todo_deletions(db_session=self.db_session)
+
+        await assert_no_full_scan(self.db_session, statements)
+
+    @pytest.mark.asyncio
+    async def test_refresh_token_service(self) -> None:
+        """ Tests the lookup of the refresh token (refresh_token_service.py) """
+        verifier = RefreshTokenVerifier(request=self.mock_request, db_session=self.db_session)
+
+        async with capture_statements() as statements:
+            assert await verifier._check_token_in_db(user_id=self.user.id, jti_id=uuid.UUID(self.session_id))
+
+        await assert_no_full_scan(self.db_session, statements)
+
+    @pytest.mark.asyncio
+    async def test_settings_service(self) -> None:
+        """ Tests the queries of the settings page (s_service.py) """
+        principal = fake_principal(self.user.id, uuid.UUID(self.session_id))
+
+        async with capture_statements() as statements:
+            assert await SettingsService(principal=principal, db_session=self.db_session).get()
+            await get_sessions_state(db_session=self.db_session, user_id=self.user.id) # <- ETag
+
+        await assert_no_full_scan(self.db_session, statements)
+
+    @pytest.mark.asyncio
+    async def test_verify_bearer_token(self) -> None:
+        """ Tests the session lookup of every authenticated request (jwt.py) """
+        token: str = create_token(data={"sub": str(self.user.id), "session_id": str(uuid.uuid4())})
+
+        async with capture_statements() as statements:
+            assert not await _verify_bearer_token(token=token, db_session=self.db_session)
+
+        await assert_no_full_scan(self.db_session, statements)
@@ -0,0 +1,79 @@
+import logging
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from typing import Tuple
+
+from database.models import User, Todo
+from database.connection import _instrument_statements
+from database.query_stats import QueryStats, current_query_stats, start_query_stats, redact_parameters
+
+
+class TestRedactParameters:
+    """ Test class for the redaction of the logged parameters """
+
+    def test_redact_parameters(self) -> None:
+        assert redact_parameters(("secret@email.com", 42)) == ("<str>", "<int>")
+        assert redact_parameters({"title": "Private title"}) == {"title": "<str>"}
+        assert redact_parameters([("a",), ("b",), ("c",), ("d",), ("e",)]) == [
+            ("<str>",), ("<str>",), ("<str>",), "... 2 more"
+        ]
+
+
+class TestQueryStats:
+    """ Test class for the attribution of the statements to the current context """
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup(self, fake_user: Tuple[User, AsyncSession]) -> None:
+        """ Set up common test data """
+        self.user, self.db_session = fake_user
+
+    @pytest.mark.asyncio
+    async def test_statements_are_counted(self) -> None:
+        """ Tests the statement count and the rows of the current context """
+        user_id = self.user.id
+        await self.db_session.execute(select(User.id)) # <- Opens the savepoint of the test session
+        token = start_query_stats()
+
+        try:
+            await self.db_session.execute(insert(Todo), [
+                {"title": f"Title {i}", "description": "", "user_id": user_id} for i in range(3)
+            ])
+            result = await self.db_session.execute(select(Todo.id).where(Todo.user_id == user_id))
+            assert len(result.all()) == 3
+
+            stats: QueryStats = current_query_stats.get()
+        finally:
+            current_query_stats.reset(token)
+
+        assert stats.statements == 2
+        assert stats.rows == 6 # <- 3 inserted, 3 returned
+        assert stats.db_time > 0
+
+    @pytest.mark.asyncio
+    async def test_statements_outside_of_a_request(self) -> None:
+        """ Tests that statements without stats in the context are not counted anywhere """
+        await self.db_session.execute(select(User.id))
+        assert current_query_stats.get() is None
+
+
+class TestSlowQueryLog:
+    """ Test class for the slow query log """
+
+    @pytest.mark.asyncio
+    async def test_slow_query_is_logged_redacted(self, caplog: pytest.LogCaptureFixture) -> None:
+        """ Tests that a statement above the threshold is logged without its values """
+        engine = create_async_engine("sqlite+aiosqlite://")
+        _instrument_statements(engine.sync_engine, slow_query_threshold=1e-9)
+
+        try:
+            with caplog.at_level(logging.WARNING, logger="database.connection"):
+                async with engine.connect() as connection:
+                    await connection.execute(text("SELECT :email"), {"email": "secret@email.com"})
+        finally:
+            await engine.dispose()
+
+        assert "Slow query (" in caplog.text
+        assert "ms): SELECT ? | Parameters: ('<str>',)" in caplog.text
+        assert "secret@email.com" not in caplog.text
@@ -0,0 +1,36 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Tuple
+
+from database.models import User
+from database.user_versions import (
+    bump_user_version, get_todos_version, get_sessions_state, TODOS_VERSION, SESSIONS_VERSION
+)
+
+
+class TestUserVersions:
+    """ Test class for different scenarios for the version counters of a user """
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup(self, fake_user: Tuple[User, AsyncSession]) -> None:
+        """ Set up common test data """
+        self.user, self.db_session = fake_user
+
+    @pytest.mark.asyncio
+    async def test_bump_user_version_success(self) -> None:
+        """ Tests that the first bump creates the row and every further bump increments it """
+        assert await get_todos_version(db_session=self.db_session, user_id=self.user.id) == 0
+
+        await bump_user_version(self.db_session, self.user.id, TODOS_VERSION)
+        await bump_user_version(self.db_session, self.user.id, TODOS_VERSION)
+        await bump_user_version(self.db_session, self.user.id, SESSIONS_VERSION)
+
+        assert await get_todos_version(db_session=self.db_session, user_id=self.user.id) == 2
+        assert await get_sessions_state(db_session=self.db_session, user_id=self.user.id) == (1, None)
+
+    @pytest.mark.asyncio
+    async def test_bump_user_version_failed_because_unknown_column(self) -> None:
+        """ Tests the failed case when the column is not a version counter """
+        with pytest.raises(ValueError):
+            await bump_user_version(self.db_session, self.user.id, "name")
@@ -3,7 +3,7 @@ import pytest
 import pytest_asyncio
 from dotenv import load_dotenv
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Tuple
+from typing import Callable, Tuple
 from httpx import AsyncClient, ASGITransport
 
 from database.models import User
@@ -33,9 +33,9 @@ class TestVerifyPasswordMethod:
         """ Tests the success case of the verify method 
         even though the 'password_in_db' is decoded or not """
         if decoded:
-            success = self.service._verify_password(password_in_db=fake_hashed_password)
+            success = await self.service._verify_password(password_in_db=fake_hashed_password)
         else:
-            success = self.service._verify_password(password_in_db=fake_hashed_password.encode("utf-8"))
+            success = await self.service._verify_password(password_in_db=fake_hashed_password.encode("utf-8"))
 
         assert success
 
@@ -46,7 +46,7 @@ class TestVerifyPasswordMethod:
         service = self.service
         service.data.password = "WrongPassword123"
 
-        success = self.service._verify_password(password_in_db=fake_hashed_password)
+        success = await self.service._verify_password(password_in_db=fake_hashed_password)
         assert not success
 
     @pytest.mark.asyncio
@@ -54,20 +54,20 @@ class TestVerifyPasswordMethod:
         """ Tests the failed case if the 'password_in_db' param 
         is not decodeable although it has the type 'bytes' """
         with pytest.raises(ValueError):
-            self.service._verify_password(password_in_db=b"\x80\x81\x82") # b"\x80\x81\x82" is not decodeable with utf-8
+            await self.service._verify_password(password_in_db=b"\x80\x81\x82") # b"\x80\x81\x82" is not decodeable with utf-8
 
     @pytest.mark.asyncio
     async def test_verify_password_failed_because_param_has_invalid_type(self) -> None:
         """ Tests the failed case if the param 'password_in_db' is not of the 
         type string or bytes """
         with pytest.raises(ValueError):
-            self.service._verify_password(password_in_db=int(0))
+            await self.service._verify_password(password_in_db=int(0))
 
     @pytest.mark.asyncio
     async def test_verify_password_failed_because_param_is_not_hashed(self) -> None:
         """ Tests the failed case if the param 'password_in_db' is not hashed """
         with pytest.raises(ValueError):
-            self.service._verify_password(password_in_db="This password is not hashed.")
+            await self.service._verify_password(password_in_db="This password is not hashed.")
 
 
 class TestGetUserMethod:
@@ -182,10 +182,11 @@ class TestLoginAPIEndpoint:
         api.dependency_overrides.clear()
 
     @pytest.mark.asyncio
-    async def test_login_endpoint_success(self) -> None:
+    async def test_login_endpoint_success(self, query_budget: Callable) -> None:
         """ Tests the success case """
         async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
-            response = await ac.post(self.path_url, json=self.payload)
+            with query_budget(3): # <- User, refresh token insert, sessions version
+                response = await ac.post(self.path_url, json=self.payload)
             assert response.status_code == 200
 
             # Checks whether the refresh cookie is correct set
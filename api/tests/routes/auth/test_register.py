@@ -6,7 +6,7 @@ from httpx import AsyncClient, ASGITransport
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from unittest.mock import patch, AsyncMock, Mock
-from typing import Tuple
+from typing import Callable, Tuple
 
 from database.models import User
 from database.connection import get_db
@@ -76,7 +76,7 @@ class TestInsertUserIntoDbMethod:
     async def test_insert_user_into_db_failed_because_value_error(self) -> None:
         """ Tests the failed case when a ValueError occurrs 
         because of the hashing process """
-        with patch("routes.auth.register.hash_pwd", side_effect=ValueError("Password must be a string.")):
+        with patch("routes.auth.register.hashing_service.hash", new=AsyncMock(side_effect=ValueError("Password must be a string."))):
             user_obj = await self.service._insert_user_into_db()
             assert user_obj is None
 
@@ -182,13 +182,14 @@ class TestRegisterAPIEndpoint:
         api.dependency_overrides.clear()
         
     @pytest.mark.asyncio
-    async def test_register_endpoint_success(self) -> None:
+    async def test_register_endpoint_success(self, query_budget: Callable) -> None:
         """ Tests the success case """
         async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
             payload = self.payload
             payload["email"] = "not.registered@email.com"
 
-            response = await ac.post(self.path_url, json=payload)
+            with query_budget(5): # <- Existence check, user insert, then the login
+                response = await ac.post(self.path_url, json=payload)
             assert response.status_code == 201
 
             assert "set-cookie" in response.headers
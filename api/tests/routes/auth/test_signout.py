@@ -10,10 +10,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Request
 from httpx import AsyncClient, ASGITransport
 from unittest.mock import AsyncMock, Mock, patch
-from typing import Tuple
+from typing import Callable, Tuple
 
 from security.auth.jwt import decode_token
 from security.auth.refresh_token_service import RefreshTokenService
+from security.auth.session_cache import session_cache
+from security.auth.revocation_table import revocation_table
 from database.connection import get_db
 from database.models import User, Auth
 from main import api
@@ -54,15 +56,22 @@ class TestSignoutAPIEnpoint:
         api.dependency_overrides.clear()
 
     @pytest.mark.asyncio
-    async def test_signout_endpoint_success(self) -> None:
+    async def test_signout_endpoint_success(self, query_budget: Callable) -> None:
         """ Tests the success case """
+        payload: dict = decode_token(token=self.refresh_token)
+        jti_id: UUID = UUID(payload.get("jti"))
+        session_cache.set(jti_id, True)
+
         async with AsyncClient(transport=self.transport, base_url=self.base_url, cookies=self.cookies) as ac:
-            response = await ac.post(self.path_url)
+            with query_budget(3):
+                response = await ac.post(self.path_url)
             assert response.status_code == 200
 
+        # Check whether the cached session was invalidated and the other workers see the revocation
+        assert session_cache.get(jti_id) is None
+        assert revocation_table.contains(jti_id)
+
         # Check whether the token is revoked in the database
-        payload: dict = decode_token(token=self.refresh_token)
-        jti_id: UUID = UUID(payload.get("jti"))
 
         stmt = select(Auth).where(Auth.user_id == self.user.id, Auth.jti_id == jti_id)
         result = await self.db_session.execute(stmt)
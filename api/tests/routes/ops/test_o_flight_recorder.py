@@ -0,0 +1,59 @@
+import os
+import pytest
+import pytest_asyncio
+from dotenv import load_dotenv
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Tuple
+
+import security
+from database.models import User
+from database.connection import get_db
+from conftest import fake_email, fake_password
+from shared.flight_recorder import flight_recorder
+from main import api
+
+load_dotenv()
+
+
+class TestFlightRecorderAPIEndpoint:
+    """ Test class for different scenarios for the api endpoint """
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup(self, monkeypatch: pytest.MonkeyPatch, fake_user: Tuple[User, AsyncSession]) -> None:
+        """ Set up common test data """
+        monkeypatch.setattr(security, "OPS_TOKEN", "ops-token")
+        self.user, self.db_session = fake_user
+
+        api.dependency_overrides[get_db] = lambda: self.db_session
+        flight_recorder.clear()
+
+        self.transport = ASGITransport(app=api)
+        self.base_url: str = os.getenv("VITE_API_URL")
+        self.path_url: str = "/ops/flight_recorder"
+        self.headers: dict = {"Authorization": "Bearer ops-token"}
+
+    def teardown_method(self) -> None:
+        api.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    async def test_flight_recorder_endpoint_success(self) -> None:
+        """ Tests that the dump contains a login with the phases of its choke points """
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            response = await ac.post("/login", json={"email": fake_email, "password": fake_password})
+            assert response.status_code == 200
+
+            response = await ac.get(self.path_url, headers=self.headers)
+            assert response.status_code == 200
+
+        [login] = [entry for entry in response.json()["requests"] if entry["route"] == "/api/login"]
+        assert login["status_code"] == 200
+        assert {"user_lookup", "password_verify", "store_token", "commit", "json_encode"} <= set(login["phases_ms"])
+        assert login["db"]["statements"] >= 3 # <- And the savepoints of the test session
+
+    @pytest.mark.asyncio
+    async def test_flight_recorder_endpoint_failed_because_invalid_token(self) -> None:
+        """ Tests the failed case when the ops token is missing or wrong """
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            assert (await ac.get(self.path_url)).status_code == 401
+            assert (await ac.get(self.path_url, headers={"Authorization": "Bearer wrong"})).status_code == 401
@@ -0,0 +1,52 @@
+import os
+import pytest
+from dotenv import load_dotenv
+from httpx import AsyncClient, ASGITransport
+
+import security
+from main import api
+
+load_dotenv()
+
+
+class TestMetricsAPIEndpoint:
+    """ Test class for different scenarios for the api endpoint """
+
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """ Set up common test data """
+        monkeypatch.setattr(security, "OPS_TOKEN", "ops-token")
+
+        self.transport = ASGITransport(app=api)
+        self.base_url: str = os.getenv("VITE_API_URL")
+        self.path_url: str = "/ops/metrics"
+        self.headers: dict = {"Authorization": "Bearer ops-token"}
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint_success(self) -> None:
+        """ Tests that the exposition contains the previous requests and the components """
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            await ac.get(self.path_url, headers=self.headers)
+            response = await ac.get(self.path_url, headers=self.headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'http_requests_total{method="GET",route="/api/ops/metrics",status="200"}' in response.text
+        assert "hashing_workers" in response.text
+        assert "# TYPE group_commit_batches_total counter" in response.text
+        assert 'http_requests_in_flight{method="GET",route="/api/ops/metrics"} 1' in response.text
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint_failed_because_invalid_token(self) -> None:
+        """ Tests the failed case when the ops token is missing or wrong """
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            assert (await ac.get(self.path_url)).status_code == 401
+            assert (await ac.get(self.path_url, headers={"Authorization": "Bearer wrong"})).status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint_disabled_without_token(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """ Tests that the endpoint does not exist without a configured ops token """
+        monkeypatch.setattr(security, "OPS_TOKEN", "")
+
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            assert (await ac.get(self.path_url, headers=self.headers)).status_code == 404
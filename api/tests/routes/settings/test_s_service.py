@@ -3,20 +3,25 @@ import uuid
 import pytest
 import pytest_asyncio
 from fastapi import Request
-from unittest.mock import Mock, AsyncMock, patch
+from unittest.mock import AsyncMock
+from sqlalchemy import update
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from httpx import AsyncClient, ASGITransport
-from typing import Tuple
+from typing import Callable, Tuple
 
-from security.auth.jwt import create_token, get_bearer_token
-from database.models import User
+from security.auth.jwt import AuthPrincipal, get_current_principal
+from database.models import User, Auth
 from database.connection import get_db
 from routes.settings.s_service import SettingsService
+from routes.settings.s_session_handler import SettingSessionsHandler
+from security.auth.store_token_service import StoreAuthToken, AuthTokenDetails
+from tests.database.test_query_plans import capture_statements
+from conftest import fake_principal
 from main import api
 
-class TestGetSessionsMethod:
-    """ Test class for different test scenarios for _get_sessions method """
+class TestGetUserWithSessionsMethod:
+    """ Test class for different test scenarios for _get_user_with_sessions method """
 
     @pytest_asyncio.fixture(autouse=True)
     async def setup(
@@ -33,75 +38,42 @@ class TestGetSessionsMethod:
 
     @pytest.mark.asyncio
     @pytest.mark.parametrize("current", [(True), (False)])
-    async def test_get_sessions_success(self, current: bool) -> None:
-        """ Tests the success case """
+    async def test_get_user_with_sessions_success(self, current: bool) -> None:
+        """ Tests the success case with one query """
         # Overwrite so that it is not considered the current session
         if not current:
-            self.session_id: str = str(uuid.uuid4())
+            self.session_id = str(uuid.uuid4())
 
-        payload: dict = {
-            "sub": str(self.user.id),
-            "session_id": self.session_id
-        }
+        principal: AuthPrincipal = fake_principal(self.user.id, uuid.UUID(self.session_id))
+        service = SettingsService(principal=principal, db_session=self.db_session)
 
-        service = SettingsService(payload=payload, db_session=self.db_session)
-        sessions = await service._get_sessions()
+        async with capture_statements() as statements:
+            username, email, sessions = await service._get_user_with_sessions()
 
+        assert len([statement for statement, _ in statements if statement.startswith("SELECT")]) == 1
+        assert (username, email) == (self.user.name, self.user.email)
         assert sessions != []
         assert sessions[0]["current"] if current else not sessions[0]["current"]
 
-    
-    @pytest.mark.asyncio
-    async def test_get_sessions_failed_because_no_db_entry(self) -> None:
-        """ Tests the failed case when there is no entry in the database """
-        payload: dict = {
-            "sub": str(uuid.uuid4()),
-            "session_id": str(uuid.uuid4())
-        }
-
-        service = SettingsService(payload=payload, db_session=self.db_session)
-        sessions = await service._get_sessions()
-
-        assert sessions == []
-
-
-class TestGetUsernameAndEmailMethod:
-    """ Test class for different test scenarios for _get_username_and_email method """
-
-    @pytest_asyncio.fixture(autouse=True)
-    async def setup(self, fake_user: Tuple[User, AsyncSession]) -> None:
-        """ Set up common test data """
-        self.user, self.db_session = fake_user
-
-
     @pytest.mark.asyncio
-    async def test_get_username_and_email_success(self) -> None:
-        """ Tests the success case """
-        payload: dict = {
-            "sub": str(self.user.id),
-            "session_id": str(uuid.uuid4()) 
-        }
+    async def test_get_user_with_sessions_without_active_session(self) -> None:
+        """ Tests that a user without active sessions is still found """
+        await self.db_session.execute(update(Auth).where(Auth.user_id == self.user.id).values(revoked=True))
 
-        service = SettingsService(payload=payload, db_session=self.db_session)
-        username, email = await service._get_username_and_email()
-
-        assert username is not None
-        assert email is not None
+        principal: AuthPrincipal = fake_principal(self.user.id, uuid.UUID(self.session_id))
+        username, email, sessions = await SettingsService(
+            principal=principal, db_session=self.db_session
+        )._get_user_with_sessions()
 
+        assert (username, email, sessions) == (self.user.name, self.user.email, [])
 
     @pytest.mark.asyncio
-    async def test_get_username_and_email_failed_because_no_db_entry(self) -> None:
+    async def test_get_user_with_sessions_failed_because_no_db_entry(self) -> None:
         """ Tests the failed case when there is no entry in the database """
-        payload: dict = {
-            "sub": str(uuid.uuid4()),
-            "session_id": str(uuid.uuid4())
-        }
+        principal: AuthPrincipal = fake_principal(uuid.uuid4(), uuid.uuid4())
 
-        service = SettingsService(payload=payload, db_session=self.db_session)
-        username, email = await service._get_username_and_email()
-        
-        assert username is None
-        assert email is None
+        service = SettingsService(principal=principal, db_session=self.db_session)
+        assert await service._get_user_with_sessions() == (None, None, [])
 
 
 
@@ -125,12 +97,9 @@ class TestGetMethod:
     @pytest.mark.asyncio
     async def test_get_success(self) -> None:
         """ Tests the success case """
-        payload: dict = {
-            "sub": str(self.user.id),
-            "session_id": self.session_id
-        }
+        principal: AuthPrincipal = fake_principal(self.user.id, uuid.UUID(self.session_id))
 
-        service = SettingsService(payload=payload, db_session=self.db_session)
+        service = SettingsService(principal=principal, db_session=self.db_session)
         returned_payload: dict = await service.get()
 
         assert returned_payload.get("username") == self.user.name
@@ -141,12 +110,9 @@ class TestGetMethod:
     @pytest.mark.asyncio
     async def test_get_failed_because_no_user_or_email(self) -> None:
         """ Tests the error case when user or email is None """
-        payload: dict = {
-            "sub": str(uuid.uuid4()),
-            "session_id": str(uuid.uuid4())
-        }
+        principal: AuthPrincipal = fake_principal(uuid.uuid4(), uuid.uuid4())
 
-        service = SettingsService(payload=payload, db_session=self.db_session)
+        service = SettingsService(principal=principal, db_session=self.db_session)
         
         with pytest.raises(ValueError) as exc_info:
             await service.get()
@@ -157,10 +123,7 @@ class TestGetMethod:
     @pytest.mark.asyncio
     async def test_get_failed_because_db_error(self) -> None:
         """ Tests the error case when a database error occurrs """
-        payload: dict = {
-            "sub": str(self.user.id),
-            "session_id": str(uuid.uuid4())
-        }
+        principal: AuthPrincipal = fake_principal(self.user.id, uuid.uuid4())
 
         # Mock db session
         broken_session = AsyncMock(wraps=self.db_session)
@@ -168,7 +131,7 @@ class TestGetMethod:
         broken_session.execute.side_effect = SQLAlchemyError("Broken database session")
 
         # Start the test
-        service = SettingsService(payload=payload, db_session=broken_session)
+        service = SettingsService(principal=principal, db_session=broken_session)
         returned_payload: dict = await service.get()
         
         assert returned_payload == {}
@@ -195,17 +158,11 @@ class TestSettingsServiceEndpoint:
         self.base_url: str = os.getenv("VITE_API_URL")
         self.path_url: str = "/settings/service"
 
-        # Create a fake token
-        token: str = create_token(
-            data={
-                "sub": str(self.user.id), 
-                "jti": str(uuid.uuid4()), 
-                "session_id": self.session_id
-            }
-        )
+        # Create a fake principal
+        principal: AuthPrincipal = fake_principal(self.user.id, uuid.UUID(self.session_id))
 
         # Pverwrite dependencies
-        api.dependency_overrides[get_bearer_token] = lambda: token
+        api.dependency_overrides[get_current_principal] = lambda: principal
         api.dependency_overrides[get_db] = lambda: self.db_session
 
 
@@ -214,10 +171,11 @@ class TestSettingsServiceEndpoint:
 
 
     @pytest.mark.asyncio
-    async def test_settings_service_endpoint_success(self) -> None:
+    async def test_settings_service_endpoint_success(self, query_budget: Callable) -> None:
         """ Tests the success case """
         async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
-            response = await ac.post(self.path_url)
+            with query_budget(1):
+                response = await ac.post(self.path_url)
 
             assert response.status_code == 200
             assert response.json()["informations"]["username"] == self.user.name
@@ -243,29 +201,72 @@ class TestSettingsServiceEndpoint:
     @pytest.mark.asyncio
     async def test_settings_service_endpoint_failed_because_type_error(self) -> None:
         """ Tests the failed case when a TypeError occurrs """
-        with patch("routes.settings.s_service.decode_token", new=Mock(return_value=False)):
-            async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
-                response = await ac.post(self.path_url)
-                assert response.status_code == 500
-                assert response.json()["detail"] == "Server error: A server error has occurred. Please try again later."
+        api.dependency_overrides[get_current_principal] = lambda: {"sub": str(self.user.id)} # <- no principal
 
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            response = await ac.post(self.path_url)
+            assert response.status_code == 500
+            assert response.json()["detail"] == "Server error: A server error has occurred. Please try again later."
 
-    @pytest.mark.asyncio
-    @pytest.mark.parametrize("reason", [("sub"), ("jti")])
-    async def test_settings_service_endpoint_failed_because_value_error(self, reason: str) -> None:
-        """ Tests the failed case when a ValueError occurrs """
-        if reason == "sub":
-            token: str = create_token(data={"session_id": self.session_id})
-        elif reason == "jti":
-            token: str = create_token(data={"sub": str(self.user.id)})
 
-        api.dependency_overrides[get_bearer_token] = lambda: token
+    @pytest.mark.asyncio
+    async def test_settings_service_endpoint_failed_because_value_error(self) -> None:
+        """ Tests the failed case when a ValueError occurrs (the user does not exist anymore) """
+        api.dependency_overrides[get_current_principal] = lambda: fake_principal(uuid.uuid4())
 
         async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
             response = await ac.post(self.path_url)
             assert response.status_code == 400
+            assert response.json()["detail"] == "Authentication failed: User could not be identified."
+
+
+    @pytest.mark.asyncio
+    async def test_settings_service_cached_endpoint_not_modified(self, query_budget: Callable) -> None:
+        """ Tests that a matching ETag is answered with 304 and a session change invalidates it """
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            with query_budget(2):
+                response = await ac.get(self.path_url)
+            assert response.status_code == 200
+            assert response.json()["informations"]["username"] == self.user.name
+
+            etag: str = response.headers["ETag"]
+
+            with query_budget(1): # <- Only the version
+                response = await ac.get(self.path_url, headers={"If-None-Match": etag})
+            assert response.status_code == 304
+            assert response.content == b""
+
+            # Another session of the user is created and revoked
+            other: AuthPrincipal = fake_principal(self.user.id, uuid.uuid4())
+            await StoreAuthToken(
+                data=AuthTokenDetails(
+                    jti_id=other.session_id, user_id=self.user.id, is_refresh_token=True, expires_at=other.exp
+                ),
+                request=self.mock_request, db_session=self.db_session
+            ).store_token()
+
+            with query_budget(2):
+                response = await ac.get(self.path_url, headers={"If-None-Match": etag})
+            assert response.status_code == 200
+            etag = response.headers["ETag"]
+
+            assert (await SettingSessionsHandler(
+                jti_id=other.session_id, principal=fake_principal(self.user.id, uuid.UUID(self.session_id)),
+                db_session=self.db_session
+            ).revoke())[0]
+
+            with query_budget(2):
+                response = await ac.get(self.path_url, headers={"If-None-Match": etag})
+            assert response.status_code == 200
+            assert len(response.json()["informations"]["sessions"]) == 1
+
+
+class TestSettingsServiceInit:
+    """ Test class for the validation of the SettingsService params """
+
+    def test_init_failed_because_no_principal(self) -> None:
+        """ Tests the failed case when the decoded token is passed instead of a principal """
+        with pytest.raises(TypeError) as exc_info:
+            SettingsService(principal={"sub": str(uuid.uuid4())}, db_session=AsyncSession())
 
-            if reason == "sub":
-                assert response.json()["detail"] == "Authentication failed: User could not be identified."
-            else:
-                assert response.json()["detail"] == "Authentication failed: Server could not verify the user."
\ No newline at end of file
+        assert str(exc_info.value) == "principal must be an instance of AuthPrincipal."
@@ -6,13 +6,14 @@ from pytest import LogCaptureFixture
 from httpx import ASGITransport, AsyncClient
 from fastapi import Request, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Tuple
+from typing import Callable, Tuple
 
 from database.models import User, Auth
 from database.connection import get_db
-from security.auth.jwt import get_bearer_token
-from security.auth.jwt import create_token
+from security.auth.jwt import AuthPrincipal, get_current_principal
 from routes.settings.s_session_handler import SettingSessionsHandler
+from security.auth.session_cache import session_cache
+from conftest import fake_principal
 from main import api
 
 
@@ -32,36 +33,33 @@ class TestSettingSessionsHandlerClass:
             self.db_session
         ) = fake_refresh_token_with_session_id
 
-        # Create fake token
-        self.current_token: str = create_token(
-            data={
-                "sub": str(self.user.id),
-                "session_id": str(self.session_id)
-            }
-        )
+        # Create fake principal
+        self.principal: AuthPrincipal = fake_principal(self.user.id, uuid.UUID(self.session_id))
 
-    def test_decode_was_successful(self) -> None:
-        """ Tests the success case when the token could be decoded correctly 
-        and the token has the required values """
-        SettingSessionsHandler(
+    def test_init_was_successful(self) -> None:
+        """ Tests the success case when the principal is valid """
+        handler = SettingSessionsHandler(
             jti_id=uuid.UUID(self.session_id),
-            current_token=self.current_token,
+            principal=self.principal,
             db_session=self.db_session
         )
 
+        assert handler.user_id == self.user.id
+        assert handler.session_id == uuid.UUID(self.session_id)
+
 
     @pytest.mark.parametrize(
         "arg, log_msg",
         [
             ("db_session", "db_session must be an instance of AsyncSession."),
             ("jti_id", "jti_id must be an UUID."),
-            ("current_token", "current_token must be a string.")
+            ("principal", "principal must be an instance of AuthPrincipal.")
         ]
     )
     def test_trigger_type_error(self, arg: str, log_msg: str) -> None:
         """ Tests the failed case when a TypeError occurs """
         jti_id: uuid.UUID = uuid.UUID(self.session_id)
-        current_token: str = self.current_token
+        principal: AuthPrincipal = self.principal
         db_session: AsyncSession = self.db_session
 
         # Set the values
@@ -71,89 +69,20 @@ class TestSettingSessionsHandlerClass:
         if arg == "jti_id":
             jti_id = 0
 
-        if arg == "current_token":
-            current_token = 0
+        if arg == "principal":
+            principal = "Invalid token"
 
         # Expect a TypeError
         with pytest.raises(TypeError) as exc_info:
             SettingSessionsHandler(
                 jti_id=jti_id,
-                current_token=current_token,
+                principal=principal,
                 db_session=db_session
             )
 
         assert str(exc_info.value) == log_msg
 
 
-    def test_invalid_token(self) -> None:
-        """ Tests the failed case when the token is invalid """
-        with pytest.raises(ValueError) as exc_info:
-            SettingSessionsHandler(
-                jti_id=uuid.UUID(self.session_id),
-                current_token="Invalid token", # <- to trigger the error
-                db_session=self.db_session
-            )
-        
-        assert str(exc_info.value) == "Invalid token: Token has no payload."
-
-
-    def test_token_has_no_session_id(self) -> None:
-        """ Tests the failed case when the token has no session id """
-        current_token: str = create_token(
-            data={
-                "sub": str(self.user.id),
-                # "session_id": str(self.session_id) <- to trigger the error
-            }
-        )
-
-        with pytest.raises(ValueError) as exc_info:
-            SettingSessionsHandler(
-                jti_id=uuid.UUID(self.session_id),
-                current_token=current_token,
-                db_session=self.db_session
-            )
-        
-        assert str(exc_info.value) == "session_id must be not None."
-
-
-    def test_token_has_no_sub(self) -> None:
-        """ Tests the failed case when the token has no sub """
-        current_token: str = create_token(
-            data={
-                # "sub": str(self.user.id), <- to trigger the error
-                "session_id": str(self.session_id)
-            }
-        )
-
-        with pytest.raises(ValueError) as exc_info:
-            SettingSessionsHandler(
-                jti_id=uuid.UUID(self.session_id),
-                current_token=current_token,
-                db_session=self.db_session
-            )
-        
-        assert str(exc_info.value) == "sub must be not None."
-
-
-    def test_invalid_sub_type(self) -> None:
-        """ Tests the failed case when sub (in the token) is not a UUID """
-        current_token: str = create_token(
-            data={
-                "sub": str("Invalid type"), # <- to trigger the error
-                "session_id": str(self.session_id)
-            }
-        )
-
-        with pytest.raises(ValueError) as exc_info:
-            SettingSessionsHandler(
-                jti_id=uuid.UUID(self.session_id),
-                current_token=current_token,
-                db_session=self.db_session
-            )
-        
-        assert str(exc_info.value) == "badly formed hexadecimal UUID string"
-
-
 
 class TestRevokeMethod:
     """ Class for different test scenarios for the revoke method """
@@ -171,13 +100,8 @@ class TestRevokeMethod:
             self.db_session
         ) = fake_refresh_token_with_session_id
 
-        # Create fake token
-        self.current_token: str = create_token(
-            data={
-                "sub": str(self.user.id),
-                "session_id": str(self.session_id)
-            }
-        )
+        # Create fake principal
+        self.principal: AuthPrincipal = fake_principal(self.user.id, uuid.UUID(self.session_id))
 
     
     async def _get_revoke_entry(self, session_id: uuid.UUID) -> Auth:
@@ -194,31 +118,30 @@ class TestRevokeMethod:
     @pytest.mark.asyncio
     async def test_revoke_success(self) -> None:
         """ Tests the success case where the session could be successfully revoked """
-        current_token: str = create_token(
-            data={
-                "sub": str(self.user.id),
-                "session_id": str(uuid.uuid4()) # <- to avoid triggering the session match
-            }
-        )
+        principal: AuthPrincipal = fake_principal(self.user.id) # <- to avoid triggering the session match
 
         self.handler = SettingSessionsHandler(
             jti_id=uuid.UUID(self.session_id),
-            current_token=current_token,
+            principal=principal,
             db_session=self.db_session
         )
+        session_cache.set(uuid.UUID(self.session_id), True)
         assert await self.handler.revoke()
 
         # Check whether the update was actually successful
         result: Auth = await self._get_revoke_entry(session_id=self.session_id)
         assert result.revoked
 
+        # Check whether the cached session was invalidated
+        assert session_cache.get(uuid.UUID(self.session_id)) is None
+
 
     @pytest.mark.asyncio
     async def test_revoke_failed_because_session_match(self) -> None:
         """ Tests the failed case when the current session should be revoked """
         self.handler = SettingSessionsHandler(
             jti_id=uuid.UUID(self.session_id),
-            current_token=self.current_token,
+            principal=self.principal,
             db_session=self.db_session
         )
         
@@ -240,7 +163,7 @@ class TestRevokeMethod:
 
         self.handler = SettingSessionsHandler(
             jti_id=fake_jti_id,
-            current_token=self.current_token,
+            principal=self.principal,
             db_session=self.db_session
         )
         
@@ -279,17 +202,11 @@ class TestRevokeEndpoint:
         self.base_url: str = os.getenv("VITE_API_URL")
         self.path_url: str = "/settings/session/revoke"
 
-        # Create a fake token
-        token = create_token(
-            data={
-                "sub": str(self.user.id),
-                "jti": str(uuid.uuid4()),
-                "session_id": str(uuid.uuid4()) # to avoid trigger the session match exception
-            }
-        )
+        # Create a fake principal
+        principal: AuthPrincipal = fake_principal(self.user.id) # to avoid trigger the session match exception
 
         api.dependency_overrides[get_db] = lambda: self.db_session
-        api.dependency_overrides[get_bearer_token] = lambda: token
+        api.dependency_overrides[get_current_principal] = lambda: principal
 
 
     def teardown_method(self) -> None:
@@ -298,7 +215,7 @@ class TestRevokeEndpoint:
 
     @pytest.mark.asyncio
     async def test_settings_revoke_session_endpoint_success(
-        self, caplog: LogCaptureFixture
+        self, query_budget: Callable, caplog: LogCaptureFixture
     ) -> None:
         """ Tests the success case where the session could be successfully revoked """
         async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
@@ -306,14 +223,15 @@ class TestRevokeEndpoint:
                 "jti_id": self.session_id
             }
 
-            response = await ac.post(self.path_url, json=payload)
+            with query_budget(2):
+                response = await ac.post(self.path_url, json=payload)
             assert response.status_code == 200
 
             # Check the log message and the extra parameter
             assert "Device successfully logged out." in caplog.text
             assert caplog.records[0].user_id
             assert caplog.records[0].jti_id
-            assert caplog.records[0].token
+            assert caplog.records[0].session_id
 
     
     @pytest.mark.asyncio
@@ -322,14 +240,8 @@ class TestRevokeEndpoint:
     ) -> None:
         """ Tests the failed case where the session could not be successfully revoked
         because the current session could not be revoked """
-        token = create_token(
-            data={
-                "sub": str(self.user.id),
-                "jti": str(uuid.uuid4()),
-                "session_id": str(self.session_id) # to trigger the session match
-            }
-        )
-        api.dependency_overrides[get_bearer_token] = lambda: token
+        principal: AuthPrincipal = fake_principal(self.user.id, uuid.UUID(self.session_id)) # to trigger the session match
+        api.dependency_overrides[get_current_principal] = lambda: principal
 
         async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
             payload: dict = {
@@ -345,7 +257,7 @@ class TestRevokeEndpoint:
             assert "User tried to revoke the current session" in caplog.text
             assert caplog.records[0].user_id
             assert caplog.records[0].jti_id
-            assert caplog.records[0].token
+            assert caplog.records[0].session_id
 
 
     @pytest.mark.asyncio
@@ -353,14 +265,8 @@ class TestRevokeEndpoint:
         self, caplog: LogCaptureFixture
     ) -> None:
         """ Tests the failed case when the update, to revoke the session, fails """
-        token = create_token(
-            data={
-                "sub": str(uuid.uuid4()), # <- to trigger a update error
-                "jti": str(uuid.uuid4()),
-                "session_id": str(uuid.uuid4())
-            }
-        )
-        api.dependency_overrides[get_bearer_token] = lambda: token
+        principal: AuthPrincipal = fake_principal(uuid.uuid4()) # <- to trigger a update error
+        api.dependency_overrides[get_current_principal] = lambda: principal
 
         async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
             payload: dict = {
@@ -376,7 +282,7 @@ class TestRevokeEndpoint:
             # assert "User tried to revoke the current session" in caplog.text
             assert caplog.records[0].user_id
             assert caplog.records[0].jti_id
-            assert caplog.records[0].token
+            assert caplog.records[0].session_id
 
 
     @pytest.mark.asyncio
@@ -0,0 +1,196 @@
+import os
+import uuid
+import pytest
+import pytest_asyncio
+from dotenv import load_dotenv
+from unittest.mock import AsyncMock
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Callable, List, Tuple
+
+from database.models import User, Todo, DeletedTodo
+from database.connection import get_db
+from security.auth.jwt import get_current_principal
+from routes.todo.t_bulk import TodoBulk, DEFAULT_BULK_ERROR_MSG, DUPLICATE_TODO_MSG
+from routes.todo.t_validation_models import TodoBulkModel, MAX_BULK_OPERATIONS
+from tests.database.test_query_plans import capture_statements
+from conftest import fake_principal
+from main import api
+
+load_dotenv()
+
+
+class TestRunMethod:
+    """ Test class for different test scenarios for the run method """
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup(self, fake_todo: Tuple[Todo, User, AsyncSession]) -> None:
+        """ Set up common test data """
+        self.todo, self.user, self.db_session = fake_todo
+
+        self.other: Todo = Todo(title="Second title", description="", user_id=self.user.id)
+        self.db_session.add(self.other)
+        await self.db_session.commit()
+
+    def _service(self, operations: list) -> TodoBulk:
+        return TodoBulk(
+            data=TodoBulkModel(operations=operations), user_id=self.user.id, db_session=self.db_session
+        )
+
+    async def _get_todos(self) -> dict:
+        result = await self.db_session.execute(
+            select(Todo.id, Todo.title, Todo.completed).where(Todo.user_id == self.user.id)
+        )
+        return {todo_id: (title, completed) for todo_id, title, completed in result.all()}
+
+    @pytest.mark.asyncio
+    async def test_run_success(self) -> None:
+        """ Tests the success case with mixed operations and one statement per operation type """
+        service = self._service([
+            {"op": "create", "title": " New title ", "description": ""},
+            {"op": "create", "title": "Another title", "description": ""},
+            {"op": "update", "todo_id": str(self.todo.id), "title": "Changed title", "description": "Changed"},
+            {"op": "complete", "todo_id": str(self.todo.id)},
+            {"op": "delete", "todo_id": str(self.other.id)}
+        ])
+
+        async with capture_statements() as statements:
+            results, error_msg = await service.run()
+
+        assert error_msg is None
+        assert [result["success"] for result in results] == [True, True, True, False, True]
+        assert results[3]["message"] == DUPLICATE_TODO_MSG
+
+        # 2 creations, 1 update, 1 deletion, 1 tombstone, 1 version bump
+        dml = [s for s, _ in statements if s.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE"))]
+        assert len(dml) == 5
+
+        todos = await self._get_todos()
+        assert todos[self.todo.id] == ("Changed title", False)
+        assert self.other.id not in todos
+        assert uuid.UUID(results[0]["todo_id"]) in todos
+        assert todos[uuid.UUID(results[0]["todo_id"])][0] == "New title"
+
+        result = await self.db_session.execute(select(DeletedTodo.todo_id).where(DeletedTodo.user_id == self.user.id))
+        assert result.scalars().all() == [self.other.id]
+
+    @pytest.mark.asyncio
+    async def test_run_clear_completed(self) -> None:
+        """ Tests the completion and the deletion of several todos, unknown todos are reported """
+        unknown: uuid.UUID = uuid.uuid4()
+        results, error_msg = await self._service([
+            {"op": "complete", "todo_id": str(self.todo.id)},
+            {"op": "complete", "todo_id": str(self.other.id)},
+            {"op": "delete", "todo_id": str(unknown)}
+        ]).run()
+
+        assert error_msg is None
+        assert [result["success"] for result in results] == [True, True, False]
+        assert results[2]["message"] == "Deletion failed: Todo could not be found."
+        assert all(completed for _, completed in (await self._get_todos()).values())
+
+    @pytest.mark.asyncio
+    async def test_run_with_existing_titles(self) -> None:
+        """ Tests that titles do not have to be unique, as with the single endpoints """
+        results, error_msg = await self._service([
+            {"op": "create", "title": self.todo.title, "description": ""},
+            {"op": "create", "title": self.todo.title, "description": ""},
+            {"op": "update", "todo_id": str(self.other.id), "title": self.todo.title, "description": ""}
+        ]).run()
+
+        assert error_msg is None
+        assert all(result["success"] for result in results)
+        assert [title for title, _ in (await self._get_todos()).values()] == [self.todo.title] * 4
+
+    @pytest.mark.asyncio
+    async def test_run_failed_because_todo_of_another_user(self) -> None:
+        """ Tests that todos of other users are not changed """
+        results, _ = await TodoBulk(
+            data=TodoBulkModel(operations=[{"op": "delete", "todo_id": str(self.todo.id)}]),
+            user_id=uuid.uuid4(), db_session=self.db_session
+        ).run()
+
+        assert not results[0]["success"]
+        assert self.todo.id in await self._get_todos()
+
+    @pytest.mark.asyncio
+    async def test_run_failed_because_db_error(self) -> None:
+        """ Tests the failed case when the database is not available """
+        broken_session = AsyncMock(wraps=self.db_session)
+        broken_session.__class__ = AsyncSession
+        broken_session.execute.side_effect = SQLAlchemyError("Broken database session")
+
+        results, error_msg = await TodoBulk(
+            data=TodoBulkModel(operations=[{"op": "complete", "todo_id": str(self.todo.id)}]),
+            user_id=self.user.id, db_session=broken_session
+        ).run()
+
+        assert results == []
+        assert error_msg == DEFAULT_BULK_ERROR_MSG
+
+
+class TestTodoBulkAPIEndpoint:
+    """ Test class for different scenarios for the api endpoint """
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup(self, fake_todo: Tuple[Todo, User, AsyncSession]) -> None:
+        """ Set up common test data """
+        self.todo, self.user, self.db_session = fake_todo
+
+        api.dependency_overrides[get_db] = lambda: self.db_session
+        api.dependency_overrides[get_current_principal] = lambda: fake_principal(self.user.id)
+
+        self.transport = ASGITransport(app=api)
+        self.base_url: str = os.getenv("VITE_API_URL")
+        self.path_url: str = "/todo/bulk"
+
+    def teardown_method(self) -> None:
+        api.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    async def test_todo_bulk_endpoint_success(self, query_budget: Callable) -> None:
+        """ Tests the success case """
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            with query_budget(3): # <- One statement per kind of operation and the version bump
+                response = await ac.post(self.path_url, json={"operations": [
+                    {"op": "create", "title": "New title", "description": ""},
+                    {"op": "complete", "todo_id": str(self.todo.id)}
+                ]})
+
+            assert response.status_code == 200
+            assert [result["success"] for result in response.json()["results"]] == [True, True]
+
+    @pytest.mark.asyncio
+    async def test_todo_bulk_endpoint_success_with_all_operations(self, query_budget: Callable) -> None:
+        """ Tests that the statements grow with the kinds of operations, not with their number """
+        others: List[Todo] = [Todo(title=f"Other {i}", description="", user_id=self.user.id) for i in range(2)]
+        self.db_session.add_all(others)
+        await self.db_session.commit()
+
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            with query_budget(6): # <- 10 creations in one INSERT, the tombstone and the version bump
+                response = await ac.post(self.path_url, json={"operations": [
+                    {"op": "create", "title": f"Title {i}", "description": ""} for i in range(10)
+                ] + [
+                    {"op": "update", "todo_id": str(self.todo.id), "title": "Changed title", "description": ""},
+                    {"op": "complete", "todo_id": str(others[0].id)},
+                    {"op": "delete", "todo_id": str(others[1].id)}
+                ]})
+
+            assert response.status_code == 200
+            assert all(result["success"] for result in response.json()["results"])
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("operations", [
+        [],
+        [{"op": "archive", "todo_id": str(uuid.uuid4())}],
+        [{"op": "create", "title": "x", "description": ""}],
+        [{"op": "delete", "todo_id": str(uuid.uuid4())}] * (MAX_BULK_OPERATIONS + 1)
+    ])
+    async def test_todo_bulk_endpoint_failed_because_validation_error(self, operations: list) -> None:
+        """ Tests the failed case when the operations are invalid """
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            response = await ac.post(self.path_url, json={"operations": operations})
+            assert response.status_code == 422
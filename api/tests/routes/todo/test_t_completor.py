@@ -4,15 +4,16 @@ import pytest
 import pytest_asyncio
 from dotenv import load_dotenv
 from httpx import AsyncClient, ASGITransport
-from unittest.mock import patch, AsyncMock
+from unittest.mock import AsyncMock
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Tuple
+from typing import Callable, Tuple
 
 from database.models import Todo, User
 from database.connection import get_db
-from security.auth.jwt import create_token, get_bearer_token
+from security.auth.jwt import AuthPrincipal, get_current_principal
 from routes.todo.t_completor import TodoCompletor, TodoCompletorModel
+from conftest import fake_principal
 from main import api
 
 load_dotenv()
@@ -32,7 +33,7 @@ class TestTodoCompletorBaseMethod:
     @pytest.mark.asyncio
     async def test_mark_as_completed_success(self) -> None:
         """ Tests the success case of the method """
-        success, msg = await self.service.mark_as_completed()
+        success, msg, _ = await self.service.mark_as_completed()
         assert success
 
     @pytest.mark.asyncio
@@ -41,18 +42,9 @@ class TestTodoCompletorBaseMethod:
         service = self.service
         service.data.todo_id = uuid.uuid4()
         
-        success, msg = await service.mark_as_completed()
+        success, msg, _ = await service.mark_as_completed()
         assert not success
-
-    @pytest.mark.asyncio
-    async def test_mark_as_completed_failed_because_unknown_error(self) -> None:
-        """ Tests the case if the method failed because of an unknown error """
-        # Manipulate the todo id with an invalid uuid
-        self.service.data.todo_id = uuid.uuid4()
-
-        with patch("routes.todo.t_utils.todo_exists", new=AsyncMock(return_value=True)):
-            success, msg = await self.service.mark_as_completed()
-            assert not success
+        assert msg == "Completion failed: Todo could not be found."
 
     @pytest.mark.asyncio
     async def test_mark_as_completed_failed_because_db_error(self) -> None:
@@ -64,7 +56,7 @@ class TestTodoCompletorBaseMethod:
         self.service.db_session = broken_session
 
         # Start the test with broken db session
-        success, msg = await self.service.mark_as_completed()
+        success, msg, _ = await self.service.mark_as_completed()
         assert not success
 
 
@@ -80,11 +72,11 @@ class TestCompletorAPIEndpoint:
         # Define default test values
         self.api_url: str = os.getenv("VITE_API_URL")
         self.path_url: str = "/todo/complete"
-        self.token: str = create_token(data={"sub": str(self.user.id)})
+        self.principal: AuthPrincipal = fake_principal(self.user.id)
 
         # Set dependencies
         api.dependency_overrides[get_db] = lambda: self.db_session
-        api.dependency_overrides[get_bearer_token] = lambda: self.token
+        api.dependency_overrides[get_current_principal] = lambda: self.principal
 
         self.transport = ASGITransport(app=api)
 
@@ -92,14 +84,17 @@ class TestCompletorAPIEndpoint:
         api.dependency_overrides.clear()
     
     @pytest.mark.asyncio
-    async def test_completor_endpoint_success(self) -> None:
+    async def test_completor_endpoint_success(self, query_budget: Callable) -> None:
         """ Tests the success case when someone marked a todo as completed """
         async with AsyncClient(transport=self.transport, base_url=self.api_url) as ac:
             payload: dict = {
                 "todo_id": str(self.todo.id)
             }
-            response = await ac.post(url=self.path_url, json=payload)
+            with query_budget(2):
+                response = await ac.post(url=self.path_url, json=payload)
             assert response.status_code == 200
+            assert response.json()["todo"]["id"] == str(self.todo.id)
+            assert response.json()["todo"]["completed"] is True
 
     @pytest.mark.asyncio
     async def test_completor_endpoint_failed_because_validation_error(self) -> None:
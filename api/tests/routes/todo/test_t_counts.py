@@ -0,0 +1,107 @@
+import os
+import pytest
+import pytest_asyncio
+from dotenv import load_dotenv
+from unittest.mock import patch
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Callable, Tuple
+
+from database.models import User, Todo
+from database.connection import get_db
+from security.auth.jwt import get_current_principal
+from routes.todo.t_counts import TodoCounts
+from routes.todo.t_creation import TodoCreation, TodoCreationModel
+from conftest import fake_principal
+from main import api
+
+load_dotenv()
+
+
+class TestGetMethod:
+    """ Test class for different test scenarios for the get method """
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup(self, fake_user: Tuple[User, AsyncSession]) -> None:
+        """ Set up common test data """
+        self.user, self.db_session = fake_user
+
+    @pytest.mark.asyncio
+    async def test_get_success(self) -> None:
+        """ Tests the counts of open and completed todos """
+        await self.db_session.execute(insert(Todo), [
+            {"title": f"Title {i}", "description": "", "user_id": self.user.id, "completed": i % 3 == 0}
+            for i in range(7)
+        ])
+        await self.db_session.commit()
+
+        counts = await TodoCounts(db_session=self.db_session, user_id=self.user.id).get()
+        assert counts == {"open": 4, "completed": 3, "total": 7}
+
+    @pytest.mark.asyncio
+    async def test_get_without_todos(self) -> None:
+        """ Tests the counts of a user without todos """
+        counts = await TodoCounts(db_session=self.db_session, user_id=self.user.id).get()
+        assert counts == {"open": 0, "completed": 0, "total": 0}
+
+
+class TestTodoCountsAPIEndpoint:
+    """ Test class for different scenarios for the api endpoint """
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup(self, fake_todo: Tuple[Todo, User, AsyncSession]) -> None:
+        """ Set up common test data """
+        self.todo, self.user, self.db_session = fake_todo
+
+        api.dependency_overrides[get_db] = lambda: self.db_session
+        api.dependency_overrides[get_current_principal] = lambda: fake_principal(self.user.id)
+
+        self.transport = ASGITransport(app=api)
+        self.base_url: str = os.getenv("VITE_API_URL")
+        self.path_url: str = "/todo/counts"
+
+    def teardown_method(self) -> None:
+        api.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    async def test_todo_counts_endpoint_success(self, query_budget: Callable) -> None:
+        """ Tests the counts and that a matching ETag is answered with 304 without counting """
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            with query_budget(2):
+                response = await ac.get(self.path_url)
+            assert response.status_code == 200
+            assert response.json() == {"open": 1, "completed": 0, "total": 1}
+            assert 'desc="2 statements' in response.headers["server-timing"] # <- Version and counts
+
+            etag: str = response.headers["ETag"]
+
+            with patch.object(TodoCounts, "get") as get_counts:
+                response = await ac.get(self.path_url, headers={"If-None-Match": etag})
+                assert response.status_code == 304
+                get_counts.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_todo_counts_endpoint_after_change(self, query_budget: Callable) -> None:
+        """ Tests that a new todo invalidates the ETag """
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            etag: str = (await ac.get(self.path_url)).headers["ETag"]
+
+            assert (await TodoCreation(
+                data=TodoCreationModel(title="Second title", description=""),
+                user_id=self.user.id, db_session=self.db_session
+            ).create())[0]
+
+            with query_budget(2):
+                response = await ac.get(self.path_url, headers={"If-None-Match": etag})
+            assert response.status_code == 200
+            assert response.json()["total"] == 2
+
+    @pytest.mark.asyncio
+    async def test_todo_counts_endpoint_failed_because_no_token(self) -> None:
+        """ Tests the failed case when the request has no bearer token """
+        del api.dependency_overrides[get_current_principal]
+
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            response = await ac.get(self.path_url)
+            assert response.status_code == 401
@@ -4,13 +4,13 @@ import pytest_asyncio
 from dotenv import load_dotenv
 from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Tuple
+from typing import Callable, Tuple
 
 from database.models import User
 from database.connection import get_db
-from security.auth.jwt import create_token, get_bearer_token
+from security.auth.jwt import AuthPrincipal, get_current_principal
 from routes.todo.t_creation import TodoCreation, TodoCreationModel
-from routes.todo.t_utils import todo_exists, TodoExistCheckModel
+from conftest import fake_principal, todo_in_db
 from main import api
 
 # Load env
@@ -35,17 +35,20 @@ class TestCreateMethod:
     @pytest.mark.asyncio
     async def test_create_success(self):
         """ Tests that a todo is successfully created when it does not exist yet """
-        success, msg = await self.service.create()
+        success, msg, _ = await self.service.create()
         assert success
         
         # Checks whether the todo is actually created successfully
-        assert await todo_exists(
-            data=TodoExistCheckModel(
-                user_id=self.user.id, 
-                title=self.title
-            ), 
-            db_session=self.db_session
-        )
+        assert await todo_in_db(self.db_session, user_id=self.user.id, title=self.title)
+
+    @pytest.mark.asyncio
+    async def test_create_success_with_existing_title(self):
+        """ Tests that a second todo with the same title is created (titles are not unique) """
+        assert (await self.service.create())[0]
+
+        success, _, payload = await self.service.create()
+        assert success
+        assert payload["todo"]["title"] == self.title
 
 
 
@@ -60,11 +63,11 @@ class TestCreateAPIEndpoint:
         # Define default test values
         self.api_url: str = os.getenv("VITE_API_URL")
         self.path_url: str = "/todo/create"
-        self.token: str = create_token(data={"sub": str(self.user.id)})
+        self.principal: AuthPrincipal = fake_principal(self.user.id)
 
         # Set dependencies
         api.dependency_overrides[get_db] = lambda: self.db_session
-        api.dependency_overrides[get_bearer_token] = lambda: self.token
+        api.dependency_overrides[get_current_principal] = lambda: self.principal
 
         self.transport = ASGITransport(app=api)
 
@@ -72,7 +75,7 @@ class TestCreateAPIEndpoint:
         api.dependency_overrides.clear()
     
     @pytest.mark.asyncio
-    async def test_create_todo_endpoint_success(self) -> None:
+    async def test_create_todo_endpoint_success(self, query_budget: Callable) -> None:
         """ Tests the success case when someone creates a todo """
         async with AsyncClient(transport=self.transport, base_url=self.api_url) as ac:
             payload: dict = {
@@ -80,7 +83,8 @@ class TestCreateAPIEndpoint:
                 "description": "Test description"
             }
 
-            response = await ac.post(url=self.path_url, json=payload)
+            with query_budget(2):
+                response = await ac.post(url=self.path_url, json=payload)
             assert response.status_code == 200
 
     @pytest.mark.asyncio
@@ -4,13 +4,13 @@ import pytest_asyncio
 from dotenv import load_dotenv
 from sqlalchemy.ext.asyncio import AsyncSession
 from httpx import AsyncClient, ASGITransport
-from typing import Tuple
+from typing import Callable, Tuple
 
 from routes.todo.t_deletion import TodoDeletion, TodoDeletionModel
-from routes.todo.t_utils import todo_exists, TodoExistCheckModel
-from security.auth.jwt import get_bearer_token, create_token
+from security.auth.jwt import AuthPrincipal, get_current_principal
 from database.connection import get_db
 from database.models import User, Todo
+from conftest import fake_principal, todo_in_db
 from main import api
 
 load_dotenv()
@@ -31,17 +31,11 @@ class TestDeleteMethod:
     @pytest.mark.asyncio
     async def test_delete_success(self) -> None:
         """ Tests the success case for deleting a todo """
-        success, msg = await self.service.delete()
+        success, msg, _ = await self.service.delete()
         assert success
         
         # Checks whether the todo does not exist anymore
-        assert not await todo_exists(
-            data=TodoExistCheckModel(
-                user_id=self.user.id,
-                todo_id=self.todo.id
-            ),
-            db_session=self.db_session
-        )
+        assert not await todo_in_db(self.db_session, user_id=self.user.id, todo_id=self.todo.id)
 
 class TestDeleteAPIEndpoint:
     """ Tests the deletion api endpoint """
@@ -54,11 +48,11 @@ class TestDeleteAPIEndpoint:
         # Define default test values
         self.api_url: str = os.getenv("VITE_API_URL")
         self.path_url: str = "/todo/delete"
-        self.token: str = create_token(data={"sub": str(self.user.id)})
+        self.principal: AuthPrincipal = fake_principal(self.user.id)
 
         # Set dependencies
         api.dependency_overrides[get_db] = lambda: self.db_session
-        api.dependency_overrides[get_bearer_token] = lambda: self.token
+        api.dependency_overrides[get_current_principal] = lambda: self.principal
 
         self.transport = ASGITransport(app=api)
 
@@ -66,17 +60,15 @@ class TestDeleteAPIEndpoint:
         api.dependency_overrides.clear()
     
     @pytest.mark.asyncio
-    async def test_todo_deletion_endpoint_success(self) -> None:
+    async def test_todo_deletion_endpoint_success(self, query_budget: Callable) -> None:
         """ Tests the success case when someone deletes a todo """
         async with AsyncClient(transport=self.transport, base_url=self.api_url) as ac:
-            response = await ac.post(url=self.path_url, json={"todo_id": str(self.todo.id)})
+            with query_budget(3): # <- Delete, tombstone, version bump
+                response = await ac.post(url=self.path_url, json={"todo_id": str(self.todo.id)})
             assert response.status_code == 200
 
         # Checks whether the todo is actually deleted successfully
-        assert not await todo_exists(
-            data=TodoExistCheckModel(user_id=self.user.id, todo_id=self.todo.id), 
-            db_session=self.db_session
-        )
+        assert not await todo_in_db(self.db_session, user_id=self.user.id, todo_id=self.todo.id)
         
     @pytest.mark.asyncio
     async def test_todo_deletion_endpoint_failed_because_validation_error(self) -> None:
@@ -3,14 +3,15 @@ import uuid
 import pytest
 import pytest_asyncio
 from dotenv import load_dotenv
-from typing import Tuple
+from typing import Callable, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from httpx import ASGITransport, AsyncClient
 
 from database.models import Todo, User
 from database.connection import get_db
 from routes.todo.t_editor import TodoEditor, TodoEditorModel
-from security.auth.jwt import create_token, get_bearer_token
+from security.auth.jwt import AuthPrincipal, get_current_principal
+from conftest import fake_principal
 from main import api
 
 load_dotenv()
@@ -44,7 +45,7 @@ class TestTodoEditorUpdateMethod:
     @pytest.mark.asyncio
     async def test_update_success(self) -> None:
         """ Tests the success case for update method """
-        success, msg = await self.service.update()
+        success, msg, _ = await self.service.update()
         assert success
 
         # Checks whether the update was successfully
@@ -64,11 +65,11 @@ class TestTodoEditorUpdateEndpoint:
         # Define default test values
         self.api_url: str = os.getenv("VITE_API_URL")
         self.path_url: str = "/todo/update"
-        self.token: str = create_token(data={"sub": str(self.user.id)})
+        self.principal: AuthPrincipal = fake_principal(self.user.id)
 
         # Set dependencies
         api.dependency_overrides[get_db] = lambda: self.db_session
-        api.dependency_overrides[get_bearer_token] = lambda: self.token
+        api.dependency_overrides[get_current_principal] = lambda: self.principal
 
         self.transport = ASGITransport(app=api)
 
@@ -76,7 +77,7 @@ class TestTodoEditorUpdateEndpoint:
         api.dependency_overrides.clear()
     
     @pytest.mark.asyncio
-    async def test_todo_update_endpoint_success(self) -> None:
+    async def test_todo_update_endpoint_success(self, query_budget: Callable) -> None:
         """ Tests the success case when someone updates a todo """
         async with AsyncClient(transport=self.transport, base_url=self.api_url) as ac:
             payload: dict = {
@@ -85,9 +86,16 @@ class TestTodoEditorUpdateEndpoint:
                 "todo_id": str(self.todo.id)
             }
 
-            response = await ac.post(url=self.path_url, json=payload)
+            with query_budget(2):
+                response = await ac.post(url=self.path_url, json=payload)
             assert response.status_code == 200
 
+            # The response contains the updated todo, so the client does not have to reload the list
+            assert response.json()["todo"]["id"] == str(self.todo.id)
+            assert response.json()["todo"]["title"] == payload["title"]
+            assert response.json()["todo"]["edited_at"] >= response.json()["todo"]["created_at"]
+            assert response.json()["version"] == 1
+
         # Checks whether the update was actually succcessful
         todo_obj = await check_update(user_id=self.user.id, todo_id=self.todo.id, db_session=self.db_session)
         assert todo_obj.title == payload["title"]
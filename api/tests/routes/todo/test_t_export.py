@@ -0,0 +1,163 @@
+import os
+import json
+import uuid
+import tracemalloc
+import pytest
+import pytest_asyncio
+from dotenv import load_dotenv
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, Callable, List, Tuple
+
+from database.models import User, Todo
+from database.connection import get_db, async_session
+from security.auth.jwt import get_current_principal
+from routes.todo.t_home import TodoHome
+from routes.todo.t_export import TodoExport, EXPORT_BATCH_SIZE
+from conftest import fake_principal
+from main import api
+
+load_dotenv()
+
+
+class TestStreamNdjsonMethod:
+    """ Test class for different test scenarios for the stream_ndjson method """
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup(self, fake_todo: Tuple[Todo, User, AsyncSession]) -> None:
+        """ Set up common test data """
+        self.todo, self.user, self.db_session = fake_todo
+
+    async def _add_todos(self, user_id: uuid.UUID, count: int) -> None:
+        await self.db_session.execute(insert(Todo), [
+            {"user_id": user_id, "title": f"Title {i}", "description": "A description " * 10, "completed": i % 4 == 0}
+            for i in range(count)
+        ])
+        await self.db_session.commit()
+
+    async def _peak_memory(self, user_id: uuid.UUID) -> Tuple[int, int]:
+        """ Consumes the export of the user and returns the number of lines and the peak of
+        the allocated memory """
+        service = TodoExport(db_session=self.db_session, user_id=user_id)
+        lines: int = 0
+
+        tracemalloc.start()
+        try:
+            async for chunk in service.stream_ndjson(batch_size=100):
+                lines += chunk.count(b"\n")
+
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return lines, peak
+
+    @pytest.mark.asyncio
+    async def test_stream_ndjson_in_order_of_the_list(self) -> None:
+        """ Tests that the export contains every todo in the order of User.todos """
+        await self._add_todos(self.user.id, 250)
+
+        lines: List[dict] = []
+        async for chunk in TodoExport(db_session=self.db_session, user_id=self.user.id).stream_ndjson(batch_size=100):
+            lines += [json.loads(line) for line in chunk.splitlines()]
+
+        _, todos, _, _ = await TodoHome(db_session=self.db_session, user_id=self.user.id).get_username_with_todos()
+
+        assert [line["id"] for line in lines] == [str(todo.id) for todo in todos]
+        assert set(lines[0]) == {"id", "title", "description", "completed", "created_at", "edited_at"}
+
+    @pytest.mark.asyncio
+    async def test_stream_ndjson_memory_is_constant(self) -> None:
+        """ Tests that the peak memory does not grow with the number of todos """
+        small_user: User = User(name="Small", email="small@example.com", password="-")
+        large_user: User = User(name="Large", email="large@example.com", password="-")
+        self.db_session.add_all([small_user, large_user])
+        await self.db_session.commit()
+
+        await self._add_todos(small_user.id, 500)
+        await self._add_todos(large_user.id, 5000)
+        await self._peak_memory(small_user.id) # <- Warm up (statement cache)
+
+        small_lines, small_peak = await self._peak_memory(small_user.id)
+        large_lines, large_peak = await self._peak_memory(large_user.id)
+
+        assert (small_lines, large_lines) == (500, 5000)
+
+        # 10x the todos, but the same number of rows in memory at once
+        assert large_peak < small_peak * 1.5
+
+
+class TestExportTodosAPIEndpoint:
+    """ Test class for different scenarios for the api endpoint """
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup(self, fake_todo: Tuple[Todo, User, AsyncSession]) -> None:
+        """ Set up common test data """
+        self.todo, self.user, self.db_session = fake_todo
+
+        api.dependency_overrides[get_db] = lambda: self.db_session
+        api.dependency_overrides[get_current_principal] = lambda: fake_principal(self.user.id)
+
+        self.transport = ASGITransport(app=api)
+        self.base_url: str = os.getenv("VITE_API_URL")
+        self.path_url: str = "/todo/export"
+
+    def teardown_method(self) -> None:
+        api.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    async def test_export_todos_endpoint_success(self, query_budget: Callable) -> None:
+        """ Tests the success case """
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            with query_budget(1):
+                response = await ac.get(self.path_url)
+
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/x-ndjson"
+            assert [json.loads(line)["id"] for line in response.text.splitlines()] == [str(self.todo.id)]
+
+    @pytest.mark.asyncio
+    async def test_export_todos_endpoint_session_outlives_stream(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """ Tests that a session from a yield dependency (like get_db) is closed only after the
+        last chunk was streamed """
+        events: List[str] = []
+        await self.db_session.execute(insert(Todo), [
+            {"user_id": self.user.id, "title": f"Title {i}", "description": "", "completed": False} for i in range(250)
+        ])
+        await self.db_session.commit()
+
+        async def override_get_db() -> AsyncIterator[AsyncSession]:
+            try:
+                async with async_session(bind=self.db_session.bind) as session:
+                    yield session
+            finally:
+                events.append("closed")
+
+        stream_ndjson = TodoExport.stream_ndjson
+
+        async def recording_stream_ndjson(service: TodoExport, batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[bytes]:
+            async for chunk in stream_ndjson(service, batch_size=100): # <- Several chunks
+                events.append("chunk")
+                yield chunk
+
+            events.append("end")
+
+        api.dependency_overrides[get_db] = override_get_db
+        monkeypatch.setattr(TodoExport, "stream_ndjson", recording_stream_ndjson)
+
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            response = await ac.get(self.path_url)
+
+        assert response.status_code == 200
+        assert len(response.text.splitlines()) == 251
+        assert events == ["chunk"] * 3 + ["end", "closed"]
+
+    @pytest.mark.asyncio
+    async def test_export_todos_endpoint_failed_because_no_token(self) -> None:
+        """ Tests the failed case when the request has no bearer token """
+        del api.dependency_overrides[get_current_principal]
+
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            response = await ac.get(self.path_url)
+            assert response.status_code == 401
@@ -3,21 +3,32 @@ import uuid
 import pytest
 import pytest_asyncio
 from dotenv import load_dotenv
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, patch
 from httpx import AsyncClient, ASGITransport
+from sqlalchemy import insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Tuple
+from typing import Callable, Tuple
 
 from database.models import User, Todo
 from database.connection import get_db
-from routes.todo.t_home import TodoHome
-from security.auth.jwt import get_bearer_token, create_token
+from routes.todo.t_home import (
+    TodoHome, decode_cursor, todos_to_columns, _prefix_upper_bound, INVALID_CURSOR_MSG, COLUMNAR_MEDIA_TYPE
+)
+from routes.todo.t_creation import TodoCreation, TodoCreationModel
+from security.auth.jwt import get_current_principal
+from conftest import fake_principal
 from main import api
 
 load_dotenv()
 
 
+def encode_cursor_value(value: list) -> str:
+    """ Helper-Function: Encodes any value like a cursor """
+    import json, base64
+    return base64.urlsafe_b64encode(json.dumps(value).encode("utf-8")).decode("ascii")
+
+
 class TestGetUserWithTodosMethod:
     """ Test class for different test scenarios for the get_user_with_todos method """
 
@@ -43,7 +54,7 @@ class TestGetUserWithTodosMethod:
             ))
 
         # Start calling the method and checking the responses
-        username, todos, error_msg = await self.service.get_username_with_todos()
+        username, todos, next_cursor, error_msg = await self.service.get_username_with_todos()
         assert username == self.user.name
         assert error_msg is None
 
@@ -58,7 +69,7 @@ class TestGetUserWithTodosMethod:
         service = self.service
         service.user_id = uuid.uuid4() # <- Manipulates a fake user that does not exist
 
-        username, todos, error_msg = await self.service.get_username_with_todos()
+        username, todos, next_cursor, error_msg = await self.service.get_username_with_todos()
         assert username is None
         assert todos == []
         assert error_msg is not None
@@ -74,12 +85,163 @@ class TestGetUserWithTodosMethod:
         self.service.db_session = broken_session
 
         # Start calling the method and checking the responses
-        username, todos, error_msg = await self.service.get_username_with_todos()
+        username, todos, next_cursor, error_msg = await self.service.get_username_with_todos()
         assert username is None
         assert todos == []
         assert error_msg is not None
 
 
+class TestTodoPagination:
+    """ Test class for the keyset pagination of the todos """
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup(self, fake_user: Tuple[User, AsyncSession]) -> None:
+        """ Set up todos with equal timestamps (tiebreaker) and both completion states """
+        self.user, self.db_session = fake_user
+
+        await self.db_session.execute(insert(Todo), [
+            {
+                "title": f"Title {i}", "description": "", "user_id": self.user.id,
+                "completed": i % 3 == 0, "created_at": 1000 + i // 2, "edited_at": 2000 + i // 2
+            }
+            for i in range(7)
+        ])
+        await self.db_session.commit()
+
+        self.service = TodoHome(db_session=self.db_session, user_id=self.user.id)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("sort", ["edited", "created", "title"])
+    @pytest.mark.parametrize("limit", [1, 2, 3, 7, 10])
+    async def test_pages_match_the_full_list(self, limit: int, sort: str) -> None:
+        """ Tests that paging through the todos returns the full list in the same order """
+        _, all_todos, next_cursor, _ = await self.service.get_username_with_todos(sort=sort)
+        assert next_cursor is None
+
+        paged_ids: list = []
+        cursor: str | None = None
+
+        while True:
+            _, todos, cursor, error_msg = await self.service.get_username_with_todos(
+                limit=limit, cursor=cursor, sort=sort
+            )
+            assert error_msg is None
+            assert len(todos) <= limit
+            paged_ids += [todo.id for todo in todos]
+
+            if cursor is None:
+                break
+
+        assert paged_ids == [todo.id for todo in all_todos]
+        assert [todo.completed for todo in all_todos] == [False] * 4 + [True] * 3
+
+    @pytest.mark.asyncio
+    async def test_title_pages_with_equal_titles(self) -> None:
+        """ Tests that todos with the same title are not skipped at a page boundary """
+        await self.db_session.execute(insert(Todo), [
+            {"title": "Title 1", "description": "", "user_id": self.user.id} for _ in range(2)
+        ])
+        await self.db_session.commit()
+
+        _, all_todos, _, _ = await self.service.get_username_with_todos(sort="title")
+        paged_ids: list = []
+        cursor: str | None = None
+
+        while True:
+            _, todos, cursor, _ = await self.service.get_username_with_todos(limit=1, cursor=cursor, sort="title")
+            paged_ids += [todo.id for todo in todos]
+
+            if cursor is None:
+                break
+
+        assert len(all_todos) == 9
+        assert paged_ids == [todo.id for todo in all_todos]
+
+    def test_prefix_upper_bound(self) -> None:
+        assert _prefix_upper_bound("Tit") == "Tiu"
+        assert _prefix_upper_bound("Ti" + chr(0x10FFFF)) == "Tj"
+        assert _prefix_upper_bound(chr(0x10FFFF) * 2) is None
+        assert _prefix_upper_bound("Ti" + chr(0xD7FF)) == "Ti" + chr(0xE000)
+
+    @pytest.mark.asyncio
+    async def test_title_prefix_before_the_surrogates(self) -> None:
+        """ Tests that a prefix ending in U+D7FF is filtered in the database (the bound is valid UTF-8) """
+        await self.db_session.execute(insert(Todo), [
+            {"title": title, "description": "", "user_id": self.user.id}
+            for title in ("Title" + chr(0xD7FF), "Title" + chr(0xD7FF) + "x", "Title" + chr(0xE000))
+        ])
+        await self.db_session.commit()
+
+        _, todos, _, _ = await self.service.get_username_with_todos(title_prefix="Title" + chr(0xD7FF), sort="title")
+        assert [todo.title for todo in todos] == ["Title" + chr(0xD7FF), "Title" + chr(0xD7FF) + "x"]
+
+    @pytest.mark.asyncio
+    async def test_sort_orders(self) -> None:
+        """ Tests the sort keys within the open and the completed todos """
+        _, todos, _, _ = await self.service.get_username_with_todos(sort="title")
+        assert [todo.title for todo in todos] == [
+            "Title 1", "Title 2", "Title 4", "Title 5", "Title 0", "Title 3", "Title 6"
+        ]
+
+        _, todos, _, _ = await self.service.get_username_with_todos(sort="created")
+        assert [(todo.created_at, todo.id) for todo in todos[:4]] == sorted(
+            [(todo.created_at, todo.id) for todo in todos[:4]], reverse=True
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("limit", [None, 1, 2])
+    async def test_filter_by_completed_and_title_prefix(self, limit: int | None) -> None:
+        """ Tests that the filters only return the matching todos, also when paging """
+        await self.db_session.execute(insert(Todo), [
+            {"title": "Shopping", "description": "", "user_id": self.user.id, "completed": True},
+            {"title": "Title", "description": "", "user_id": self.user.id, "completed": True}
+        ])
+        await self.db_session.commit()
+
+        titles: list = []
+        cursor: str | None = None
+
+        while True:
+            _, todos, cursor, _ = await self.service.get_username_with_todos(
+                limit=limit, cursor=cursor, completed=True, title_prefix="Title", sort="title"
+            )
+            assert all(todo.completed for todo in todos)
+            titles += [todo.title for todo in todos]
+
+            if cursor is None:
+                break
+
+        assert titles == ["Title", "Title 0", "Title 3", "Title 6"]
+
+    @pytest.mark.asyncio
+    async def test_cursor_of_another_option_is_rejected(self) -> None:
+        """ Tests that a cursor only continues the list it was created for """
+        _, _, cursor, _ = await self.service.get_username_with_todos(limit=1)
+
+        with pytest.raises(ValueError):
+            await self.service.get_username_with_todos(limit=1, cursor=cursor, sort="title")
+
+        with pytest.raises(ValueError):
+            await self.service.get_username_with_todos(limit=1, cursor=cursor, completed=True)
+
+    @pytest.mark.parametrize("cursor", ["not base64 !", "bm90IGpzb24=", encode_cursor_value([1, 2, 3, "x"])])
+    def test_decode_cursor_failed_because_invalid_cursor(self, cursor: str) -> None:
+        """ Tests the failed case when the cursor was not created by the server """
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+    @pytest.mark.asyncio
+    async def test_todos_to_columns_matches_the_list(self) -> None:
+        """ Tests that the columns are the fields of the todos in the order of the list """
+        _, todos, _, _ = await self.service.get_username_with_todos()
+        columns = todos_to_columns(todos)
+
+        assert list(columns) == ["id", "title", "description", "completed"]
+        assert list(columns["id"]) == [todo.id for todo in todos]
+        assert list(columns["completed"]) == [todo.completed for todo in todos]
+        assert todos_to_columns([]) == {"id": (), "title": (), "description": (), "completed": ()}
+
+
 class TestGetAllTodosAPIEndpoint:
     """ Test class for different scenarios for the api endpoint """
 
@@ -90,7 +252,7 @@ class TestGetAllTodosAPIEndpoint:
 
         # Set up the test dependencies
         api.dependency_overrides[get_db] = lambda: self.db_session
-        api.dependency_overrides[get_bearer_token] = lambda: create_token(data={"sub": str(self.user.id)})
+        api.dependency_overrides[get_current_principal] = lambda: fake_principal(self.user.id)
 
         self.transport = ASGITransport(app=api)
         self.base_url: str = os.getenv("VITE_API_URL")
@@ -100,23 +262,51 @@ class TestGetAllTodosAPIEndpoint:
         api.dependency_overrides.clear()
 
     @pytest.mark.asyncio
-    async def test_get_all_todos_endpoint_success(self) -> None:
+    async def test_get_all_todos_endpoint_success(self, query_budget: Callable) -> None:
         """ Tests the success case when no error occurrs """
         async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
-            response = await ac.post(self.path_url, json={})
+            with query_budget(2):
+                response = await ac.post(self.path_url, json={})
             assert response.status_code == 200
 
         json_response = response.json()
         assert uuid.UUID(json_response["todos"][0]["id"]) == self.todo.id
     
     @pytest.mark.asyncio
-    async def test_get_all_todos_endpoint_failed_because_invalid_token(self) -> None:
-        """ Tests the failed case when a token has no sub """
-        api.dependency_overrides[get_bearer_token] = lambda: create_token(data={"no_sub": str(self.user.id)})
+    async def test_get_all_todos_endpoint_with_limit(self, query_budget: Callable) -> None:
+        """ Tests that a page contains the todos and the cursor of the next page """
+        self.db_session.add(Todo(title="Second title", description="", user_id=self.user.id))
+        await self.db_session.commit()
 
         async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
-            response = await ac.post(self.path_url, json={})
+            with query_budget(2):
+                response = await ac.post(self.path_url, params={"limit": 1}, json={})
+            assert response.status_code == 200
+            assert len(response.json()["todos"]) == 1
+
+            next_cursor: str = response.json()["next_cursor"]
+            with query_budget(3):
+                response = await ac.post(self.path_url, params={"limit": 1, "cursor": next_cursor}, json={})
+            assert response.status_code == 200
+            assert len(response.json()["todos"]) == 1
+            assert response.json()["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_get_all_todos_endpoint_failed_because_invalid_cursor(self) -> None:
+        """ Tests the failed case when the cursor is invalid """
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            response = await ac.post(self.path_url, params={"limit": 1, "cursor": "invalid"}, json={})
             assert response.status_code == 400
+            assert response.json()["detail"] == INVALID_CURSOR_MSG
+
+    @pytest.mark.asyncio
+    async def test_get_all_todos_endpoint_failed_because_no_token(self) -> None:
+        """ Tests the failed case when the request has no bearer token """
+        del api.dependency_overrides[get_current_principal]
+
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            response = await ac.post(self.path_url, json={})
+            assert response.status_code == 401
     
     @pytest.mark.asyncio
     async def test_get_all_todos_endpoint_failed_because_validation_error(self) -> None:
@@ -125,4 +315,96 @@ class TestGetAllTodosAPIEndpoint:
 
         async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
             response = await ac.post(self.path_url, json={})
-            assert response.status_code == 400
\ No newline at end of file
+            assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_get_all_todos_cached_endpoint_not_modified(self, query_budget: Callable) -> None:
+        """ Tests that a matching ETag is answered with 304 without loading the todos """
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            with query_budget(3):
+                response = await ac.get(self.path_url)
+            assert response.status_code == 200
+            assert uuid.UUID(response.json()["todos"][0]["id"]) == self.todo.id
+
+            etag: str = response.headers["ETag"]
+
+            with patch.object(TodoHome, "get_username_with_todos") as get_todos:
+                with query_budget(1): # <- Only the version
+                    response = await ac.get(self.path_url, headers={"If-None-Match": etag})
+                assert response.status_code == 304
+                assert response.headers["ETag"] == etag
+                get_todos.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_all_todos_cached_endpoint_after_change(self, query_budget: Callable) -> None:
+        """ Tests that a mutation of the todos invalidates the ETag """
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            etag: str = (await ac.get(self.path_url)).headers["ETag"]
+
+            assert (await TodoCreation(
+                data=TodoCreationModel(title="Second title", description=""),
+                user_id=self.user.id, db_session=self.db_session
+            ).create())[0]
+
+            with query_budget(3):
+                response = await ac.get(self.path_url, headers={"If-None-Match": etag})
+            assert response.status_code == 200
+            assert response.headers["ETag"] != etag
+            assert len(response.json()["todos"]) == 2
+
+            # Every page has its own ETag
+            with query_budget(3):
+                response = await ac.get(self.path_url, params={"limit": 1}, headers={"If-None-Match": etag})
+            assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("params, headers", [
+        ({"format": "columnar"}, {}),
+        ({}, {"Accept": COLUMNAR_MEDIA_TYPE})
+    ])
+    async def test_get_all_todos_endpoint_columnar(self, query_budget: Callable, params: dict, headers: dict) -> None:
+        """ Tests the columnar format, negotiated by the query parameter or the Accept header """
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            with query_budget(2):
+                response = await ac.post(self.path_url, params=params, headers=headers, json={})
+            assert response.status_code == 200
+
+        assert response.headers["content-type"] == COLUMNAR_MEDIA_TYPE
+        assert "Accept" in response.headers["vary"]
+        assert response.json()["todos"] == {
+            "id": [str(self.todo.id)], "title": [self.todo.title],
+            "description": [self.todo.description], "completed": [self.todo.completed]
+        }
+
+    @pytest.mark.asyncio
+    async def test_get_all_todos_cached_endpoint_etag_per_format(self, query_budget: Callable) -> None:
+        """ Tests that the formats do not share an ETag and that an unknown format is rejected """
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            etag: str = (await ac.get(self.path_url)).headers["ETag"]
+
+            with query_budget(3):
+                response = await ac.get(self.path_url, params={"format": "columnar"}, headers={"If-None-Match": etag})
+            assert response.status_code == 200
+            assert response.headers["ETag"] != etag
+
+            response = await ac.get(self.path_url, params={"format": "xml"})
+            assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_get_all_todos_endpoint_with_options(self, query_budget: Callable) -> None:
+        """ Tests the filter and sort options and their validation """
+        self.db_session.add(Todo(title="Another title", description="", user_id=self.user.id, completed=True))
+        await self.db_session.commit()
+
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            with query_budget(3):
+                response = await ac.get(self.path_url, params={"completed": True, "sort": "title", "title_prefix": "An"})
+            assert response.status_code == 200
+            assert [todo["title"] for todo in response.json()["todos"]] == ["Another title"]
+
+            with query_budget(3):
+                response = await ac.get(self.path_url, params={"completed": False})
+            assert [uuid.UUID(todo["id"]) for todo in response.json()["todos"]] == [self.todo.id]
+
+            response = await ac.get(self.path_url, params={"sort": "random"})
+            assert response.status_code == 422
@@ -0,0 +1,169 @@
+import os
+import time
+import pytest
+import pytest_asyncio
+from dotenv import load_dotenv
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import insert, update, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Callable, Tuple
+
+from database.models import User, Todo, DeletedTodo
+from database.connection import get_db
+from database.config import TODO_DELETIONS_RETENTION, SQLITE_BUSY_TIMEOUT
+from security.auth.jwt import get_current_principal
+from routes.todo.t_sync import TodoSync, compact_todo_deletions, WATERMARK_LAG
+from routes.todo.t_deletion import TodoDeletion
+from routes.todo.t_validation_models import TodoDeletionModel
+from conftest import fake_principal
+from main import api
+
+load_dotenv()
+
+
+class TestGetChangesMethod:
+    """ Test class for different test scenarios for the get_changes method """
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup(self, fake_todo: Tuple[Todo, User, AsyncSession]) -> None:
+        """ Set up an old todo, so that only the changes of the test are newer than the watermark """
+        self.todo, self.user, self.db_session = fake_todo
+        self.since: int = int(time.time()) - 10
+
+        await self.db_session.execute(
+            update(Todo).where(Todo.id == self.todo.id).values(edited_at=self.since - 100)
+        )
+        await self.db_session.commit()
+
+        self.service = TodoSync(db_session=self.db_session, user_id=self.user.id)
+
+    @pytest.mark.asyncio
+    async def test_first_sync_returns_all_todos(self) -> None:
+        """ Tests that a sync without watermark resets the list of the client """
+        changes: dict = await self.service.get_changes(since=None)
+
+        assert changes["reset"]
+        assert [todo["id"] for todo in changes["todos"]] == [str(self.todo.id)]
+        assert changes["deleted"] == []
+        assert changes["watermark"] <= int(time.time())
+
+    @pytest.mark.asyncio
+    async def test_sync_returns_only_changes(self) -> None:
+        """ Tests that only new todos and the ids of deleted todos are returned """
+        result = await self.db_session.execute(
+            insert(Todo).values(title="New title", description="", user_id=self.user.id).returning(Todo.id)
+        )
+        new_todo_id = result.scalar_one()
+        await self.db_session.commit()
+
+        success, _, _ = await TodoDeletion(
+            data=TodoDeletionModel(todo_id=self.todo.id), user_id=self.user.id, db_session=self.db_session
+        ).delete()
+        assert success
+
+        changes: dict = await self.service.get_changes(since=self.since)
+
+        assert not changes["reset"]
+        assert [todo["id"] for todo in changes["todos"]] == [str(new_todo_id)]
+        assert changes["deleted"] == [str(self.todo.id)]
+
+    @pytest.mark.asyncio
+    async def test_sync_returns_write_that_waited_for_the_lock(self) -> None:
+        """ Tests that a write stamped before a sync, but committed after it (it waited for the
+        write lock), is returned by the next sync """
+        watermark: int = (await self.service.get_changes(since=self.since))["watermark"]
+
+        result = await self.db_session.execute(
+            insert(Todo).values(
+                title="New title", description="", user_id=self.user.id,
+                edited_at=int(time.time()) - SQLITE_BUSY_TIMEOUT // 1000
+            ).returning(Todo.id)
+        )
+        new_todo_id = result.scalar_one()
+        await self.db_session.commit()
+
+        changes: dict = await self.service.get_changes(since=watermark)
+
+        assert [todo["id"] for todo in changes["todos"]] == [str(new_todo_id)]
+        assert WATERMARK_LAG > SQLITE_BUSY_TIMEOUT / 1000
+
+    @pytest.mark.asyncio
+    async def test_sync_without_changes(self) -> None:
+        """ Tests that a sync without changes transfers no todos """
+        changes: dict = await self.service.get_changes(since=self.since)
+
+        assert not changes["reset"]
+        assert changes["todos"] == []
+        assert changes["deleted"] == []
+
+    @pytest.mark.asyncio
+    async def test_sync_resets_when_watermark_is_older_than_retention(self) -> None:
+        """ Tests that a client that was offline longer than the retention gets the full list """
+        changes: dict = await self.service.get_changes(since=int(time.time()) - TODO_DELETIONS_RETENTION - 1)
+
+        assert changes["reset"]
+        assert len(changes["todos"]) == 1
+
+
+class TestCompactTodoDeletions:
+    """ Test class for the compaction of the tombstones """
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup(self, fake_user: Tuple[User, AsyncSession]) -> None:
+        """ Set up common test data """
+        self.user, self.db_session = fake_user
+
+    @pytest.mark.asyncio
+    async def test_only_old_tombstones_are_removed(self) -> None:
+        """ Tests that tombstones within the retention window are kept """
+        import uuid
+
+        old_id, new_id = uuid.uuid4(), uuid.uuid4()
+        await self.db_session.execute(insert(DeletedTodo), [
+            {"todo_id": old_id, "user_id": self.user.id, "deleted_at": int(time.time()) - 100},
+            {"todo_id": new_id, "user_id": self.user.id, "deleted_at": int(time.time())}
+        ])
+
+        assert await compact_todo_deletions(db_session=self.db_session, retention=50) == 1
+
+        result = await self.db_session.execute(select(DeletedTodo.todo_id))
+        assert result.scalars().all() == [new_id]
+
+
+class TestSyncTodosEndpoint:
+    """ Test class for different scenarios for the sync api endpoint """
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup(self, fake_todo: Tuple[Todo, User, AsyncSession]) -> None:
+        """ Set up common test data """
+        self.todo, self.user, self.db_session = fake_todo
+
+        api.dependency_overrides[get_db] = lambda: self.db_session
+        api.dependency_overrides[get_current_principal] = lambda: fake_principal(self.user.id)
+
+        self.transport = ASGITransport(app=api)
+        self.base_url: str = os.getenv("VITE_API_URL")
+        self.path_url: str = "/todo/sync"
+
+    def teardown_method(self) -> None:
+        api.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    async def test_sync_todos_endpoint_success(self, query_budget: Callable) -> None:
+        """ Tests the success case with the watermark of a previous sync """
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            with query_budget(1):
+                response = await ac.post(self.path_url)
+            assert response.status_code == 200
+            assert response.json()["reset"]
+
+            response = await ac.post(self.path_url, params={"since": response.json()["watermark"]})
+            assert response.status_code == 200
+            assert not response.json()["reset"]
+
+    @pytest.mark.asyncio
+    async def test_sync_todos_endpoint_failed_because_invalid_watermark(self) -> None:
+        """ Tests the failed case when the watermark is negative """
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            response = await ac.post(self.path_url, params={"since": -1})
+            assert response.status_code == 422
@@ -1,7 +1,8 @@
+import json
 import uuid
 import pytest
 import pytest_asyncio
-from sqlalchemy import insert, update
+from sqlalchemy import insert, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.responses import JSONResponse
 from fastapi import HTTPException
@@ -11,54 +12,12 @@ from database.models import Todo, User
 from routes.todo.t_creation import TodoCreation
 from routes.todo.t_validation_models import TodoCreationModel, TodoExistCheckModel, HandleTodoRequestModel
 from routes.todo.t_utils import (
-    todo_exists, TodoExistCheckModel,
     run_todo_db_statement, RunTodoDbStatementContext,
     handle_todo_request
 )
-from security.auth.jwt import create_token
-
-
-class TestTodoExists:
-    """ Test class for different scenarios for the todo_exists function """
-
-    @pytest_asyncio.fixture(autouse=True)
-    async def setup(self, fake_todo: Tuple[Todo, User, AsyncSession]) -> None:
-        """ Set up common test data """
-        self.todo, self.user, self.db_session = fake_todo
-
-        # Define differnt data models
-        self.data_for_title = TodoExistCheckModel(user_id=self.user.id, title=self.todo.title)
-        self.data_for_todoID = TodoExistCheckModel(user_id=self.user.id, todo_id=self.todo.id)
-    
-    @pytest.mark.asyncio
-    @pytest.mark.parametrize("data_type", [("title"), ("todo_id")])
-    async def test_todo_exists_success(self, data_type: str) -> None:
-        """ Tests the search for the todo with the title or todo id """
-        if data_type == "title":
-            exists = await todo_exists(data=self.data_for_title, db_session=self.db_session)
-        elif data_type == "todo_id":
-            exists = await todo_exists(data=self.data_for_todoID, db_session=self.db_session)
-
-        assert exists
-
-    @pytest.mark.asyncio
-    @pytest.mark.parametrize("data_type", [("title"), ("todo_id")])
-    async def test_todo_exists_failed_because_todo_does_not_exist(self, data_type: str) -> None:
-        """ Tests the failed case if the todo does not exist """
-        if data_type == "title":
-            self.data_for_title.todo_id = uuid.uuid4()
-            exists = await todo_exists(data=self.data_for_title, db_session=self.db_session)
-        elif data_type == "todo_id":
-            self.data_for_todoID.todo_id = uuid.uuid4()
-            exists = await todo_exists(data=self.data_for_todoID, db_session=self.db_session)
-
-        assert not exists
-
-    @pytest.mark.asyncio
-    async def test_todo_exists_failed_because_db_session_is_invalid(self) -> None:
-        """ Tests the failed case if the database session is invalid """
-        with pytest.raises(ValueError):
-            await todo_exists(data=self.data_for_title, db_session="Broken Database Session")
+from security.auth.jwt import AuthPrincipal
+from tests.database.test_query_plans import capture_statements
+from conftest import fake_principal
 
 
 class TestRunTodoDbStatement:
@@ -83,10 +42,9 @@ class TestRunTodoDbStatement:
 
 
     @pytest.mark.asyncio
-    @pytest.mark.parametrize("should_todo_exist", [(True), (False)])
-    async def test_run_todo_db_statement_success(self, should_todo_exist: bool) -> None:
+    async def test_run_todo_db_statement_success(self) -> None:
         """ Tests the success case with creating a new todo """
-        success, msg = await run_todo_db_statement(
+        success, msg, _ = await run_todo_db_statement(
             ctx=RunTodoDbStatementContext(
                 data=TodoExistCheckModel(
                     user_id=self.user.id,
@@ -96,79 +54,71 @@ class TestRunTodoDbStatement:
                 db_session=self.db_session,
                 success_msg=self.success_msg,
                 default_error_msg=self.default_error_msg,
-                execution_type=self.execution_type,
-                should_todo_exist=should_todo_exist
+                execution_type=self.execution_type
             )
         )
-        
-        # Reminder:
-        # We're simulating an INSERT operation, so the todo should *not* exist.
-
-        # Case 1: should_todo_exist = True
-        # -> Fails, because the todo is NOT in the DB -> success = False
-
-        # Case 2: should_todo_exist = False
-        # -> Proceeds, todo is inserted -> success = True
 
-        # So: success is always the opposite of should_todo_exist
-        assert success != should_todo_exist
+        assert success
+        assert msg == self.success_msg
 
 
     @pytest.mark.asyncio
-    async def test_run_todo_db_statement_failed_because_todo_does_not_exist(self) -> None:
-        """ Tests the failed case if the todo does not exist """
-        success, msg = await run_todo_db_statement(
-            ctx=RunTodoDbStatementContext(
-                data=TodoExistCheckModel(
-                    user_id=self.user.id,
-                    todo_id=uuid.uuid4() # Invalid todo id
-                ),
-                db_statement=self.db_insert_statement,
-                db_session=self.db_session,
-                success_msg=self.success_msg,
-                default_error_msg=self.default_error_msg,
-                execution_type=self.execution_type,
-                should_todo_exist=True
-            )
+    @pytest.mark.parametrize("statement_type", [("update"), ("delete")])
+    async def test_run_todo_db_statement_one_statement_per_mutation(self, statement_type: str) -> None:
+        """ Tests that a mutation is one statement on the todos (RETURNING replaces the existence check) """
+        db_statement = (
+            update(Todo).where(Todo.user_id == self.user.id, Todo.id == self.todo.id).values(completed=True)
+            if statement_type == "update" else
+            delete(Todo).where(Todo.user_id == self.user.id, Todo.id == self.todo.id)
         )
 
-        # Since the todo with the specified todo id does not exist, False is expected.
-        # Important: Although we are using the insert db statement here, 
-        # this is irrelevant for this test, as it does not add anything because the Todo 
-        # does not exist and is aborted beforehand.
-        assert not success
+        async with capture_statements() as statements:
+            success, _, _ = await run_todo_db_statement(
+                ctx=RunTodoDbStatementContext(
+                    data=TodoExistCheckModel(user_id=self.user.id, todo_id=self.todo.id),
+                    db_statement=db_statement.returning(Todo),
+                    db_session=self.db_session,
+                    success_msg=self.success_msg,
+                    default_error_msg=self.default_error_msg,
+                    execution_type="Update"
+                )
+            )
+
+        assert success
+
+        # The statement itself and the version bump of the todo list (see user_versions.py)
+        executed = [statement for statement, _ in statements if not statement.startswith(("SAVEPOINT", "RELEASE"))]
+        assert len(executed) == 2
+        assert not any(statement.lstrip().upper().startswith("SELECT") for statement in executed)
+        assert sum(" todos " in f"{statement} " for statement in executed) == 1
 
 
     @pytest.mark.asyncio
-    async def test_run_todo_db_statement_failed_because_unknown_error(self) -> None:
-        """ Tests the failed case if the execution is failed for an unknown reason """
-        # For simplicity, it is tested with an update statement.
-        db_update_statement = (
-            update(Todo)
-            .where(Todo.user_id == self.user.id, Todo.id == uuid.uuid4())
-            .values(title=self.title, description=self.description)
-            .returning(Todo)
-        )
-        
-        success, msg = await run_todo_db_statement(
+    async def test_run_todo_db_statement_failed_because_todo_does_not_exist(self) -> None:
+        """ Tests the failed case if the todo does not exist (the statement returns no row) """
+        success, msg, _ = await run_todo_db_statement(
             ctx=RunTodoDbStatementContext(
                 data=TodoExistCheckModel(
                     user_id=self.user.id,
-                    todo_id=self.todo.id
+                    todo_id=uuid.uuid4() # Invalid todo id
+                ),
+                db_statement=(
+                    update(Todo)
+                    .where(Todo.user_id == self.user.id, Todo.id == uuid.uuid4())
+                    .values(title=self.title, description=self.description)
+                    .returning(Todo)
                 ),
-                db_statement=db_update_statement,
                 db_session=self.db_session,
                 success_msg=self.success_msg,
                 default_error_msg=self.default_error_msg,
-                execution_type="Update",
-                should_todo_exist=False # Deliberately set False to provoke the error that the 
-                # todo cannot be updated because it does not exist.
+                execution_type="Update"
             )
         )
 
         assert not success
+        assert msg == "Update failed: Todo could not be found."
+
 
-    
     @pytest.mark.asyncio
     @pytest.mark.parametrize("invalid_user, invalid_db_session", [(True, False), (False, True)])
     async def test_run_todo_db_statement_failed_because_database_error(
@@ -197,7 +147,7 @@ class TestRunTodoDbStatement:
             broken_session.execute.side_effect = SQLAlchemyError("Broken Database Session")
             db_session = broken_session
 
-        success, msg = await run_todo_db_statement(
+        success, msg, _ = await run_todo_db_statement(
             ctx=RunTodoDbStatementContext(
                 data=TodoExistCheckModel(
                     user_id=self.user.id,
@@ -207,8 +157,7 @@ class TestRunTodoDbStatement:
                 db_session=db_session,
                 success_msg=self.success_msg,
                 default_error_msg=self.default_error_msg,
-                execution_type=self.execution_type,
-                should_todo_exist=False
+                execution_type=self.execution_type
             )
         )
 
@@ -224,7 +173,7 @@ class TestHandleTodoRequest:
         self.user, self.db_session = fake_user
 
         # Define test values
-        self.token: str = create_token(data={"sub": str(self.user.id)})
+        self.principal: AuthPrincipal = fake_principal(self.user.id)
         self.data_model = TodoCreationModel(title="A test title", description="A test description")
         self.service_class = TodoCreation
         self.service_method: str = "create"
@@ -236,7 +185,7 @@ class TestHandleTodoRequest:
         response: JSONResponse = await handle_todo_request(
             data_model=self.data_model, db_session=self.db_session, 
             params=HandleTodoRequestModel(
-                token=self.token, service_class=self.service_class,
+                principal=self.principal, service_class=self.service_class,
                 service_method=self.service_method,
                 default_error_message=self.default_error_message,
             )
@@ -244,6 +193,13 @@ class TestHandleTodoRequest:
 
         assert response.status_code == 200
 
+        # The created todo and the version of the list are returned
+        content: dict = json.loads(response.body)
+        assert content["todo"]["title"] == self.data_model.title
+        assert content["todo"]["completed"] is False
+        assert content["todo"]["created_at"] == content["todo"]["edited_at"]
+        assert content["version"] == 1
+
     @pytest.mark.asyncio
     async def test_handle_todo_request_failed_because_not_success(self) -> None:
         """ Tests the failed case if the success state is False """
@@ -254,14 +210,14 @@ class TestHandleTodoRequest:
                 pass
 
             async def create(self):
-                return (False, failed_msg)
+                return (False, failed_msg, None)
 
         # Expect an exception
         with pytest.raises(HTTPException) as exc_info:
             await handle_todo_request(
                 data_model=self.data_model, db_session=self.db_session, 
                 params=HandleTodoRequestModel(
-                    token=self.token, service_class=TestFailedClass,
+                    principal=self.principal, service_class=TestFailedClass,
                     service_method=self.service_method,
                     default_error_message=failed_msg,
                 )
@@ -274,24 +230,15 @@ class TestHandleTodoRequest:
 
 
     @pytest.mark.asyncio
-    @pytest.mark.parametrize("invalid_db_session, invalid_token", [(True, False), (False, True)])
-    async def test_handle_todo_request_failed_because_value_error(
-        self, invalid_db_session: bool, invalid_token: bool
-    ) -> None:
+    async def test_handle_todo_request_failed_because_value_error(self) -> None:
         """ Tests the failed case if a ValueError occurrs """
-        db_session = self.db_session
-        token = self.token
-
-        if invalid_db_session:
-            db_session = "Invalid db session" # <- triggers a ValueError (no open and valid db session)
-        elif invalid_token:
-            token = create_token({"no_sub": str(self.user.id)}) # <- triggers a ValueError (no sub exists) 
+        db_session = "Invalid db session" # <- triggers a ValueError (no open and valid db session)
 
         with pytest.raises(HTTPException) as exc_info:
             await handle_todo_request(
                 data_model=self.data_model, db_session=db_session, 
                 params=HandleTodoRequestModel(
-                    token=token,
+                    principal=self.principal,
                     service_class=self.service_class,
                     service_method=self.service_method,
                     default_error_message=self.default_error_message,
@@ -310,7 +257,7 @@ class TestHandleTodoRequest:
             await handle_todo_request(
                 data_model=self.data_model, db_session=self.db_session, 
                 params=HandleTodoRequestModel(
-                    token=int(0), # <- triggers a ValidationError
+                    principal=int(0), # <- triggers a ValidationError
                     service_class=self.service_class,
                     service_method=self.service_method,
                     default_error_message=self.default_error_message,
@@ -1,38 +1,82 @@
 import jwt
 import uuid
 import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
 from unittest.mock import AsyncMock, patch
 from datetime import datetime, timezone, timedelta
 
 from security.auth.jwt import (
     SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES,
-    get_bearer_token, decode_token, create_token
+    AuthPrincipal, get_current_principal, _decode_principal, decode_token, create_token
 )
 
 
-class TestGetBearerToken:
-    """ Test class for different test scenarios for the get_bearer_token function """
+class TestGetCurrentPrincipal:
+    """ Test class for different test scenarios for the get_current_principal function """
     
     @pytest.mark.asyncio
-    async def test_get_bearer_token_success(self) -> None:
+    async def test_get_current_principal_success(self) -> None:
         """ Tests the success case """
-        with patch("security.auth.jwt._verify_bearer_token", new=AsyncMock(return_value=True)):
-            token: str = create_token(data={"sub": str(uuid.uuid4())})
-            result = await get_bearer_token(authorization=f"Bearer {token}")
+        user_id, session_id = uuid.uuid4(), uuid.uuid4()
+        token: str = create_token(data={"sub": str(user_id), "session_id": str(session_id)})
+        principal: AuthPrincipal = _decode_principal(token=token)
+
+        with patch("security.auth.jwt._verify_bearer_token", new=AsyncMock(return_value=principal)):
+            result = await get_current_principal(authorization=f"Bearer {token}", db_session=None)
         
-        assert result == token
+        assert result == principal
+        assert result.user_id == user_id
+        assert result.session_id == session_id
     
     @pytest.mark.asyncio
-    async def test_get_bearer_token_failed_because_no_token(self) -> None:
-        """ Tests the error case when there is no token in the header """
-        from fastapi import HTTPException
-
+    @pytest.mark.parametrize("authorization", ["", None, "Basic abc"])
+    async def test_get_current_principal_failed_because_no_token(self, authorization: str | None) -> None:
+        """ Tests the error case when there is no bearer token in the header """
         with pytest.raises(HTTPException) as exc_info:
-            await get_bearer_token(authorization="")
+            await get_current_principal(authorization=authorization, db_session=None)
         
         assert exc_info.value.status_code == 401
         assert exc_info.value.detail
 
+    @pytest.mark.asyncio
+    async def test_get_current_principal_failed_because_session_is_invalid(self) -> None:
+        """ Tests the error case when the session is revoked """
+        token: str = create_token(data={"sub": str(uuid.uuid4()), "session_id": str(uuid.uuid4())})
+
+        with patch("security.auth.jwt._verify_bearer_token", new=AsyncMock(return_value=None)):
+            with pytest.raises(HTTPException) as exc_info:
+                await get_current_principal(authorization=f"Bearer {token}", db_session=None)
+        
+        assert exc_info.value.status_code == 401
+
+
+class TestDecodePrincipal:
+    """ Test class for different test scenarios for the _decode_principal function """
+
+    def test_decode_principal_success(self) -> None:
+        """ Tests the success case """
+        user_id, session_id = uuid.uuid4(), uuid.uuid4()
+        token: str = create_token(data={"sub": str(user_id), "session_id": str(session_id)})
+
+        principal: AuthPrincipal = _decode_principal(token=token)
+        assert principal.user_id == user_id
+        assert principal.session_id == session_id
+        assert principal.exp > datetime.now(timezone.utc).timestamp()
+
+    @pytest.mark.parametrize("data", [{"sub": str(uuid.uuid4())}, {"session_id": str(uuid.uuid4())}])
+    def test_decode_principal_failed_because_claim_is_missing(self, data: dict) -> None:
+        """ Tests the error case when the user id or the session id is missing """
+        with pytest.raises(TypeError):
+            _decode_principal(token=create_token(data=data))
+
+    def test_principal_is_immutable(self) -> None:
+        """ Tests that the principal cannot be changed by a route """
+        principal = AuthPrincipal(user_id=uuid.uuid4(), session_id=uuid.uuid4(), exp=0)
+
+        with pytest.raises(ValidationError):
+            principal.user_id = uuid.uuid4()
+
 
 class TestDecodeToken:
     """ Test class for different test scenarios for the decode_token function """
@@ -12,7 +12,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime, timedelta, timezone
-from typing import Tuple
+from typing import Callable, Tuple
 
 from database.connection import get_db
 from database.models import User, Auth
@@ -345,10 +345,11 @@ class TestIsRefreshTokenValidAPIEndpoint:
 
 
     @pytest.mark.asyncio
-    async def test_is_refresh_token_valid_endpoint_success(self) -> None:
+    async def test_is_refresh_token_valid_endpoint_success(self, query_budget: Callable) -> None:
         """ Tests the success case """
         async with AsyncClient(transport=self.transport, base_url=self.base_url, cookies=self.cookies) as ac:
-            response = await ac.post(self.path_url)
+            with query_budget(1):
+                response = await ac.post(self.path_url)
             assert response.status_code == 200
             assert "access_token" in response.json()
 
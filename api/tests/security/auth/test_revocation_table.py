@@ -0,0 +1,138 @@
+import os
+import sys
+import time
+import tempfile
+import uuid
+import subprocess
+import pytest
+from pathlib import Path
+
+from security import _DEFAULT_REVOCATION_TABLE_PATH
+from security.auth.revocation_table import SharedRevocationTable
+
+
+class TestSharedRevocationTable:
+    """ Test class for different test scenarios for the SharedRevocationTable class """
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path: Path) -> None:
+        """ Set up a small table in a temporary file """
+        self.path: str = str(tmp_path / "revocations.bin")
+        self.table = SharedRevocationTable(path=self.path, slots=4)
+        self.expires_at: int = int(time.time()) + 60
+
+        yield
+        self.table.close()
+
+    def test_add_and_contains_success(self) -> None:
+        """ Tests the success case: a revoked session is found, others are not """
+        jti_id: uuid.UUID = uuid.uuid4()
+
+        assert not self.table.contains(jti_id)
+        assert self.table.add(jti_id, expires_at=self.expires_at)
+        assert self.table.contains(jti_id)
+        assert not self.table.contains(uuid.uuid4())
+        assert self.table.generation == 1
+
+    def test_add_same_session_twice(self) -> None:
+        """ Tests that adding a session twice does not occupy a second slot """
+        jti_id: uuid.UUID = uuid.uuid4()
+
+        assert self.table.add(jti_id, expires_at=self.expires_at)
+        assert self.table.add(jti_id, expires_at=self.expires_at)
+        assert self.table.generation == 1
+
+    def test_add_failed_because_table_is_full(self) -> None:
+        """ Tests that a full table rejects new sessions instead of overwriting active ones """
+        for _ in range(4):
+            assert self.table.add(uuid.uuid4(), expires_at=self.expires_at)
+
+        assert not self.table.add(uuid.uuid4(), expires_at=self.expires_at)
+
+    def test_expired_slots_are_reused(self) -> None:
+        """ Tests that slots of expired sessions are reused when the table is full """
+        for _ in range(4):
+            assert self.table.add(uuid.uuid4(), expires_at=int(time.time()) - 1)
+
+        jti_id: uuid.UUID = uuid.uuid4()
+        assert self.table.add(jti_id, expires_at=self.expires_at)
+        assert self.table.contains(jti_id)
+
+    def test_revocation_is_visible_in_another_process(self) -> None:
+        """ Tests that a session revoked by another process is found without reopening the table """
+        jti_id: uuid.UUID = uuid.uuid4()
+        assert not self.table.contains(jti_id) # <- Maps the file in this process
+
+        code: str = (
+            "import uuid\n"
+            "from security.auth.revocation_table import SharedRevocationTable\n"
+            f"SharedRevocationTable(path={self.path!r}, slots=4).add(uuid.UUID({str(jti_id)!r}), expires_at={self.expires_at})\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).parents[3])
+
+        assert self.table.contains(jti_id)
+        assert self.table.generation == 1
+
+    def test_existing_file_keeps_its_size(self) -> None:
+        """ Tests that a second instance uses the slots of the existing file """
+        self.table.add(uuid.uuid4(), expires_at=self.expires_at)
+
+        other = SharedRevocationTable(path=self.path, slots=1024)
+        assert other.metrics() == {"enabled": True, "slots": 4, "generation": 1}
+        other.close()
+
+    def test_disabled_without_path(self) -> None:
+        """ Tests that an empty path disables the table """
+        table = SharedRevocationTable(path="", slots=4)
+
+        assert not table.add(uuid.uuid4(), expires_at=self.expires_at)
+        assert not table.metrics()["enabled"]
+
+    def test_disabled_because_file_is_no_revocation_table(self) -> None:
+        """ Tests that a foreign file is not overwritten """
+        Path(self.path).write_bytes(b"Not a revocation table" * 4)
+
+        table = SharedRevocationTable(path=self.path, slots=4)
+        assert not table.contains(uuid.uuid4())
+        assert not table.metrics()["enabled"]
+
+    def test_disabled_because_path_is_a_symlink(self) -> None:
+        """ Tests that a symlink (e.g. planted by another user) is not followed """
+        target: Path = Path(self.path).with_name("target.bin")
+        os.symlink(target, self.path)
+
+        table = SharedRevocationTable(path=self.path, slots=4)
+        assert not table.metrics()["enabled"]
+        assert not target.exists()
+
+    def test_disabled_because_file_is_accessible_to_others(self) -> None:
+        """ Tests that a file that the group or others can write to is refused """
+        assert self.table.add(uuid.uuid4(), expires_at=self.expires_at)
+        os.chmod(self.path, 0o666)
+
+        table = SharedRevocationTable(path=self.path, slots=4)
+        assert not table.contains(uuid.uuid4())
+        assert not table.metrics()["enabled"]
+
+    @pytest.mark.skipif(not hasattr(os, "geteuid") or os.geteuid() != 0, reason="Changing the owner needs root")
+    def test_disabled_because_file_has_a_foreign_owner(self) -> None:
+        """ Tests that a file of another user is refused """
+        Path(self.path).touch(mode=0o600)
+        os.chown(self.path, os.getuid() + 1, -1)
+
+        table = SharedRevocationTable(path=self.path, slots=4)
+        assert not table.metrics()["enabled"]
+
+    def test_new_file_is_private(self) -> None:
+        """ Tests that a new table (and its directory) can only be accessed by the user of the app """
+        path: Path = Path(self.path).parent / "run" / "revocations.bin"
+        table = SharedRevocationTable(path=str(path), slots=4)
+
+        assert table.add(uuid.uuid4(), expires_at=self.expires_at)
+        assert os.stat(path).st_mode & 0o777 == 0o600
+        assert os.stat(path.parent).st_mode & 0o777 == 0o700
+        table.close()
+
+    def test_default_path_is_not_in_the_temp_dir(self) -> None:
+        """ Tests that the default file is not in the world-writable temp directory """
+        assert os.path.dirname(_DEFAULT_REVOCATION_TABLE_PATH) != tempfile.gettempdir()
@@ -0,0 +1,100 @@
+import uuid
+import pytest
+import pytest_asyncio
+from fastapi import Request
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from unittest.mock import patch
+from typing import Tuple
+
+from database.models import User, Auth
+from security.auth.jwt import create_token, _verify_bearer_token
+from security.auth.session_cache import SessionCache, session_cache
+
+
+class TestSessionCache:
+    """ Test class for different test scenarios for the SessionCache class """
+
+    def setup_method(self) -> None:
+        """ Set up a fresh cache """
+        self.cache = SessionCache(ttl=60, max_entries=2)
+        self.session_id: uuid.UUID = uuid.uuid4()
+
+    def test_get_and_set_success(self) -> None:
+        """ Tests the success case: miss before the entry is stored, hit afterwards """
+        assert self.cache.get(self.session_id) is None
+
+        self.cache.set(self.session_id, True)
+        assert self.cache.get(self.session_id) is True
+
+        metrics: dict = self.cache.metrics()
+        assert metrics["hits"] == 1
+        assert metrics["misses"] == 1
+
+    def test_entry_expires_after_ttl(self) -> None:
+        """ Tests that an entry is ignored after the TTL """
+        self.cache.set(self.session_id, True)
+
+        with patch("security.auth.session_cache.time.monotonic", return_value=float("inf")):
+            assert self.cache.get(self.session_id) is None
+
+    def test_invalidate(self) -> None:
+        """ Tests that an invalidated session is not cached anymore """
+        self.cache.set(self.session_id, True)
+        self.cache.invalidate(self.session_id)
+
+        assert self.cache.get(self.session_id) is None
+        assert self.cache.metrics()["invalidations"] == 1
+
+    def test_least_recently_used_entry_is_dropped(self) -> None:
+        """ Tests that the cache does not grow beyond max_entries """
+        first, second, third = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+        self.cache.set(first, True)
+        self.cache.set(second, True)
+        self.cache.get(first) # <- second is now the least recently used entry
+        self.cache.set(third, True)
+
+        assert self.cache.metrics()["size"] == 2
+        assert self.cache.get(second) is None
+        assert self.cache.get(first) is True
+
+    @pytest.mark.parametrize("ttl, max_entries", [(-1, 1), (1, 0)])
+    def test_init_failed_because_invalid_params(self, ttl: float, max_entries: int) -> None:
+        """ Tests the failed case when the params are invalid """
+        with pytest.raises(ValueError):
+            SessionCache(ttl=ttl, max_entries=max_entries)
+
+
+class TestVerifyBearerTokenWithCache:
+    """ Test class to test the session cache in _verify_bearer_token """
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup(
+        self, fake_refresh_token_with_session_id: Tuple[str, str, Request, User, AsyncSession]
+    ) -> None:
+        """ Set up common test data """
+        _, self.session_id, _, self.user, self.db_session = fake_refresh_token_with_session_id
+        self.token: str = create_token(data={"sub": str(self.user.id), "session_id": self.session_id})
+
+    @pytest.mark.asyncio
+    async def test_second_lookup_is_served_from_the_cache(self) -> None:
+        """ Tests that only the first verification queries the database """
+        assert await _verify_bearer_token(token=self.token, db_session=self.db_session)
+
+        with patch.object(self.db_session, "execute") as mock_execute:
+            assert await _verify_bearer_token(token=self.token, db_session=self.db_session)
+            mock_execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_invalidated_session_is_checked_again(self) -> None:
+        """ Tests that a revoked and invalidated session is rejected immediately """
+        assert await _verify_bearer_token(token=self.token, db_session=self.db_session)
+
+        # Revoke the session
+        await self.db_session.execute(
+            update(Auth).where(Auth.jti_id == uuid.UUID(self.session_id)).values(revoked=True)
+        )
+        session_cache.invalidate(uuid.UUID(self.session_id))
+
+        assert not await _verify_bearer_token(token=self.token, db_session=self.db_session)
@@ -0,0 +1,141 @@
+import os
+import asyncio
+import pytest
+import pytest_asyncio
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Tuple
+
+from database.models import User
+from database.connection import get_db
+from security.admission import AdmissionController, hashing_admission
+from conftest import fake_email, fake_password
+from main import api
+
+load_dotenv()
+
+
+class TestAdmissionController:
+    """ Test class for different test scenarios for the AdmissionController class """
+
+    def setup_method(self) -> None:
+        """ Set up a small controller (one slot, one waiting request) """
+        self.controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=1, retry_after=3)
+
+    @pytest.mark.asyncio
+    async def test_acquire_and_release_success(self) -> None:
+        """ Tests the success case when a slot is free """
+        await self.controller.acquire()
+        assert self.controller.metrics()["active"] == 1
+
+        self.controller.release()
+        metrics: dict = self.controller.metrics()
+        assert metrics["active"] == 0
+        assert metrics["admitted"] == 1
+
+    @pytest.mark.asyncio
+    async def test_waiting_request_gets_the_released_slot(self) -> None:
+        """ Tests that a queued request is admitted as soon as the slot is released """
+        await self.controller.acquire()
+        waiting = asyncio.create_task(self.controller.acquire())
+
+        await asyncio.sleep(0)
+        assert self.controller.metrics()["queue_depth"] == 1
+
+        self.controller.release()
+        await waiting
+
+        metrics: dict = self.controller.metrics()
+        assert metrics["active"] == 1
+        assert metrics["queue_depth"] == 0
+        assert metrics["queued"] == 1
+        assert metrics["admitted"] == 2
+
+    @pytest.mark.asyncio
+    async def test_acquire_failed_because_queue_is_full(self) -> None:
+        """ Tests that a request beyond the queue is shed with a 503 and a Retry-After header """
+        await self.controller.acquire()
+        waiting = asyncio.create_task(self.controller.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await self.controller.acquire()
+
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers["Retry-After"] == "3"
+        assert self.controller.metrics()["shed"] == 1
+
+        # The cancelled request must leave the queue
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+        assert self.controller.metrics()["queue_depth"] == 0
+
+    @pytest.mark.asyncio
+    async def test_acquire_failed_because_queue_timeout(self) -> None:
+        """ Tests that a request is shed when it waited longer than the queue timeout """
+        controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=0.01, retry_after=1)
+        await controller.acquire()
+
+        with pytest.raises(HTTPException) as exc_info:
+            await controller.acquire()
+
+        assert exc_info.value.status_code == 503
+
+        metrics: dict = controller.metrics()
+        assert metrics["queue_depth"] == 0
+        assert metrics["active"] == 1
+        assert metrics["shed"] == 1
+
+    @pytest.mark.parametrize(
+        "max_concurrent, max_queue, queue_timeout",
+        [(0, 1, 1), (1, -1, 1), (1, 1, 0)]
+    )
+    def test_init_failed_because_invalid_limits(self, max_concurrent: int, max_queue: int, queue_timeout: float) -> None:
+        """ Tests the failed case when a limit is invalid """
+        with pytest.raises(ValueError):
+            AdmissionController(
+                max_concurrent=max_concurrent, max_queue=max_queue,
+                queue_timeout=queue_timeout, retry_after=1
+            )
+
+
+class TestHashingAdmissionOnEndpoints:
+    """ Test class to test the load shedding on the login and register endpoint """
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup(self, fake_user: Tuple[User, AsyncSession], monkeypatch: pytest.MonkeyPatch) -> None:
+        """ Set up common test data """
+        self.user, self.db_session = fake_user
+
+        # Set dependency
+        api.dependency_overrides[get_db] = lambda: self.db_session
+
+        self.transport = ASGITransport(app=api)
+        self.base_url: str = os.getenv("VITE_API_URL")
+
+        # Occupy every slot and disable the queue
+        monkeypatch.setattr(hashing_admission, "max_queue", 0)
+        monkeypatch.setattr(hashing_admission, "_active", hashing_admission.max_concurrent)
+
+    def teardown_method(self) -> None:
+        api.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "path_url, payload",
+        [
+            ("/login", {"email": fake_email, "password": fake_password}),
+            ("/register", {"username": "NewUser", "email": "new@email.com", "password": fake_password})
+        ]
+    )
+    async def test_endpoint_is_shed_when_overloaded(self, path_url: str, payload: dict) -> None:
+        """ Tests that the endpoint answers with a 503 instead of hashing """
+        async with AsyncClient(transport=self.transport, base_url=self.base_url) as ac:
+            response = await ac.post(path_url, json=payload)
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == str(hashing_admission.retry_after)
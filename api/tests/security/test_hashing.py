@@ -1,5 +1,9 @@
+import asyncio
+import threading
 import pytest
-from security.hashing import hash_pwd, is_hashed
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, List
+from security.hashing import hash_pwd, verify_pwd, is_hashed, HashingService
 from conftest import fake_password, fake_hashed_password
 
 
@@ -17,6 +21,20 @@ class TestHashPwd:
             hash_pwd(password=int(0))
 
 
+class TestVerifyPwd:
+    """ Test class for different test scenarios for the verify_pwd function """
+
+    @pytest.mark.parametrize("password, expected", [(fake_password, True), ("WrongPassword123", False)])
+    def test_verify_pwd_success(self, password: str, expected: bool) -> None:
+        """ Tests the success case with the correct and a wrong password """
+        assert verify_pwd(password=password, hashed_password=fake_hashed_password) == expected
+
+    def test_verify_pwd_failed_because_value_error(self) -> None:
+        """ Tests the failed case when a ValueError occurrs """
+        with pytest.raises(ValueError):
+            verify_pwd(password=int(0), hashed_password=fake_hashed_password)
+
+
 class TestIsHashed:
     """ Test class for different test scenarios for the is_hashed function """
 
@@ -26,4 +44,140 @@ class TestIsHashed:
 
     def test_is_hashed_failed_because_pwd_is_not_hashed(self) -> None:
         """ Tests the success case when a password is not hashed """
-        assert not is_hashed(fake_password)
\ No newline at end of file
+        assert not is_hashed(fake_password)
+
+
+class TestHashingService:
+    """ Test class for different test scenarios for the HashingService class """
+
+    @pytest.mark.asyncio
+    async def test_hash_and_verify_success(self) -> None:
+        """ Tests the success case of hashing and verifying a password """
+        service = HashingService(max_workers=1)
+
+        try:
+            hashed_password: str = await service.hash(fake_password)
+            assert is_hashed(hashed_password)
+            assert await service.verify(fake_password, hashed_password)
+            assert not await service.verify("WrongPassword123", hashed_password)
+        finally:
+            service.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_hash_does_not_block_the_event_loop(self) -> None:
+        """ Tests that other coroutines keep running while a password is hashed """
+        service = HashingService(max_workers=1)
+        ticks: int = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        task = asyncio.create_task(ticker())
+
+        try:
+            await service.hash(fake_password)
+        finally:
+            task.cancel()
+            service.shutdown()
+
+        assert ticks > 1
+
+    @pytest.mark.asyncio
+    async def test_metrics(self) -> None:
+        """ Tests that the metrics count the jobs and the wait time """
+        service = HashingService(max_workers=1)
+
+        try:
+            await asyncio.gather(*(service.verify(fake_password, fake_hashed_password) for _ in range(3)))
+            metrics: dict = service.metrics()
+        finally:
+            service.shutdown()
+
+        assert metrics["workers"] == 1
+        assert metrics["queue_depth"] == 0
+        assert metrics["running"] == 0
+        assert metrics["completed"] == 3
+        assert metrics["max_wait_ms"] > 0 # <- Two jobs had to wait for the single worker
+
+    @pytest.mark.asyncio
+    async def test_metrics_after_cancelled_caller(self) -> None:
+        """ Tests that a job whose caller was cancelled before it started leaves the queue """
+        service = HashingService(max_workers=1)
+        release = threading.Event()
+
+        try:
+            blocker = asyncio.create_task(service._run(release.wait))
+            waiting = asyncio.create_task(service.verify(fake_password, fake_hashed_password))
+            await asyncio.sleep(0.05)
+            assert service.metrics()["queue_depth"] == 1
+
+            waiting.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiting
+
+            release.set()
+            await blocker
+            metrics: dict = service.metrics()
+        finally:
+            release.set()
+            service.shutdown()
+
+        assert metrics["queue_depth"] == 0
+        assert metrics["running"] == 0
+        assert metrics["completed"] == 1 # <- The cancelled job never ran
+
+    @pytest.mark.asyncio
+    async def test_metrics_after_caller_cancelled_while_job_starts(self) -> None:
+        """ Tests that the queue is left once if the caller is cancelled after the job was picked up
+        by a worker, but before the job took the lock """
+        class PickedUpExecutor(Executor):
+            """ Marks every job as running (so it cannot be cancelled) but runs it on demand """
+            def __init__(self) -> None:
+                self.jobs: List[Callable[[], Any]] = []
+
+            def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+                future: Future = Future()
+                future.set_running_or_notify_cancel()
+                self.jobs.append(lambda: future.set_result(fn(*args)))
+                return future
+
+        service = HashingService(max_workers=1)
+        executor = PickedUpExecutor()
+        service._executor = executor
+
+        waiting = asyncio.create_task(service._run(lambda: "result"))
+        await asyncio.sleep(0)
+        assert service.metrics()["queue_depth"] == 1
+
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+        executor.jobs.pop()() # <- The job starts after the caller's cleanup
+        metrics: dict = service.metrics()
+
+        assert metrics["queue_depth"] == 0
+        assert metrics["running"] == 0
+        assert metrics["completed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_hash_failed_because_value_error(self) -> None:
+        """ Tests that a ValueError from the worker thread is raised to the caller """
+        service = HashingService(max_workers=1)
+
+        try:
+            with pytest.raises(ValueError):
+                await service.hash(int(0))
+        finally:
+            service.shutdown()
+
+        assert service.metrics()["completed"] == 1
+
+    @pytest.mark.parametrize("max_workers", [(0), ("1")])
+    def test_init_failed_because_invalid_max_workers(self, max_workers) -> None:
+        """ Tests the failed case when max_workers is invalid """
+        with pytest.raises(ValueError):
+            HashingService(max_workers=max_workers)
\ No newline at end of file
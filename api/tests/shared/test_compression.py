@@ -0,0 +1,161 @@
+import json
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import AsyncClient, ASGITransport
+from typing import AsyncIterator
+
+import shared.compression as compression
+from shared.compression import CompressionMiddleware, negotiate_encoding, no_compression
+from shared.etag import with_etag
+from shared.responses import FastJSONResponse
+from routes.auth.login import login_endpoint
+from security.auth.refresh_token_service import is_refresh_token_valid_endpoint
+
+PAYLOAD: dict = {"todos": [{"title": f"Title {i}", "description": "A description", "completed": False} for i in range(100)]}
+
+
+def create_app(**kwargs) -> FastAPI:
+    """ Creates an app with the middleware and a few endpoints """
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(CompressionMiddleware, **kwargs)
+
+    @app.get("/large")
+    async def large() -> FastJSONResponse:
+        return with_etag(FastJSONResponse(content=PAYLOAD), '"abc"')
+
+    @app.get("/small")
+    async def small() -> FastJSONResponse:
+        return FastJSONResponse(content={"access_token": "token"})
+
+    @app.get("/opt-out")
+    @no_compression
+    async def opt_out() -> FastJSONResponse:
+        return FastJSONResponse(content=PAYLOAD)
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def lines() -> AsyncIterator[bytes]:
+            for todo in PAYLOAD["todos"]:
+                yield json.dumps(todo).encode("utf-8") + b"\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return app
+
+
+async def request(app: FastAPI, path: str, accept_encoding: str = "gzip"):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        return await client.get(path, headers={"Accept-Encoding": accept_encoding})
+
+
+class TestNegotiateEncoding:
+    """ Test class for the negotiation of the content coding """
+
+    def test_negotiate_encoding(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(compression, "brotli", object()) # <- Any value: brotli is "installed"
+
+        assert negotiate_encoding("gzip, deflate, br") == "br"
+        assert negotiate_encoding("br;q=0.5, gzip") == "gzip"
+        assert negotiate_encoding("br;q=0, *") == "gzip"
+        assert negotiate_encoding("identity") is None
+        assert negotiate_encoding("") is None
+
+    def test_negotiate_encoding_without_brotli(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(compression, "brotli", None)
+        assert negotiate_encoding("br") is None
+        assert negotiate_encoding("br, gzip;q=0.1") == "gzip"
+
+
+class TestBrotliCompression:
+    """ Test class for the responses of a client that accepts brotli """
+
+    @pytest.mark.asyncio
+    async def test_compresses_large_response(self) -> None:
+        """ Tests that brotli is preferred over gzip and decodes to the same body """
+        response = await request(create_app(), "/large", accept_encoding="gzip, br")
+
+        assert response.headers["content-encoding"] == "br"
+        assert int(response.headers["content-length"]) < len(json.dumps(PAYLOAD))
+        assert response.headers["etag"] == 'W/"abc"'
+        assert response.json() == PAYLOAD # <- Decoded by httpx with brotli
+
+    @pytest.mark.asyncio
+    async def test_compresses_stream(self) -> None:
+        """ Tests that a streamed response is compressed chunk by chunk with brotli """
+        response = await request(create_app(), "/stream", accept_encoding="br")
+
+        assert response.headers["content-encoding"] == "br"
+        assert "content-length" not in response.headers
+        assert [json.loads(line) for line in response.text.splitlines()] == PAYLOAD["todos"]
+
+
+class TestCompressionMiddleware:
+    """ Test class for different scenarios for the CompressionMiddleware """
+
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(compression, "brotli", None) # <- Deterministic: gzip only
+
+    @pytest.mark.asyncio
+    async def test_compresses_large_response(self) -> None:
+        """ Tests that a large JSON response is gzipped and gets a weak ETag """
+        response = await request(create_app(), "/large")
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert int(response.headers["content-length"]) < len(json.dumps(PAYLOAD))
+        assert response.headers["etag"] == 'W/"abc"'
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.json() == PAYLOAD
+
+    @pytest.mark.asyncio
+    async def test_skips_small_response(self) -> None:
+        """ Tests that a body below the threshold is sent as it is """
+        response = await request(create_app(), "/small")
+
+        assert "content-encoding" not in response.headers
+        assert response.json() == {"access_token": "token"}
+
+    @pytest.mark.asyncio
+    async def test_skips_opt_out_and_unsupported_encoding(self) -> None:
+        """ Tests the no_compression marker and a client without a supported coding """
+        response = await request(create_app(), "/opt-out")
+        assert "content-encoding" not in response.headers
+        assert response.json() == PAYLOAD
+
+        response = await request(create_app(), "/large", accept_encoding="identity")
+        assert "content-encoding" not in response.headers
+        assert response.headers["etag"] == '"abc"'
+
+    @pytest.mark.asyncio
+    async def test_compresses_stream(self) -> None:
+        """ Tests that a streamed response is compressed chunk by chunk """
+        response = await request(create_app(), "/stream")
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert [json.loads(line) for line in response.text.splitlines()] == PAYLOAD["todos"]
+
+    @pytest.mark.asyncio
+    async def test_large_body_off_the_event_loop(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """ Tests that bodies above thread_min_size are compressed in a worker thread """
+        calls: list = []
+        to_thread = compression.asyncio.to_thread
+
+        async def spy(func, *args):
+            calls.append(func)
+            return await to_thread(func, *args)
+
+        monkeypatch.setattr(compression.asyncio, "to_thread", spy)
+
+        response = await request(create_app(thread_min_size=1024 * 1024), "/large")
+        assert response.headers["content-encoding"] == "gzip" and not calls
+
+        response = await request(create_app(thread_min_size=1024), "/large")
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json() == PAYLOAD and len(calls) == 1
+
+    def test_auth_endpoints_opt_out(self) -> None:
+        """ Tests that the endpoints with tokens are never compressed """
+        assert login_endpoint.__no_compression__
+        assert is_refresh_token_valid_endpoint.__no_compression__
@@ -0,0 +1,39 @@
+import uuid
+import pytest
+
+from shared.etag import make_etag, etag_matches, not_modified
+
+
+class TestEtag:
+    """ Test class for different scenarios for the ETag helpers """
+
+    def test_make_etag_is_strong_and_stable(self) -> None:
+        """ Tests that the same parts give the same quoted ETag and other parts a different one """
+        user_id: uuid.UUID = uuid.uuid4()
+        etag: str = make_etag("todos", user_id, 1, None, None)
+
+        assert etag.startswith('"') and etag.endswith('"')
+        assert etag == make_etag("todos", user_id, 1, None, None)
+        assert etag != make_etag("todos", user_id, 2, None, None)
+
+    @pytest.mark.parametrize("if_none_match, expected", [
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"other", "abc"', True),
+        ("*", True),
+        ('"other"', False),
+        ("", False),
+        (None, False)
+    ])
+    def test_etag_matches(self, if_none_match: str | None, expected: bool) -> None:
+        """ Tests the parsing of the If-None-Match header """
+        assert etag_matches(if_none_match, '"abc"') is expected
+
+    def test_not_modified(self) -> None:
+        """ Tests that the 304 response has no body but the ETag """
+        response = not_modified('"abc"')
+
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["ETag"] == '"abc"'
+        assert response.headers["Cache-Control"] == "private, no-cache"
@@ -0,0 +1,100 @@
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+
+import shared.flight_recorder as flight_recorder_module
+from shared.flight_recorder import FlightRecorder, FlightRecorderMiddleware, RequestTrace, current_trace, phase
+from shared.responses import FastJSONResponse
+
+
+def create_trace(duration: float, route: str = "/todos") -> RequestTrace:
+    trace = RequestTrace(method="GET", path=route, started_at=0.0, route=route, status_code=200)
+    trace.duration = duration
+    return trace
+
+
+def create_app(recorder: FlightRecorder) -> FastAPI:
+    """ Creates an app with the middleware and an endpoint with two phases """
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(FlightRecorderMiddleware, recorder=recorder)
+
+    @app.get("/todos/{todo_id}")
+    async def todo(todo_id: str) -> FastJSONResponse:
+        for _ in range(2):
+            with phase("todo_statement"):
+                pass
+
+        return FastJSONResponse(content={"id": todo_id})
+
+    return app
+
+
+class TestFlightRecorder:
+    """ Test class for the bounded buffer of the FlightRecorder class """
+
+    def test_keeps_the_slowest_requests(self) -> None:
+        recorder = FlightRecorder(capacity=2, window=60)
+
+        for duration in (0.3, 0.1, 0.5, 0.2):
+            recorder.record(create_trace(duration))
+
+        assert [entry["duration_ms"] for entry in recorder.snapshot()] == [500.0, 300.0]
+
+    def test_drops_requests_older_than_the_window(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        now: list = [100.0]
+        monkeypatch.setattr(flight_recorder_module.time, "monotonic", lambda: now[0])
+
+        recorder = FlightRecorder(capacity=2, window=60)
+        recorder.record(create_trace(0.5, route="/old"))
+
+        now[0] += 61
+        recorder.record(create_trace(0.1, route="/new"))
+
+        assert [entry["route"] for entry in recorder.snapshot()] == ["/new"]
+
+    def test_invalid_params(self) -> None:
+        with pytest.raises(ValueError):
+            FlightRecorder(capacity=-1)
+
+        with pytest.raises(ValueError):
+            FlightRecorder(window=0)
+
+
+class TestPhase:
+    """ Test class for the phase context manager """
+
+    def test_phase_outside_of_a_request(self) -> None:
+        """ Tests that a phase without a trace (e.g. a background task) records nothing """
+        with phase("commit"):
+            pass
+
+        assert current_trace.get() is None
+
+
+class TestFlightRecorderMiddleware:
+    """ Test class for the FlightRecorderMiddleware """
+
+    @pytest.mark.asyncio
+    async def test_records_phases_of_the_request(self) -> None:
+        """ Tests the route template, the status and the summed phases of a request """
+        recorder = FlightRecorder(capacity=10, window=60)
+
+        async with AsyncClient(transport=ASGITransport(app=create_app(recorder)), base_url="http://test") as client:
+            response = await client.get("/todos/1")
+            assert response.status_code == 200
+
+        [entry] = recorder.snapshot()
+        assert entry["route"] == "/todos/{todo_id}" and entry["path"] == "/todos/1"
+        assert entry["status_code"] == 200
+        assert set(entry["phases_ms"]) == {"todo_statement", "json_encode"}
+        assert entry["duration_ms"] >= entry["phases_ms"]["todo_statement"]
+        assert entry["db"] is None # <- No MetricsMiddleware in front
+
+    @pytest.mark.asyncio
+    async def test_disabled_recorder(self) -> None:
+        recorder = FlightRecorder(capacity=0, window=60)
+
+        async with AsyncClient(transport=ASGITransport(app=create_app(recorder)), base_url="http://test") as client:
+            assert (await client.get("/todos/1")).status_code == 200
+
+        assert recorder.snapshot() == []
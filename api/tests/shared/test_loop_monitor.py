@@ -0,0 +1,65 @@
+import time
+import asyncio
+import logging
+import pytest
+
+from shared.loop_monitor import LoopMonitor
+
+
+def _blocking_call(seconds: float) -> None:
+    time.sleep(seconds) # <- Holds the event loop
+
+
+class TestLoopMonitor:
+    """ Test class for different scenarios for the LoopMonitor class """
+
+    @pytest.mark.asyncio
+    async def test_records_lag_of_a_blocking_call(self) -> None:
+        """ Tests that a call which holds the loop shows up as lag """
+        monitor = LoopMonitor(interval=0.01, debug=False)
+        monitor.start()
+
+        try:
+            await asyncio.sleep(0.03)
+            _blocking_call(0.1)
+            await asyncio.sleep(0.03)
+        finally:
+            await monitor.stop()
+
+        assert monitor.histogram.count >= 2
+        assert monitor.metrics()["max_lag_ms"] >= 50
+        assert monitor.metrics()["blocked_calls"] == 0 # <- No watchdog without debug mode
+
+    @pytest.mark.asyncio
+    async def test_debug_mode_logs_the_stack(self, caplog: pytest.LogCaptureFixture) -> None:
+        """ Tests that the watchdog logs the stack of the blocking call once """
+        monitor = LoopMonitor(interval=0.5, debug=True, block_threshold=0.05)
+        monitor.start()
+
+        try:
+            with caplog.at_level(logging.WARNING, logger="shared.loop_monitor"):
+                await asyncio.sleep(0.05)
+                _blocking_call(0.3)
+                await asyncio.sleep(0.05)
+        finally:
+            await monitor.stop()
+
+        records = [record for record in caplog.records if "Event loop blocked" in record.getMessage()]
+        assert len(records) == 1
+        assert "_blocking_call" in records[0].getMessage()
+        assert monitor.metrics()["blocked_calls"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_monitor(self) -> None:
+        monitor = LoopMonitor(interval=0)
+        monitor.start()
+        await monitor.stop()
+
+        assert monitor.histogram.count == 0
+
+    def test_invalid_params(self) -> None:
+        with pytest.raises(ValueError):
+            LoopMonitor(interval=-1)
+
+        with pytest.raises(ValueError):
+            LoopMonitor(block_threshold=0)
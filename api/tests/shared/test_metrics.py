@@ -0,0 +1,150 @@
+import pytest
+from fastapi import APIRouter, FastAPI, HTTPException
+from fastapi.routing import APIRoute
+from httpx import AsyncClient, ASGITransport
+
+from database.query_stats import QueryStats
+from shared.metrics import Histogram, MetricsMiddleware, MetricsRegistry, UNMATCHED_ROUTE
+
+
+def create_app(registry: MetricsRegistry) -> FastAPI:
+    """ Creates an app with the middleware and a few endpoints """
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, registry=registry)
+
+    @app.get("/todos/{todo_id}")
+    async def todo(todo_id: str) -> dict:
+        if todo_id == "missing":
+            raise HTTPException(status_code=404)
+        return {"in_flight": {f"{method} {route}": count for (method, route), count in registry.in_flight().items()}}
+
+    @app.get("/error")
+    async def error() -> dict:
+        raise RuntimeError("Unexpected")
+
+    return app
+
+
+class TestHistogram:
+    """ Test class for the Histogram class """
+
+    def test_cumulative_buckets(self) -> None:
+        histogram = Histogram(bounds=(0.1, 1.0))
+
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        assert histogram.cumulative() == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+        assert histogram.count == 4 and histogram.sum == pytest.approx(3.65)
+
+
+class TestMetricsRegistry:
+    """ Test class for the exposition format of the MetricsRegistry class """
+
+    def test_render(self) -> None:
+        registry = MetricsRegistry()
+        registry.observe_request("GET", '/api/"quoted"', 200, 0.002, QueryStats(statements=3, db_time=0.001, rows=7))
+        registry.register_collector(
+            "hashing", lambda: {"workers": 4, "enabled": True, "completed": 9, "name": "ignored"}, counters=("completed",)
+        )
+
+        text: str = registry.render()
+
+        assert 'http_requests_total{method="GET",route="/api/\\"quoted\\"",status="200"} 1' in text
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/api/\\"quoted\\"",le="0.005"} 1' in text
+        assert 'http_request_duration_seconds_count{method="GET",route="/api/\\"quoted\\""} 1' in text
+        assert 'http_request_db_statements_total{method="GET",route="/api/\\"quoted\\""} 3' in text
+        assert 'http_request_db_rows_total{method="GET",route="/api/\\"quoted\\""} 7' in text
+        assert "# TYPE http_requests_in_flight gauge" in text
+        assert "# TYPE hashing_workers gauge\nhashing_workers 4.0" in text and "hashing_enabled 1.0" in text
+        assert "# TYPE hashing_completed_total counter\nhashing_completed_total 9.0" in text
+        assert "hashing_completed " not in text
+        assert "hashing_name" not in text
+        assert text.endswith("\n")
+
+    def test_render_in_flight_per_route(self) -> None:
+        registry = MetricsRegistry()
+        registry.active = {
+            1: {"method": "GET", "route": APIRoute("/todos/{todo_id}", lambda todo_id: None)},
+            2: {"method": "GET", "route": APIRoute("/todos/{todo_id}", lambda todo_id: None)},
+            3: {"method": "POST"} # <- Not routed yet
+        }
+
+        text: str = registry.render()
+
+        assert 'http_requests_in_flight{method="GET",route="/todos/{todo_id}"} 2' in text
+        assert f'http_requests_in_flight{{method="POST",route="{UNMATCHED_ROUTE}"}} 1' in text
+
+    def test_render_registered_histogram(self) -> None:
+        registry = MetricsRegistry()
+        histogram = Histogram(bounds=(0.01,))
+        histogram.observe(0.002)
+
+        registry.register_histogram("event_loop_lag_seconds", "Lag.", histogram)
+        text: str = registry.render()
+
+        assert "# TYPE event_loop_lag_seconds histogram" in text
+        assert 'event_loop_lag_seconds_bucket{le="0.01"} 1' in text
+        assert "event_loop_lag_seconds_count 1" in text
+
+
+class TestMetricsMiddleware:
+    """ Test class for different scenarios for the MetricsMiddleware """
+
+    @pytest.mark.asyncio
+    async def test_records_route_template_and_status(self) -> None:
+        """ Tests that the requests are recorded per route template and status code """
+        registry = MetricsRegistry()
+
+        async with AsyncClient(transport=ASGITransport(app=create_app(registry)), base_url="http://test") as ac:
+            response = await ac.get("/todos/1")
+            assert response.json() == {"in_flight": {"GET /todos/{todo_id}": 1}}
+            assert response.headers["server-timing"].startswith('db;dur=0.00;desc="0 statements, 0 rows", app;dur=')
+
+            await ac.get("/todos/2")
+            await ac.get("/todos/missing")
+            await ac.get("/unknown")
+
+        assert registry.requests == {
+            ("GET", "/todos/{todo_id}", 200): 2,
+            ("GET", "/todos/{todo_id}", 404): 1,
+            ("GET", UNMATCHED_ROUTE, 404): 1
+        }
+        assert registry.latencies[("GET", "/todos/{todo_id}")].count == 3
+        assert registry.in_flight() == {}
+
+    @pytest.mark.asyncio
+    async def test_records_full_template_of_nested_routers(self) -> None:
+        """ Tests that the label of a route in nested routers contains every prefix (as in main.py).
+        route_template relies on a FastAPI scope key, this test pins it across upgrades. """
+        registry = MetricsRegistry()
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware, registry=registry)
+
+        todo_router = APIRouter()
+
+        @todo_router.get("/get/{todo_id}")
+        async def todo(todo_id: str) -> dict:
+            return {}
+
+        parent_router = APIRouter(prefix="/api/todo")
+        parent_router.include_router(todo_router)
+        app.include_router(parent_router)
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            assert (await ac.get("/api/todo/get/1")).status_code == 200
+
+        assert registry.requests == {("GET", "/api/todo/get/{todo_id}", 200): 1}
+
+    @pytest.mark.asyncio
+    async def test_records_failed_request(self) -> None:
+        """ Tests that an unhandled exception is recorded as 500 """
+        registry = MetricsRegistry()
+        transport = ASGITransport(app=create_app(registry), raise_app_exceptions=False)
+
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.get("/error")
+            assert response.status_code == 500
+
+        assert registry.requests == {("GET", "/error", 500): 1}
+        assert registry.in_flight() == {}
@@ -0,0 +1,23 @@
+import json
+import uuid
+from fastapi.responses import JSONResponse
+
+from routes.todo.t_schemas import TodoSchema
+from shared.responses import FastJSONResponse
+
+
+class TestFastJSONResponse:
+    """ Test class for different scenarios for the FastJSONResponse class """
+
+    def test_render_matches_stdlib(self) -> None:
+        """ Tests that plain content is encoded exactly like the stdlib JSONResponse """
+        content: dict = {"message": "Erfolg – äöü", "numbers": [1, 2.5, None, True], "nested": {"a": "b"}}
+        assert FastJSONResponse(content=content).body == JSONResponse(content=content).body
+
+    def test_render_models_and_uuids(self) -> None:
+        """ Tests that pydantic models and UUIDs are encoded without a model_dump """
+        todo = TodoSchema(id=uuid.uuid4(), title="Title", description="", completed=False)
+        response = FastJSONResponse(content={"todos": [todo], "user_id": todo.id})
+
+        assert response.headers["content-type"] == "application/json"
+        assert json.loads(response.body) == {"todos": [todo.model_dump(mode="json")], "user_id": str(todo.id)}